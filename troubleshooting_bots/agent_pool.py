@@ -0,0 +1,197 @@
+"""
+Pool of CrewAI agents keyed by bot type
+Agents are built lazily on first use and reused across phases and sessions
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import BotRoles
+from models import BotType
+from utils import StructuredLogger
+
+# Extra Agent options for bot types that need them
+AGENT_OPTIONS: Dict[BotType, Dict[str, Any]] = {
+    BotType.COORDINATOR: {"allow_delegation": True}
+}
+
+# (agent, tool generation) leased by the session running in the current context
+_leased_agents: ContextVar[Optional[Dict[BotType, Tuple[Any, int]]]] = ContextVar("leased_agents", default=None)
+
+
+def crewai_agent(**options: Any) -> Any:
+    """Default agent factory, importing CrewAI only when an agent is first built"""
+    from crewai import Agent
+
+    return Agent(**options)
+
+
+class AgentPool:
+    """
+    Builds Agents per bot type and reuses them across sessions
+
+    CrewAI agents carry per-run state (tools' callbacks, executor, cache,
+    memory), so two crews must never run one agent at the same time. Each
+    session leases its agents: the first get() of a bot type in a lease
+    takes an idle agent, or builds one, and keeps it for the whole lease, so
+    concurrent sessions always hold distinct agents and later sessions reuse
+    them once they are returned. Within a session, crews of one bot type run
+    one at a time (the resolution scheduler keys fixes by bot type).
+
+    Modules register tool providers for the bot types they serve; an agent
+    gets the tools of every provider registered for its type when it is
+    built. Registering a provider retires the agents of that type, so the
+    new tools are not silently missed.
+    """
+
+    def __init__(self, agent_factory: Callable[..., Any] = crewai_agent):
+        self.logger = StructuredLogger.get_logger("agent_pool")
+        self.agent_factory = agent_factory
+        self._lock = threading.RLock()
+        self._idle: Dict[BotType, List[Any]] = {}
+        self._shared: Dict[BotType, Any] = {}
+        self._generations: Dict[BotType, int] = {}
+        self._tool_providers: Dict[BotType, List[Callable[[], List[Any]]]] = {}
+
+        # Construction and lease statistics
+        self.hits = 0
+        self.constructions = 0
+        self.leases = 0
+        self.leased = 0
+        self.construction_times: Dict[BotType, float] = {}
+
+    def register_tools(self, bot_type: BotType, provider: Callable[[], List[Any]]):
+        """Register a callable returning tools for agents of a bot type"""
+        with self._lock:
+            self._tool_providers.setdefault(bot_type, []).append(provider)
+            self._generations[bot_type] = self._generations.get(bot_type, 0) + 1
+            self._idle.pop(bot_type, None)
+            self._shared.pop(bot_type, None)
+
+    @contextmanager
+    def lease(self) -> Iterator[None]:
+        """Hold agents for the session running in this context until it ends"""
+        agents: Dict[BotType, Tuple[Any, int]] = {}
+        token = _leased_agents.set(agents)
+        with self._lock:
+            self.leases += 1
+        reusable = False
+        try:
+            yield
+            reusable = True
+        finally:
+            _leased_agents.reset(token)
+            with self._lock:
+                for bot_type, (agent, generation) in agents.items():
+                    self.leased -= 1
+                    # A failed or cancelled session may leave a kickoff running in a
+                    # crew thread, and agents built before newer tools were
+                    # registered are outdated; neither is reused
+                    if reusable and generation == self._generations.get(bot_type, 0):
+                        self._idle.setdefault(bot_type, []).append(agent)
+
+    def get(self, bot_type: BotType) -> Any:
+        """
+        Get the agent for a bot type
+
+        Inside a lease the agent is the lease's own. Outside one, a single
+        shared agent per type is returned, which is only safe for callers
+        that never run crews concurrently.
+        """
+        agents = _leased_agents.get()
+        with self._lock:
+            if agents is None:
+                agent = self._shared.get(bot_type)
+                if agent is not None:
+                    self.hits += 1
+                    return agent
+                agent = self._shared[bot_type] = self._build(bot_type)
+            else:
+                if bot_type in agents:
+                    return agents[bot_type][0]
+
+                idle = self._idle.get(bot_type)
+                if idle:
+                    self.hits += 1
+                    agent = idle.pop()
+                else:
+                    agent = self._build(bot_type)
+                agents[bot_type] = (agent, self._generations.get(bot_type, 0))
+                self.leased += 1
+
+        return agent
+
+    def _build(self, bot_type: BotType) -> Any:
+        """Construct an agent from its BotRoles entry and registered tools"""
+        role_config = BotRoles.for_bot_type(bot_type.value)
+        if not role_config:
+            raise ValueError(f"Unknown bot type: {bot_type}")
+
+        tools = []
+        for provider in self._tool_providers.get(bot_type, []):
+            for tool in provider():
+                if tool not in tools:
+                    tools.append(tool)
+
+        start_time = time.perf_counter()
+        agent = self.agent_factory(
+            role=role_config["role"],
+            goal=role_config["goal"],
+            backstory=role_config["backstory"],
+            verbose=True,
+            tools=tools,
+            max_execution_time=role_config["max_execution_time"],
+            **AGENT_OPTIONS.get(bot_type, {})
+        )
+        elapsed = time.perf_counter() - start_time
+
+        self.constructions += 1
+        self.construction_times[bot_type] = elapsed
+        self.logger.info(
+            "Agent constructed",
+            bot_type=bot_type.value,
+            tools=len(tools),
+            construction_time=round(elapsed, 4)
+        )
+        return agent
+
+    def warm_up(self, bot_types: Optional[List[BotType]] = None) -> Dict[BotType, float]:
+        """Build one idle agent per bot type ahead of the first session and return their construction times"""
+        bot_types = bot_types or list(self._tool_providers)
+        with self.lease():
+            for bot_type in bot_types:
+                self.get(bot_type)
+
+        with self._lock:
+            return {bot_type: self.construction_times.get(bot_type, 0.0) for bot_type in bot_types}
+
+    def clear(self):
+        """Drop all idle and shared agents so they are rebuilt on next use"""
+        with self._lock:
+            self._idle.clear()
+            self._shared.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get pool size, lease and construction time statistics"""
+        with self._lock:
+            total_time = sum(self.construction_times.values())
+            stats = {
+                "agents": sum(len(idle) for idle in self._idle.values()) + self.leased + len(self._shared),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "leased": self.leased,
+                "leases": self.leases,
+                "hits": self.hits,
+                "constructions": self.constructions,
+                "total_construction_time": total_time,
+                "max_construction_time": max(self.construction_times.values(), default=0.0)
+            }
+            for bot_type, elapsed in self.construction_times.items():
+                stats[f"construction_time.{bot_type.value}"] = elapsed
+            return stats
+
+
+# Global agent pool instance
+agent_pool = AgentPool()
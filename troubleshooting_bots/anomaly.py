@@ -0,0 +1,274 @@
+"""
+Latency and error-rate anomaly detection
+Keeps per-endpoint time series in NumPy ring arrays and scores all of them at once
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from models import BotType, Issue, IssueType, Severity, SystemInfo
+
+# Smallest deviation worth reporting per metric (seconds, fraction of requests)
+METRIC_FLOORS = {"latency": 0.05, "error_rate": 0.1}
+
+# Scales a median absolute deviation to a normal standard deviation
+_MAD_SCALE = 1.4826
+
+SeriesKey = Tuple[str, str, str, str]  # (target, group, name, metric)
+
+
+@dataclass(frozen=True)
+class Anomaly:
+    """A series whose latest sample deviates from its history"""
+    target: str
+    group: str
+    name: str
+    metric: str
+    value: float
+    median: float
+    ewma: float
+    z_score: float
+
+
+class AnomalyDetector:
+    """
+    Vectorized robust anomaly detection over many time series
+
+    Every series is a row of one 2-D ring array; each sweep writes one
+    sample per series. Detection scores the latest sample of every row
+    together: a robust z-score against the median and MAD of the row's
+    history, confirmed by the latest sample exceeding the row's EWMA by at
+    least the metric's floor. Only increases are anomalous.
+
+    Series and snapshot ordering are kept per target base URL, so
+    concurrent sessions on different targets neither mix their samples nor
+    drop each other's snapshots. At most max_targets targets are tracked;
+    recording a new one evicts the series of the least recently recorded.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, z_threshold: Optional[float] = None,
+                 min_samples: Optional[int] = None, alpha: Optional[float] = None,
+                 max_targets: Optional[int] = None, initial_series: int = 64):
+        self.capacity = capacity or config.anomaly_window
+        self.z_threshold = z_threshold or config.anomaly_z_threshold
+        self.min_samples = min_samples or config.anomaly_min_samples
+        self.alpha = alpha or config.anomaly_ewma_alpha
+        self.max_targets = max_targets or config.anomaly_max_targets
+        self._keys: List[SeriesKey] = []
+        self._rows: Dict[SeriesKey, int] = {}
+        self._values = np.full((initial_series, self.capacity), np.nan)
+        self._heads = np.zeros(initial_series, dtype=np.int64)
+        self._floors = np.zeros(initial_series)
+        self._last_snapshots: Dict[str, datetime] = {}
+        self._targets: "OrderedDict[str, None]" = OrderedDict()  # Least recently recorded first
+        self._detections: Optional[List[Anomaly]] = None
+        self._lock = threading.Lock()
+
+        # Detection statistics
+        self.sweeps = 0
+        self.detect_runs = 0
+        self.anomalies_found = 0
+        self.evicted_targets = 0
+        self.last_detect_time = 0.0
+
+    def record(self, group: str, name: str, metric: str, value: float, target: str = ""):
+        """Append one sample to a series, creating it on first use"""
+        with self._lock:
+            self._record(target, group, name, metric, value)
+
+    def _record(self, target: str, group: str, name: str, metric: str, value: float):
+        self._touch_target(target)
+        key = (target, group, name, metric)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._add_series(key)
+        self._values[row, self._heads[row] % self.capacity] = value
+        self._heads[row] += 1
+        self._detections = None
+
+    def _touch_target(self, target: str):
+        """Mark a target as recorded, evicting the least recently recorded ones over the limit"""
+        if target in self._targets:
+            self._targets.move_to_end(target)
+            return
+        self._targets[target] = None
+        while len(self._targets) > self.max_targets:
+            self._evict_target(next(iter(self._targets)))
+
+    def _evict_target(self, target: str):
+        """Drop a target's series and snapshot ordering, compacting the remaining rows"""
+        del self._targets[target]
+        self._last_snapshots.pop(target, None)
+        keep = [row for row, key in enumerate(self._keys) if key[0] != target]
+        count = len(keep)
+        self._values[:count] = self._values[keep]
+        self._values[count:] = np.nan
+        self._heads[:count] = self._heads[keep]
+        self._heads[count:] = 0
+        self._floors[:count] = self._floors[keep]
+        self._floors[count:] = 0.0
+        self._keys = [self._keys[row] for row in keep]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._detections = None
+        self.evicted_targets += 1
+
+    def _add_series(self, key: SeriesKey) -> int:
+        """Allocate a row for a new series, doubling the arrays when full"""
+        row = len(self._keys)
+        if row == len(self._heads):
+            self._values = np.vstack([self._values, np.full_like(self._values, np.nan)])
+            self._heads = np.concatenate([self._heads, np.zeros_like(self._heads)])
+            self._floors = np.concatenate([self._floors, np.zeros_like(self._floors)])
+        self._keys.append(key)
+        self._rows[key] = row
+        self._floors[row] = METRIC_FLOORS.get(key[3], 0.0)
+        return row
+
+    def record_snapshot(self, system_info: SystemInfo) -> bool:
+        """Record one sweep's latencies and error rates, once per snapshot of each target"""
+        target = system_info.base_url.rstrip("/")
+        with self._lock:
+            last_snapshot = self._last_snapshots.get(target)
+            if last_snapshot is not None and system_info.timestamp <= last_snapshot:
+                return False
+            self._touch_target(target)
+            self._last_snapshots[target] = system_info.timestamp
+            self.sweeps += 1
+
+            bot_operations = system_info.performance_metrics.get("bot_operations") or {}
+            errors = 0
+            for bot_name, result in bot_operations.items():
+                failed = result.get("status") == "error"
+                errors += failed
+                if result.get("latency") is not None:
+                    self._record(target, "network", f"endpoint:{bot_name}", "latency", float(result["latency"]))
+                self._record(target, "network", f"endpoint:{bot_name}", "error_rate", float(failed))
+            if bot_operations:
+                self._record(target, "network", "endpoints", "error_rate", errors / len(bot_operations))
+
+            for source, probe in system_info.probe_results.items():
+                group = "database" if source == "database" else "network"
+                self._record(target, group, f"probe:{source}", "latency", probe.latency)
+                self._record(target, group, f"probe:{source}", "error_rate", float(not probe.success))
+            return True
+
+    def detect(self) -> List[Anomaly]:
+        """Score the latest sample of every series, reusing results until new samples arrive"""
+        with self._lock:
+            if self._detections is None:
+                start_time = time.perf_counter()
+                self._detections = self._detect()
+                self.last_detect_time = time.perf_counter() - start_time
+                self.detect_runs += 1
+                self.anomalies_found += len(self._detections)
+            return self._detections
+
+    def _detect(self) -> List[Anomaly]:
+        count = len(self._keys)
+        if count == 0:
+            return []
+
+        heads = self._heads[:count]
+        latest_column = (heads - 1) % self.capacity
+        latest = self._values[np.arange(count), latest_column]
+
+        # Age of each cell relative to the row's latest sample (0 = latest)
+        ages = (latest_column[:, None] - np.arange(self.capacity)[None, :]) % self.capacity
+        history = np.where(ages > 0, self._values[:count], np.nan)
+        samples = np.count_nonzero(~np.isnan(history), axis=1)
+
+        eligible = np.flatnonzero((heads > 0) & (samples >= self.min_samples) & ~np.isnan(latest))
+        if eligible.size == 0:
+            return []
+
+        history = history[eligible]
+        latest = latest[eligible]
+        ages = ages[eligible]
+        floors = self._floors[:count][eligible]
+
+        median = np.nanmedian(history, axis=1)
+        mad = np.nanmedian(np.abs(history - median[:, None]), axis=1)
+        z_scores = (latest - median) / np.maximum(_MAD_SCALE * mad, floors)
+
+        present = ~np.isnan(history)
+        weights = np.where(present, (1.0 - self.alpha) ** (ages - 1), 0.0)
+        ewma = (weights * np.where(present, history, 0.0)).sum(axis=1) / weights.sum(axis=1)
+
+        flagged = np.flatnonzero((z_scores >= self.z_threshold) & (latest - ewma >= floors))
+        return [
+            Anomaly(
+                *self._keys[eligible[i]],
+                value=float(latest[i]),
+                median=float(median[i]),
+                ewma=float(ewma[i]),
+                z_score=float(z_scores[i])
+            )
+            for i in flagged
+        ]
+
+    def issues(self, system_info: SystemInfo, group: str, detected_by: BotType,
+               id_prefix: str) -> List[Issue]:
+        """Record a snapshot and report a group's anomalies on its target as performance issues"""
+        self.record_snapshot(system_info)
+        target = system_info.base_url.rstrip("/")
+        return [
+            self._create_issue(anomaly, detected_by, id_prefix)
+            for anomaly in self.detect()
+            if anomaly.target == target and anomaly.group == group
+        ]
+
+    def _create_issue(self, anomaly: Anomaly, detected_by: BotType, id_prefix: str) -> Issue:
+        """Build the performance issue for an anomaly"""
+        slug = re.sub(r"[^a-z0-9]+", "_", f"{anomaly.name}_{anomaly.metric}".lower()).strip("_")
+        if anomaly.metric == "latency":
+            label = "Latency"
+            observed = f"{anomaly.value * 1000:.0f}ms vs median {anomaly.median * 1000:.0f}ms"
+        else:
+            label = "Error Rate"
+            observed = f"{anomaly.value:.0%} vs median {anomaly.median:.0%}"
+        high = anomaly.z_score >= 2 * self.z_threshold or (
+            anomaly.metric == "error_rate" and anomaly.value >= 0.5
+        )
+
+        return Issue(
+            id=f"{id_prefix}_anomaly_{slug}",
+            type=IssueType.PERFORMANCE_ISSUE,
+            severity=Severity.HIGH if high else Severity.MEDIUM,
+            title=f"{label} Anomaly: {anomaly.name}",
+            description=f"{label} of {anomaly.name} is {observed} (robust z-score {anomaly.z_score:.1f})",
+            component=anomaly.name,
+            detected_by=detected_by,
+            affected_endpoints=[anomaly.name.split(":", 1)[-1]],
+            performance_impact={
+                "metric": anomaly.metric,
+                "value": anomaly.value,
+                "median": anomaly.median,
+                "ewma": anomaly.ewma,
+                "z_score": anomaly.z_score
+            }
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get series and detection statistics"""
+        with self._lock:
+            return {
+                "series": len(self._keys),
+                "targets": len(self._targets),
+                "evicted_targets": self.evicted_targets,
+                "sweeps": self.sweeps,
+                "detect_runs": self.detect_runs,
+                "anomalies_found": self.anomalies_found,
+                "last_detect_time": self.last_detect_time
+            }
+
+
+# Global anomaly detector
+anomaly_detector = AnomalyDetector()
@@ -5,7 +5,7 @@ Handles environment variables, settings, and system configuration
 
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 from enum import Enum
@@ -20,6 +20,13 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+class ExecutionMode(str, Enum):
+    """How the coordinator runs diagnostic and fix bots"""
+    AGENT = "agent"                  # LLM crews for every phase
+    DETERMINISTIC = "deterministic"  # Rule-based bots only, never calls the LLM
+    HYBRID = "hybrid"                # Rule-based bots, escalating inconclusive results to agents
+
+
 class TroubleshootingConfig(BaseSettings):
     """Main configuration class for the troubleshooting system"""
     
@@ -36,6 +43,13 @@ class TroubleshootingConfig(BaseSettings):
     circuit_breaker_threshold: int = Field(5, env="CIRCUIT_BREAKER_THRESHOLD")
     circuit_breaker_timeout: int = Field(60, env="CIRCUIT_BREAKER_TIMEOUT")
     
+    # HTTP Client Configuration
+    http_pool_limit: int = Field(100, env="HTTP_POOL_LIMIT")
+    http_pool_limit_per_host: int = Field(10, env="HTTP_POOL_LIMIT_PER_HOST")
+    http_keepalive_timeout: int = Field(30, env="HTTP_KEEPALIVE_TIMEOUT")
+    http_dns_cache_ttl: int = Field(300, env="HTTP_DNS_CACHE_TTL")
+    http_request_timeout: int = Field(30, env="HTTP_REQUEST_TIMEOUT")
+    
     # Logging Configuration
     log_level: LogLevel = Field(LogLevel.INFO, env="LOG_LEVEL")
     log_file_path: Optional[str] = Field(None, env="LOG_FILE_PATH")
@@ -43,8 +57,58 @@ class TroubleshootingConfig(BaseSettings):
     
     # Bot Configuration
     diagnostic_timeout: int = Field(30, env="DIAGNOSTIC_TIMEOUT")
+    diagnostic_llm_concurrency: int = Field(1, env="DIAGNOSTIC_LLM_CONCURRENCY")
     fix_timeout: int = Field(60, env="FIX_TIMEOUT")
     verification_timeout: int = Field(20, env="VERIFICATION_TIMEOUT")
+    crew_executor_max_workers: int = Field(4, env="CREW_EXECUTOR_MAX_WORKERS")
+    cpu_executor_max_workers: int = Field(0, env="CPU_EXECUTOR_MAX_WORKERS")  # 0 uses every core
+    cpu_executor_chunk_size: int = Field(500, env="CPU_EXECUTOR_CHUNK_SIZE")
+    cpu_executor_start_method: str = Field("spawn", env="CPU_EXECUTOR_START_METHOD")
+    cpu_offload_min_log_lines: int = Field(2000, env="CPU_OFFLOAD_MIN_LOG_LINES")
+    cpu_offload_min_files: int = Field(64, env="CPU_OFFLOAD_MIN_FILES")
+    max_parallel_fixes: int = Field(3, env="MAX_PARALLEL_FIXES")
+    execution_mode: ExecutionMode = Field(ExecutionMode.AGENT, env="EXECUTION_MODE")
+    snapshot_max_age: int = Field(120, env="SNAPSHOT_MAX_AGE")
+    
+    # Session Management
+    max_concurrent_sessions: int = Field(4, env="MAX_CONCURRENT_SESSIONS")
+    finished_session_history: int = Field(50, env="FINISHED_SESSION_HISTORY")
+    workflow_dedup_window: int = Field(60, env="WORKFLOW_DEDUP_WINDOW")
+    
+    # Prompt Context Configuration (token counts are estimated from characters)
+    prompt_token_budget: int = Field(1500, env="PROMPT_TOKEN_BUDGET")
+    prompt_max_line_chars: int = Field(200, env="PROMPT_MAX_LINE_CHARS")
+    
+    # LLM Result Cache Configuration
+    llm_cache_enabled: bool = Field(True, env="LLM_CACHE_ENABLED")
+    llm_cache_dir: str = Field(".cache/llm", env="LLM_CACHE_DIR")
+    llm_cache_ttl: int = Field(900, env="LLM_CACHE_TTL")
+    llm_cache_max_bytes: int = Field(50_000_000, env="LLM_CACHE_MAX_BYTES")
+    
+    # Streaming Log Diagnostics (sliding window of log_stream_buckets buckets)
+    log_stream_window: int = Field(300, env="LOG_STREAM_WINDOW")
+    log_stream_buckets: int = Field(30, env="LOG_STREAM_BUCKETS")
+    log_stream_threshold: int = Field(5, env="LOG_STREAM_THRESHOLD")
+    log_stream_poll_interval: int = Field(5, env="LOG_STREAM_POLL_INTERVAL")
+    log_stream_batch_size: int = Field(500, env="LOG_STREAM_BATCH_SIZE")
+    
+    # Log Template Mining
+    log_template_similarity: float = Field(0.5, env="LOG_TEMPLATE_SIMILARITY")
+    log_template_max_clusters: int = Field(1000, env="LOG_TEMPLATE_MAX_CLUSTERS")
+    
+    # Latency and Error-Rate Anomaly Detection (samples are sweeps)
+    anomaly_window: int = Field(60, env="ANOMALY_WINDOW")
+    anomaly_min_samples: int = Field(8, env="ANOMALY_MIN_SAMPLES")
+    anomaly_z_threshold: float = Field(3.5, env="ANOMALY_Z_THRESHOLD")
+    anomaly_ewma_alpha: float = Field(0.3, env="ANOMALY_EWMA_ALPHA")
+    anomaly_max_targets: int = Field(32, env="ANOMALY_MAX_TARGETS")
+    
+    # Incremental Diagnostics (per-bot log cursors and open issues)
+    cursors_enabled: bool = Field(True, env="CURSORS_ENABLED")
+    cursor_dir: str = Field(".cache/cursors", env="CURSOR_DIR")
+    cursor_max_fingerprints: int = Field(1000, env="CURSOR_MAX_FINGERPRINTS")
+    cursor_issue_ttl: int = Field(3600, env="CURSOR_ISSUE_TTL")
+    issue_store_max_records: int = Field(10000, env="ISSUE_STORE_MAX_RECORDS")
     
     # BV Studios Specific
     bv_studios_base_url: str = Field(
@@ -59,10 +123,27 @@ class TroubleshootingConfig(BaseSettings):
         "lead": "/api/admin/bots/lead"
     }
     
+    # Bot Endpoint Probing (names must be keys of admin_api_endpoints)
+    bot_probe_endpoints: List[str] = ["content", "lead"]
+    bot_probe_concurrency: int = Field(4, env="BOT_PROBE_CONCURRENCY")
+    bot_probe_timeout: int = Field(10, env="BOT_PROBE_TIMEOUT")
+    
+    # API Response Cache Configuration (TTLs in seconds, 0 disables caching)
+    api_cache_ttls: Dict[str, int] = {
+        "health": 15,
+        "logs": 10,
+        "database": 15,
+        "content": 30,
+        "lead": 30
+    }
+    api_cache_stale_ttl: int = Field(60, env="API_CACHE_STALE_TTL")
+    api_cache_max_entries: int = Field(256, env="API_CACHE_MAX_ENTRIES")
+    
     # Monitoring Configuration
     enable_agentops: bool = Field(True, env="ENABLE_AGENTOPS")
     enable_performance_metrics: bool = Field(True, env="ENABLE_PERFORMANCE_METRICS")
     metrics_collection_interval: int = Field(10, env="METRICS_COLLECTION_INTERVAL")
+    llm_call_history: int = Field(1000, env="LLM_CALL_HISTORY")  # Recent kickoffs kept; rollups cover all
     
     class Config:
         env_file = ".env"
@@ -87,6 +168,11 @@ class TroubleshootingConfig(BaseSettings):
 class BotRoles:
     """Defines roles and responsibilities for each bot"""
     
+    @classmethod
+    def for_bot_type(cls, bot_type: str) -> Optional[Dict[str, Any]]:
+        """Get the role definition for a bot type value such as web_fix"""
+        return getattr(cls, bot_type.upper(), None)
+    
     COORDINATOR = {
         "name": "TroubleshootingCoordinator",
         "role": "Troubleshooting Supervisor",
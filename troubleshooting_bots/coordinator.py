@@ -4,22 +4,49 @@ Uses CrewAI to coordinate 6 specialized diagnostic and fix sub-bots
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
+import functools
+import time
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import json
 
 from crewai import Agent, Crew, Task, Process
-from typing import Optional
+from langchain.tools import BaseTool
+from langchain.callbacks.manager import CallbackManagerForToolRun
 
-from config import config, BotRoles
+from config import config, BotRoles, ExecutionMode
+from executors import background_loop_runner, cpu_executor, resolution_scheduler
+from prompt_context import prompt_context_builder
+from llm_cache import llm_result_cache, crew_cache_key
+from cursors import cursor_store
+from log_index import build_log_index_for
+from log_stream import StreamingLogAnalyzer, default_thresholds
+from agent_pool import agent_pool
 from models import (
     WorkflowState, SystemInfo, Issue, DiagnosticReport, 
-    ResolutionReport, BotMessage, Severity, IssueType, BotType
+    ResolutionReport, BotMessage, Severity, IssueType, BotType, ProbeResult
 )
 from utils import (
-    StructuredLogger, BVStudiosAPI, generate_session_id,
-    calculate_execution_time, prioritize_issues, is_critical_error
+    StructuredLogger, current_api, bind_api, api_registry, generate_session_id,
+    calculate_execution_time, prioritize_issues, is_critical_error,
+    gather_with_deadline
 )
+from sessions import session_manager
+from monitoring import monitoring_system, LLMCallRecord
+from diagnostic_bots import (
+    web_diagnostic_bot, database_diagnostic_bot, network_diagnostic_bot,
+    bind_system_snapshot, current_system_snapshot
+)
+from diagnostic_registry import diagnostic_runner
+from issue_store import issue_store
+from fix_bots import web_fix_bot, database_fix_bot, network_fix_bot
+
+# Rule-based health statuses that are escalated to agents in hybrid mode
+INCONCLUSIVE_HEALTH_STATUSES = {"unknown", "error", "timeout"}
+
+# Session of the troubleshooting run executing in the current task context
+_current_session: ContextVar[Optional[WorkflowState]] = ContextVar("current_session", default=None)
 
 
 class BVStudiosHealthCheckTool(BaseTool):
@@ -28,26 +55,17 @@ class BVStudiosHealthCheckTool(BaseTool):
     name = "bv_studios_health_check"
     description = "Check the current health status of BV Studios platform"
     
-    def __init__(self):
-        super().__init__()
-        self.api = BVStudiosAPI()
-    
     async def _arun(self, **kwargs) -> str:
         """Async implementation of health check"""
         try:
-            health_data = await self.api.get_system_health()
+            health_data = await current_api().get_system_health()
             return json.dumps(health_data, indent=2)
         except Exception as e:
             return f"Health check failed: {str(e)}"
     
-    def _run(self, **kwargs, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs) -> str:
         """Sync wrapper for health check"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(**kwargs))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(**kwargs))
 
 
 class BVStudiosLogAnalysisTool(BaseTool):
@@ -56,26 +74,17 @@ class BVStudiosLogAnalysisTool(BaseTool):
     name = "bv_studios_log_analysis"
     description = "Analyze recent system logs for error patterns and issues"
     
-    def __init__(self):
-        super().__init__()
-        self.api = BVStudiosAPI()
-    
     async def _arun(self, limit: int = 50) -> str:
         """Async implementation of log analysis"""
         try:
-            logs_data = await self.api.get_recent_logs(limit)
+            logs_data = await current_api().get_recent_logs(limit)
             return json.dumps(logs_data, indent=2)
         except Exception as e:
             return f"Log analysis failed: {str(e)}"
     
     def _run(self, limit: int = 50, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         """Sync wrapper for log analysis"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(limit))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(limit))
 
 
 class TroubleshootingCoordinator:
@@ -86,41 +95,79 @@ class TroubleshootingCoordinator:
     
     def __init__(self):
         self.logger = StructuredLogger.get_logger("troubleshooting_coordinator")
-        self.api = BVStudiosAPI()
         self.tools = [
             BVStudiosHealthCheckTool(),
             BVStudiosLogAnalysisTool()
         ]
         
-        # Initialize the supervisor agent
-        self.supervisor_agent = Agent(
-            role=BotRoles.COORDINATOR["role"],
-            goal=BotRoles.COORDINATOR["goal"], 
-            backstory=BotRoles.COORDINATOR["backstory"],
-            verbose=True,
-            allow_delegation=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.COORDINATOR["max_execution_time"]
-        )
+        # Coordinator tools are available to the supervisor and every agent it runs
+        for bot_type in BotType:
+            agent_pool.register_tools(bot_type, lambda: self.tools)
         
-        # State management
-        self.current_session: Optional[WorkflowState] = None
+        # Diagnostic bots with agent tasks; the deterministic and hybrid modes
+        # run every bot in the diagnostic registry
+        self.diagnostic_bots = {
+            BotType.WEB_DIAGNOSTIC: web_diagnostic_bot,
+            BotType.DATABASE_DIAGNOSTIC: database_diagnostic_bot,
+            BotType.NETWORK_DIAGNOSTIC: network_diagnostic_bot
+        }
+        self.fix_bots = {
+            BotType.WEB_FIX: web_fix_bot,
+            BotType.DATABASE_FIX: database_fix_bot,
+            BotType.NETWORK_FIX: network_fix_bot
+        }
+        
+        # State management, one session per concurrent run
+        self.sessions = session_manager
+    
+    @property
+    def current_session(self) -> Optional[WorkflowState]:
+        """Session of the run executing in the current task context"""
+        return _current_session.get()
+    
+    @current_session.setter
+    def current_session(self, session: Optional[WorkflowState]):
+        _current_session.set(session)
+    
+    @property
+    def supervisor_agent(self) -> Agent:
+        """Pooled supervisor agent, built on first use"""
+        return agent_pool.get(BotType.COORDINATOR)
+    
+    def warm_up(self) -> Dict[BotType, float]:
+        """Build all pooled agents before the first session"""
+        construction_times = agent_pool.warm_up(list(BotType))
+        self.logger.info(
+            "Agent pool warmed up",
+            agents=len(construction_times),
+            total_construction_time=round(sum(construction_times.values()), 4)
+        )
+        return construction_times
     
-    async def start_troubleshooting_session(self, initial_issue: Optional[str] = None) -> WorkflowState:
+    async def start_troubleshooting_session(self, initial_issue: Optional[str] = None,
+                                            session_id: Optional[str] = None,
+                                            target_url: Optional[str] = None) -> WorkflowState:
         """
         Start a new troubleshooting session
+        target_url selects the deployment to troubleshoot (defaults to the configured base URL)
         """
-        session_id = generate_session_id()
+        session_id = session_id or generate_session_id()
+        api = api_registry.get(target_url)
         
         self.logger.info(
             "Starting new troubleshooting session",
             session_id=session_id,
-            initial_issue=initial_issue
+            initial_issue=initial_issue,
+            target_url=api.base_url
         )
         
+        # Route API calls made in this context, including tool calls, to the target
+        bind_api(api)
+        
         # Initialize workflow state
         self.current_session = WorkflowState(
             session_id=session_id,
+            target_url=api.base_url,
             phase="initialization",
             current_step="system_assessment"
         )
@@ -129,37 +176,77 @@ class TroubleshootingCoordinator:
         system_info = await self._gather_system_info()
         self.current_session.system_info = system_info
         
+        # Diagnostic tools read this snapshot instead of re-fetching each source
+        bind_system_snapshot(system_info)
+        
         return self.current_session
     
-    async def _gather_system_info(self) -> SystemInfo:
+    async def _gather_system_info(self, force_refresh: bool = False) -> SystemInfo:
         """
         Gather comprehensive system information for assessment
+        Set force_refresh to bypass cached API responses (e.g. for verification)
         """
-        self.logger.info("Gathering system information")
+        self.logger.info("Gathering system information", force_refresh=force_refresh)
         
         try:
-            # Get system health
-            health_data = await self.api.get_system_health()
+            api = current_api()
             
-            # Get recent logs  
-            logs_data = await self.api.get_recent_logs(100)
+            # Run all probes concurrently under the shared diagnostic deadline
+            outcomes = await gather_with_deadline({
+                "health": api.get_system_health(force_refresh=force_refresh),
+                "logs": api.get_recent_logs(100, force_refresh=force_refresh),
+                "database": api.test_database_connection(force_refresh=force_refresh),
+                "bot_operations": api.test_bot_operations(force_refresh=force_refresh)
+            }, timeout=config.diagnostic_timeout)
             
-            # Test database connectivity
-            db_test = await self.api.test_database_connection()
+            probe_results = {}
+            for name, outcome in outcomes.items():
+                result = outcome["result"]
+                # API helpers report endpoint failures in-band as an "error" key
+                error = outcome["error"] or (result.get("error") if isinstance(result, dict) else None)
+                probe_results[name] = ProbeResult(
+                    success=error is None,
+                    latency=outcome["latency"],
+                    error=str(error) if error is not None else None,
+                    timed_out=outcome["timed_out"]
+                )
             
-            # Test bot operations
-            bot_test = await self.api.test_bot_operations()
+            def probe_data(name: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+                outcome = outcomes[name]
+                return outcome["result"] if outcome["success"] else fallback
+            
+            health_data = probe_data(
+                "health", {"error": probe_results["health"].error, "status": "unavailable"}
+            )
+            logs_data = probe_data("logs", {"logs": []})
+            db_test = probe_data(
+                "database", {"error": probe_results["database"].error, "success": False}
+            )
+            bot_test = probe_data("bot_operations", {})
             
             system_info = SystemInfo(
-                base_url=config.bv_studios_base_url,
+                base_url=api.base_url,
                 api_status=health_data,
                 database_status=db_test,
                 recent_logs=logs_data.get("logs", []),
                 performance_metrics={
                     "bot_operations": bot_test
-                }
+                },
+                probe_results=probe_results
             )
             
+            # Index the logs once; every diagnostic bot queries this index
+            log_index = await build_log_index_for(system_info, cpu_executor)
+            templates = cursor_store.mine_error_templates(api.base_url, log_index)[:10]
+            system_info = system_info.model_copy(update={
+                "error_patterns": [template.template for template in templates],
+                "error_templates": [template.to_dict() for template in templates]
+            })
+            
+            failed_probes = [name for name, probe in probe_results.items() if not probe.success]
+            if failed_probes:
+                self.logger.warning("Some system probes failed", failed_probes=failed_probes)
+            
             self.logger.info("System information gathered successfully")
             return system_info
             
@@ -168,75 +255,95 @@ class TroubleshootingCoordinator:
             
             # Return minimal system info with error
             return SystemInfo(
-                base_url=config.bv_studios_base_url,
+                base_url=current_api().base_url,
                 api_status={"error": str(e), "status": "error"},
                 database_status={"error": str(e), "success": False},
                 recent_logs=[],
                 error_patterns=[str(e)]
             )
     
-    async def execute_diagnostic_phase(self) -> List[DiagnosticReport]:
+    async def execute_diagnostic_phase(self, bot_types: Optional[List[BotType]] = None,
+                                       escalated_from: Optional[Dict[BotType, DiagnosticReport]] = None
+                                       ) -> List[DiagnosticReport]:
         """
         Execute the diagnostic phase using specialized diagnostic bots
+        Escalations pass the inconclusive rule-based reports as escalated_from;
+        only their areas are re-diagnosed and only their bot types are reported
         """
         if not self.current_session:
             raise ValueError("No active troubleshooting session")
         
-        self.logger.info("Starting diagnostic phase", session_id=self.current_session.session_id)
+        if escalated_from is not None:
+            bot_types = list(escalated_from)
+        bot_types = bot_types or list(self.diagnostic_bots)
+        self.logger.info(
+            "Starting diagnostic phase",
+            session_id=self.current_session.session_id,
+            bot_types=[bot_type.value for bot_type in bot_types]
+        )
         
         self.current_session.phase = "diagnosis"
         self.current_session.current_step = "running_diagnostics"
         
+        # Serialize system info once into a compact digest per bot
+        prompt_contexts = prompt_context_builder.build(self.current_session.system_info, bot_types)
+        
         # Create diagnostic tasks for each specialized bot
         diagnostic_tasks = []
         
         # Web Diagnostic Task
-        web_diagnostic_task = Task(
-            description=f"""
-            Analyze the BV Studios web frontend for issues:
-            - Check React component errors and rendering issues
-            - Analyze Next.js routing and page load performance
-            - Review client-side JavaScript errors
-            - Assess UI/UX problems from recent logs
-            
-            System Info: {json.dumps(self.current_session.system_info.dict(), indent=2)}
-            """,
-            agent=self._create_diagnostic_agent(BotType.WEB_DIAGNOSTIC),
-            expected_output="Detailed diagnostic report with identified frontend issues"
-        )
-        diagnostic_tasks.append(web_diagnostic_task)
+        if BotType.WEB_DIAGNOSTIC in bot_types:
+            web_diagnostic_task = Task(
+                description=f"""
+                Analyze the BV Studios web frontend for issues:
+                - Check React component errors and rendering issues
+                - Analyze Next.js routing and page load performance
+                - Review client-side JavaScript errors
+                - Assess UI/UX problems from recent logs
+                
+                System Context:
+                {prompt_contexts[BotType.WEB_DIAGNOSTIC]}
+                """,
+                agent=self._create_diagnostic_agent(BotType.WEB_DIAGNOSTIC),
+                expected_output="Detailed diagnostic report with identified frontend issues"
+            )
+            diagnostic_tasks.append(web_diagnostic_task)
         
         # Database Diagnostic Task
-        db_diagnostic_task = Task(
-            description=f"""
-            Analyze the BV Studios database system for issues:
-            - Check PostgreSQL connection status and performance
-            - Review Prisma ORM query patterns and slow queries
-            - Analyze database connection pool utilization
-            - Identify data integrity issues
-            
-            System Info: {json.dumps(self.current_session.system_info.dict(), indent=2)}
-            """,
-            agent=self._create_diagnostic_agent(BotType.DATABASE_DIAGNOSTIC),
-            expected_output="Detailed diagnostic report with identified database issues"
-        )
-        diagnostic_tasks.append(db_diagnostic_task)
+        if BotType.DATABASE_DIAGNOSTIC in bot_types:
+            db_diagnostic_task = Task(
+                description=f"""
+                Analyze the BV Studios database system for issues:
+                - Check PostgreSQL connection status and performance
+                - Review Prisma ORM query patterns and slow queries
+                - Analyze database connection pool utilization
+                - Identify data integrity issues
+                
+                System Context:
+                {prompt_contexts[BotType.DATABASE_DIAGNOSTIC]}
+                """,
+                agent=self._create_diagnostic_agent(BotType.DATABASE_DIAGNOSTIC),
+                expected_output="Detailed diagnostic report with identified database issues"
+            )
+            diagnostic_tasks.append(db_diagnostic_task)
         
         # Network Diagnostic Task
-        network_diagnostic_task = Task(
-            description=f"""
-            Analyze the BV Studios network and API layer for issues:
-            - Check API endpoint response times and error rates
-            - Review authentication flow performance
-            - Analyze external integration health
-            - Identify network bottlenecks and timeouts
-            
-            System Info: {json.dumps(self.current_session.system_info.dict(), indent=2)}
-            """,
-            agent=self._create_diagnostic_agent(BotType.NETWORK_DIAGNOSTIC),
-            expected_output="Detailed diagnostic report with identified network issues"
-        )
-        diagnostic_tasks.append(network_diagnostic_task)
+        if BotType.NETWORK_DIAGNOSTIC in bot_types:
+            network_diagnostic_task = Task(
+                description=f"""
+                Analyze the BV Studios network and API layer for issues:
+                - Check API endpoint response times and error rates
+                - Review authentication flow performance
+                - Analyze external integration health
+                - Identify network bottlenecks and timeouts
+                
+                System Context:
+                {prompt_contexts[BotType.NETWORK_DIAGNOSTIC]}
+                """,
+                agent=self._create_diagnostic_agent(BotType.NETWORK_DIAGNOSTIC),
+                expected_output="Detailed diagnostic report with identified network issues"
+            )
+            diagnostic_tasks.append(network_diagnostic_task)
         
         # Execute diagnostic crew
         diagnostic_crew = Crew(
@@ -248,14 +355,24 @@ class TroubleshootingCoordinator:
         )
         
         try:
-            diagnostic_results = diagnostic_crew.kickoff()
+            # Reuse the cached result for identical prompts, otherwise run
+            # the blocking kickoff off the event loop
+            diagnostic_results = await self._kickoff_crew(
+                diagnostic_crew,
+                BotType.COORDINATOR,
+                "diagnostic_phase",
+                timeout=BotRoles.COORDINATOR["max_execution_time"]
+            )
             
             # Process diagnostic results into structured reports
-            diagnostic_reports = self._process_diagnostic_results(diagnostic_results)
+            if escalated_from is not None:
+                diagnostic_reports = self._escalated_reports(diagnostic_results, escalated_from)
+            else:
+                diagnostic_reports = self._process_diagnostic_results(diagnostic_results)
             
-            # Update session state
+            # Fingerprint agent findings like the diagnostic runner does, then update session state
             for report in diagnostic_reports:
-                self.current_session.add_diagnostic_report(report)
+                self.current_session.add_diagnostic_report(issue_store.record_report(report))
             
             self.logger.info(
                 "Diagnostic phase completed",
@@ -269,26 +386,47 @@ class TroubleshootingCoordinator:
             self.logger.error("Diagnostic phase failed", error=str(e))
             raise
     
-    def _create_diagnostic_agent(self, bot_type: BotType) -> Agent:
-        """Create a specialized diagnostic agent"""
+    async def _kickoff_crew(self, crew: Crew, bot_type: BotType, operation: str,
+                            timeout: Optional[float] = None, cacheable: bool = True) -> Any:
+        """
+        Run a crew, recording LLM call metrics
         
-        role_config = {
-            BotType.WEB_DIAGNOSTIC: BotRoles.WEB_DIAGNOSTIC,
-            BotType.DATABASE_DIAGNOSTIC: BotRoles.DATABASE_DIAGNOSTIC,
-            BotType.NETWORK_DIAGNOSTIC: BotRoles.NETWORK_DIAGNOSTIC
-        }.get(bot_type)
+        Cacheable crews go through the result cache. Crews whose tools act
+        on the system, such as fix crews, must not be cacheable: a cache hit
+        would report their actions without performing them.
+        """
+        computed = False
+        start_time = time.monotonic()
+        
+        async def compute() -> Any:
+            nonlocal computed
+            computed = True
+            return await monitoring_system.performance_monitor.run_crew(
+                crew, bot_type, operation, timeout=timeout
+            )
+        
+        if not cacheable:
+            return await compute()
+        
+        result = await llm_result_cache.get_or_compute(crew_cache_key(crew), compute)
+        
+        if not computed:
+            monitoring_system.metrics_collector.record_llm_call(LLMCallRecord(
+                bot_type=bot_type,
+                operation=operation,
+                wall_time=time.monotonic() - start_time,
+                cached=True
+            ))
         
-        if not role_config:
+        return result
+    
+    def _create_diagnostic_agent(self, bot_type: BotType) -> Agent:
+        """Get the pooled agent for a diagnostic bot type"""
+        
+        if bot_type not in self.diagnostic_bots:
             raise ValueError(f"Unknown diagnostic bot type: {bot_type}")
         
-        return Agent(
-            role=role_config["role"],
-            goal=role_config["goal"],
-            backstory=role_config["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=role_config["max_execution_time"]
-        )
+        return agent_pool.get(bot_type)
     
     def _process_diagnostic_results(self, results: Any) -> List[DiagnosticReport]:
         """Process raw diagnostic results into structured reports"""
@@ -321,6 +459,148 @@ class TroubleshootingCoordinator:
         
         return diagnostic_reports
     
+    def _escalated_reports(self, results: Any,
+                           rule_reports: Dict[BotType, DiagnosticReport]) -> List[DiagnosticReport]:
+        """
+        Reports for escalated areas: each rule-based report with the agents' review attached
+        
+        Agent output is not parsed into issues yet, so escalations never add
+        the placeholder issues of _process_diagnostic_results to a session.
+        """
+        review = str(results).strip()
+        return [
+            report.model_copy(deep=True, update={
+                "recommendations": report.recommendations + ([f"Agent review: {review[:1000]}"] if review else [])
+            })
+            for report in rule_reports.values()
+        ]
+    
+    async def execute_deterministic_diagnostic_phase(self, escalate: bool = False) -> List[DiagnosticReport]:
+        """
+        Execute the diagnostic phase with the rule-based bots, without the LLM
+        With escalate set, inconclusive areas are re-diagnosed by agents
+        """
+        if not self.current_session:
+            raise ValueError("No active troubleshooting session")
+        
+        self.logger.info(
+            "Starting deterministic diagnostic phase",
+            session_id=self.current_session.session_id,
+            escalate=escalate
+        )
+        
+        self.current_session.phase = "diagnosis"
+        self.current_session.current_step = "running_rule_diagnostics"
+        
+        # Every registered bot runs under its own deadline; stragglers yield partial reports
+        outcomes = await diagnostic_runner.run(self.current_session.system_info)
+        
+        diagnostic_reports = []
+        inconclusive: Dict[BotType, DiagnosticReport] = {}
+        
+        for outcome in outcomes:
+            bot_type = outcome.spec.bot_type
+            if not outcome.completed:
+                self.logger.error(
+                    "Rule-based diagnostic bot did not complete",
+                    bot_type=bot_type.value,
+                    status=outcome.status,
+                    error=outcome.error
+                )
+            
+            # Only the bots with agent tasks can be escalated
+            result = outcome.report
+            if (escalate and bot_type in self.diagnostic_bots
+                    and result.health_status in INCONCLUSIVE_HEALTH_STATUSES):
+                inconclusive[bot_type] = result
+                continue
+            
+            diagnostic_reports.append(result)
+            self.current_session.add_diagnostic_report(result)
+        
+        if escalate and inconclusive:
+            self.logger.info(
+                "Escalating inconclusive diagnostics to agents",
+                session_id=self.current_session.session_id,
+                bot_types=[bot_type.value for bot_type in inconclusive]
+            )
+            self.current_session.escalated_bots.extend(inconclusive)
+            diagnostic_reports.extend(await self.execute_diagnostic_phase(escalated_from=inconclusive))
+        
+        self.logger.info(
+            "Deterministic diagnostic phase completed",
+            session_id=self.current_session.session_id,
+            issues_found=len(self.current_session.all_issues),
+            escalated=len(inconclusive) if escalate else 0
+        )
+        
+        return diagnostic_reports
+    
+    async def execute_deterministic_resolution_phase(self, escalate: bool = False) -> List[ResolutionReport]:
+        """
+        Execute the resolution phase with the rule-based fix bots, without the LLM
+        With escalate set, issues the rule-based fixes did not resolve go to agents
+        """
+        if not self.current_session:
+            raise ValueError("No active troubleshooting session")
+        
+        self.logger.info(
+            "Starting deterministic resolution phase",
+            session_id=self.current_session.session_id,
+            escalate=escalate
+        )
+        
+        self.current_session.phase = "resolution"
+        self.current_session.current_step = "applying_rule_fixes"
+        
+        unresolved_issues = self.current_session.get_unresolved_issues()
+        prioritized_issues = prioritize_issues([issue.dict() for issue in unresolved_issues])
+        
+        # Group the top priority issues by the fix bot that handles them
+        issues_by_bot: Dict[BotType, List[Issue]] = {}
+        for issue_data in prioritized_issues[:5]:
+            issue = Issue(**issue_data)
+            fix_bot_type = self._determine_fix_bot(issue)
+            if fix_bot_type:
+                issues_by_bot.setdefault(fix_bot_type, []).append(issue)
+        
+        async def resolve(bot_type: BotType, issues: List[Issue]) -> List[ResolutionReport]:
+            resolution_report = await self.fix_bots[bot_type].resolve_issues(issues)
+            self.current_session.add_resolution_report(resolution_report)
+            reports = [resolution_report]
+            
+            if escalate:
+                remaining = [issue for issue in issues if issue.id not in resolution_report.issues_resolved]
+                if remaining and bot_type not in self.current_session.escalated_bots:
+                    self.current_session.escalated_bots.append(bot_type)
+                for issue in remaining:
+                    self.logger.info("Escalating unresolved issue to agent", issue_id=issue.id, bot_type=bot_type.value)
+                    reports.append(await self._execute_fix_bot(issue, bot_type))
+            
+            return reports
+        
+        # Each fix bot handles its issues in one job; jobs touching the same component run in turn
+        results = await resolution_scheduler.run_all(
+            [
+                (self._fix_keys(issues, bot_type), functools.partial(resolve, bot_type, issues))
+                for bot_type, issues in issues_by_bot.items()
+            ],
+            timeout=config.fix_timeout
+        )
+        
+        resolution_reports = []
+        for (bot_type, issues), result in zip(issues_by_bot.items(), results):
+            if isinstance(result, asyncio.TimeoutError):
+                self.logger.error("Rule-based fix bot timed out", bot_type=bot_type.value, timeout=config.fix_timeout)
+                resolution_reports.append(self._timed_out_resolution(bot_type, issues))
+                continue
+            if isinstance(result, BaseException):
+                self.logger.error("Rule-based fix bot failed", bot_type=bot_type.value, error=str(result))
+                continue
+            resolution_reports.extend(result)
+        
+        return resolution_reports
+    
     async def execute_resolution_phase(self) -> List[ResolutionReport]:
         """
         Execute the resolution phase using specialized fix bots
@@ -337,7 +617,7 @@ class TroubleshootingCoordinator:
         unresolved_issues = self.current_session.get_unresolved_issues()
         prioritized_issues = prioritize_issues([issue.dict() for issue in unresolved_issues])
         
-        resolution_reports = []
+        scheduled = []
         
         for issue_data in prioritized_issues[:5]:  # Handle top 5 priority issues
             issue = Issue(**issue_data)
@@ -353,11 +633,52 @@ class TroubleshootingCoordinator:
             fix_bot_type = self._determine_fix_bot(issue)
             
             if fix_bot_type:
-                resolution_report = await self._execute_fix_bot(issue, fix_bot_type)
-                resolution_reports.append(resolution_report)
+                scheduled.append((issue, fix_bot_type))
+        
+        # Independent fixes run concurrently; fixes sharing a component or bot type run in turn
+        results = await resolution_scheduler.run_all(
+            [
+                (self._fix_keys([issue], fix_bot_type),
+                 functools.partial(self._execute_fix_bot, issue, fix_bot_type))
+                for issue, fix_bot_type in scheduled
+            ],
+            timeout=config.fix_timeout
+        )
+        
+        resolution_reports = []
+        for (issue, fix_bot_type), result in zip(scheduled, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self.logger.error("Fix bot timed out", issue_id=issue.id, timeout=config.fix_timeout)
+                result = self._timed_out_resolution(fix_bot_type, [issue])
+            elif isinstance(result, BaseException):
+                raise result
+            resolution_reports.append(result)
         
         return resolution_reports
     
+    def _timed_out_resolution(self, bot_type: BotType, issues: List[Issue]) -> ResolutionReport:
+        """Record a failed resolution report for a fix job that exceeded config.fix_timeout"""
+        report = ResolutionReport(
+            bot_name=f"Bot{bot_type.value.title().replace('_', '')}",
+            bot_type=bot_type,
+            execution_time=float(config.fix_timeout),
+            issues_resolved=[],
+            overall_success=False,
+            notes=(
+                f"Failed to resolve {', '.join(issue.title for issue in issues)}: "
+                f"timed out after {config.fix_timeout}s"
+            )
+        )
+        self.current_session.add_resolution_report(report)
+        return report
+    
+    def _fix_keys(self, issues: List[Issue], bot_type: BotType) -> List[str]:
+        """Scheduler keys for fixes: the fix bot type and each affected component, per target"""
+        target = self.current_session.target_url or config.bv_studios_base_url
+        keys = [f"{target}:bot:{bot_type.value}"]
+        keys.extend(f"{target}:component:{issue.component}" for issue in issues if issue.component)
+        return keys
+    
     def _determine_fix_bot(self, issue: Issue) -> Optional[BotType]:
         """Determine which fix bot should handle the issue"""
         
@@ -414,7 +735,9 @@ class TroubleshootingCoordinator:
                 verbose=True
             )
             
-            fix_result = fix_crew.kickoff()
+            fix_result = await self._kickoff_crew(
+                fix_crew, bot_type, "fix", timeout=config.fix_timeout, cacheable=False
+            )
             execution_time = calculate_execution_time(start_time)
             
             # Process fix result into resolution report
@@ -446,25 +769,12 @@ class TroubleshootingCoordinator:
             )
     
     def _create_fix_agent(self, bot_type: BotType) -> Agent:
-        """Create a specialized fix agent"""
+        """Get the pooled agent for a fix bot type"""
         
-        role_config = {
-            BotType.WEB_FIX: BotRoles.WEB_FIX,
-            BotType.DATABASE_FIX: BotRoles.DATABASE_FIX,
-            BotType.NETWORK_FIX: BotRoles.NETWORK_FIX
-        }.get(bot_type)
-        
-        if not role_config:
+        if bot_type not in self.fix_bots:
             raise ValueError(f"Unknown fix bot type: {bot_type}")
         
-        return Agent(
-            role=role_config["role"],
-            goal=role_config["goal"],
-            backstory=role_config["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=role_config["max_execution_time"]
-        )
+        return agent_pool.get(bot_type)
     
     async def generate_final_report(self) -> Dict[str, Any]:
         """Generate comprehensive final troubleshooting report"""
@@ -511,6 +821,8 @@ class TroubleshootingCoordinator:
             "diagnostic_reports": len(self.current_session.diagnostic_reports),
             "resolution_reports": len(self.current_session.resolution_reports),
             "duration": calculate_execution_time(self.current_session.started_at),
+            "execution_mode": self.current_session.execution_mode,
+            "escalated_bots": [bot_type.value for bot_type in self.current_session.escalated_bots],
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -523,28 +835,133 @@ class TroubleshootingCoordinator:
         
         return final_report
     
-    async def run_complete_troubleshooting(self, initial_issue: Optional[str] = None) -> Dict[str, Any]:
+    async def run_complete_troubleshooting(self, initial_issue: Optional[str] = None,
+                                           mode: Optional[ExecutionMode] = None,
+                                           target_url: Optional[str] = None,
+                                           session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Run a complete troubleshooting workflow from start to finish
+        mode overrides the configured execution mode for this run and target_url
+        the deployment to troubleshoot. Runs beyond the concurrency limit wait
+        for a free slot; the session can be cancelled while waiting or running.
         """
+        mode = ExecutionMode(mode or config.execution_mode)
+        session_id = session_id or generate_session_id()
+        self.sessions.register_task(session_id)
+        
+        # The run binds its own session and API client; restore the caller's afterwards
+        previous_session, previous_api = self.current_session, current_api()
+        previous_snapshot = current_system_snapshot()
+        status = "failed"
+        final_report = None
+        
+        # Hold the target's API client until the run ends
+        api_registry.acquire(target_url)
+        
         try:
-            # Start session
-            await self.start_troubleshooting_session(initial_issue)
-            
-            # Execute diagnostic phase
-            await self.execute_diagnostic_phase()
-            
-            # Execute resolution phase
-            await self.execute_resolution_phase()
-            
-            # Generate final report
-            final_report = await self.generate_final_report()
+            # Agents are leased for the session, so concurrent sessions never share one
+            async with self.sessions.slot():
+                with agent_pool.lease():
+                    # Start session
+                    await self.start_troubleshooting_session(initial_issue, session_id, target_url)
+                    self.sessions.start(self.current_session)
+                    self.current_session.execution_mode = mode.value
+                
+                    if mode == ExecutionMode.AGENT:
+                        await self.execute_diagnostic_phase()
+                        await self.execute_resolution_phase()
+                    else:
+                        escalate = mode == ExecutionMode.HYBRID
+                        await self.execute_deterministic_diagnostic_phase(escalate=escalate)
+                        await self.execute_deterministic_resolution_phase(escalate=escalate)
+                
+                    # Generate final report
+                    final_report = await self.generate_final_report()
+                    status = "completed"
+                
+                    return final_report
             
-            return final_report
+        except asyncio.CancelledError:
+            status = "cancelled"
+            self.logger.warning("Troubleshooting session cancelled", session_id=session_id)
+            raise
             
         except Exception as e:
-            self.logger.error("Complete troubleshooting failed", error=str(e))
+            self.logger.error("Complete troubleshooting failed", error=str(e), session_id=session_id)
             raise
+        
+        finally:
+            self.sessions.finish(session_id, status, final_report)
+            self.current_session = previous_session
+            bind_api(previous_api)
+            bind_system_snapshot(previous_snapshot)
+            
+            # The API client of a preview target closes once no run holds it
+            await api_registry.release(target_url)
+    
+    def submit_troubleshooting(self, initial_issue: Optional[str] = None,
+                               mode: Optional[ExecutionMode] = None,
+                               target_url: Optional[str] = None) -> str:
+        """Start a troubleshooting run in the background and return its session ID"""
+        session_id = generate_session_id()
+        task = asyncio.ensure_future(
+            self.run_complete_troubleshooting(initial_issue, mode, target_url, session_id)
+        )
+        self.sessions.register_task(session_id, task)
+        return session_id
+    
+    async def wait_for_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Wait for a session to finish and return its final report"""
+        task = self.sessions.get_task(session_id)
+        if task is not None:
+            return await asyncio.shield(task)
+        
+        record = self.sessions.get_finished(session_id)
+        if record is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        return record["report"]
+    
+    def get_session(self, session_id: str) -> Optional[WorkflowState]:
+        """Get the state of an active or recently finished session"""
+        return self.sessions.get(session_id)
+    
+    def cancel_session(self, session_id: str) -> bool:
+        """Cancel a running or queued session"""
+        return self.sessions.cancel(session_id)
+    
+    async def stream_diagnostics(self, target_url: Optional[str] = None,
+                                 max_polls: Optional[int] = None) -> AsyncIterator[Issue]:
+        """
+        Watch a target's logs continuously, yielding Issues as soon as a
+        pattern crosses its sliding-window threshold
+        Unlike the diagnostic phase this sees every log line, not a snapshot
+        """
+        api = api_registry.acquire(target_url)
+        analyzer = StreamingLogAnalyzer(
+            window_seconds=config.log_stream_window,
+            buckets=config.log_stream_buckets,
+            thresholds=default_thresholds(config.log_stream_threshold)
+        )
+        logs = api.stream_logs(
+            batch_size=config.log_stream_batch_size,
+            poll_interval=config.log_stream_poll_interval,
+            max_polls=max_polls
+        )
+        
+        self.logger.info("Starting streaming diagnostics", target_url=api.base_url)
+        try:
+            async for issue in analyzer.analyze(logs):
+                issue_store.record(issue)
+                self.logger.warning(
+                    "Log window threshold crossed",
+                    issue_id=issue.id,
+                    threshold=issue.context["threshold"],
+                    window_count=issue.context["window_count"]
+                )
+                yield issue
+        finally:
+            self.logger.info("Streaming diagnostics stopped", **analyzer.get_stats())
+            await api_registry.release(target_url)
 
 
 # Global coordinator instance
@@ -3,14 +3,53 @@ Cursor AI Error Pattern Detection Module
 Detects the specific types of issues that Cursor AI previously fixed
 """
 
+import functools
+import hashlib
+import os
 import re
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime
 
+from config import config
+from executors import CPUExecutor, cpu_executor
 from models import Issue, Severity, IssueType, BotType
 from utils import StructuredLogger
 
+# Source files vary in size; small chunks keep the workers evenly loaded
+FILES_PER_CHUNK = 16
+
+
+def scan_source_files(rules: Sequence[Tuple[str, str, Tuple[str, ...]]],
+                      files: List[Tuple[str, str]]) -> List[Tuple[str, List[Tuple[str, int, str]], Optional[str]]]:
+    """
+    Scan source files against pattern rules given as (id, pattern, file extensions)
+
+    Runs in CPU executor workers, so it takes and returns plain tuples. For
+    each (path, relative path) returns the relative path, the (rule id,
+    line number, matched text) of every match and the read error, if any.
+    """
+    results = []
+    for file_path, relative_path in files:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            results.append((relative_path, [], str(e)))
+            continue
+        
+        matches = []
+        for rule_id, pattern, extensions in rules:
+            if not file_path.endswith(extensions):
+                continue
+            line_number, offset = 1, 0
+            for match in re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE):
+                line_number += content.count('\n', offset, match.start())
+                offset = match.start()
+                matches.append((rule_id, line_number, match.group()[:100]))  # First 100 chars of match
+        results.append((relative_path, matches, None))
+    return results
+
 
 class CursorAIPatternDetector:
     """
@@ -18,8 +57,9 @@ class CursorAIPatternDetector:
     Helps prevent regression of these specific problems
     """
     
-    def __init__(self):
+    def __init__(self, executor: Optional[CPUExecutor] = None):
         self.logger = StructuredLogger.get_logger("cursor_ai_patterns")
+        self.executor = executor or cpu_executor
         
         # Define the specific patterns Cursor AI fixed
         self.pattern_rules = [
@@ -88,7 +128,8 @@ class CursorAIPatternDetector:
         detected_issues = []
         
         try:
-            import os
+            extensions = tuple({ext for rule in self.pattern_rules for ext in rule["file_extensions"]})
+            source_files = []
             
             # Walk through the codebase
             for root, dirs, files in os.walk(base_path):
@@ -96,18 +137,36 @@ class CursorAIPatternDetector:
                 dirs[:] = [d for d in dirs if not d.startswith(('.', 'node_modules', 'dist', 'build'))]
                 
                 for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, base_path)
-                    
-                    # Check each pattern rule
-                    for rule in self.pattern_rules:
-                        if any(file.endswith(ext) for ext in rule["file_extensions"]):
-                            issues = await self._scan_file_for_pattern(file_path, relative_path, rule)
-                            detected_issues.extend(issues)
+                    if file.endswith(extensions):
+                        file_path = os.path.join(root, file)
+                        source_files.append((file_path, os.path.relpath(file_path, base_path)))
+            
+            # Each file is read once and checked against every rule; large
+            # codebases are scanned in chunks on the CPU executor
+            rules = tuple(
+                (rule["id"], rule["pattern"], tuple(rule["file_extensions"])) for rule in self.pattern_rules
+            )
+            results = await self.executor.map_chunks(
+                functools.partial(scan_source_files, rules),
+                source_files,
+                min_items=config.cpu_offload_min_files,
+                chunk_size=FILES_PER_CHUNK
+            )
+            
+            rules_by_id = {rule["id"]: rule for rule in self.pattern_rules}
+            for relative_path, matches, error in results:
+                if error is not None:
+                    self.logger.error("Failed to scan file for patterns", file_path=relative_path, error=error)
+                    continue
+                for rule_id, line_number, matched_text in matches:
+                    detected_issues.append(
+                        self._pattern_issue(rules_by_id[rule_id], relative_path, line_number, matched_text)
+                    )
             
             self.logger.info(
                 "Cursor AI pattern scan completed",
                 issues_found=len(detected_issues),
+                files_scanned=len(source_files),
                 base_path=base_path
             )
             
@@ -117,58 +176,36 @@ class CursorAIPatternDetector:
             self.logger.error("Cursor AI pattern scan failed", error=str(e))
             return []
     
-    async def _scan_file_for_pattern(self, file_path: str, relative_path: str, rule: Dict[str, Any]) -> List[Issue]:
+    def _pattern_issue(self, rule: Dict[str, Any], relative_path: str, line_number: int,
+                       matched_text: str) -> Issue:
         """
-        Scan a single file for a specific pattern
+        Build the issue for one pattern match
         """
-        issues = []
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Search for the pattern
-            matches = re.finditer(rule["pattern"], content, re.MULTILINE | re.IGNORECASE)
-            
-            for match in matches:
-                # Calculate line number
-                line_number = content[:match.start()].count('\n') + 1
-                
-                issue = Issue(
-                    id=f"cursor_{rule['id']}_{hash(relative_path)}_{line_number}",
-                    type=rule["issue_type"],
-                    severity=rule["severity"],
-                    title=rule["title"],
-                    description=f"{rule['description']} (File: {relative_path}, Line: {line_number})",
-                    component=relative_path,
-                    detected_by=BotType.WEB_DIAGNOSTIC,  # Using web diagnostic as primary detector
-                    error_messages=[f"Pattern '{rule['pattern']}' found at line {line_number}"],
-                    context={
-                        "file_path": relative_path,
-                        "line_number": line_number,
-                        "pattern_id": rule["id"],
-                        "matched_text": match.group()[:100]  # First 100 chars of match
-                    }
-                )
-                
-                issues.append(issue)
-                
-                self.logger.info(
-                    "Cursor AI pattern detected",
-                    pattern_id=rule["id"],
-                    file_path=relative_path,
-                    line_number=line_number
-                )
+        issue = Issue(
+            id=f"cursor_{rule['id']}_{hashlib.sha1(relative_path.encode('utf-8')).hexdigest()[:8]}_{line_number}",
+            type=rule["issue_type"],
+            severity=rule["severity"],
+            title=rule["title"],
+            description=f"{rule['description']} (File: {relative_path}, Line: {line_number})",
+            component=relative_path,
+            detected_by=BotType.WEB_DIAGNOSTIC,  # Using web diagnostic as primary detector
+            error_messages=[f"Pattern '{rule['pattern']}' found at line {line_number}"],
+            context={
+                "file_path": relative_path,
+                "line_number": line_number,
+                "pattern_id": rule["id"],
+                "matched_text": matched_text
+            }
+        )
         
-        except Exception as e:
-            self.logger.error(
-                "Failed to scan file for pattern",
-                file_path=relative_path,
-                pattern_id=rule["id"],
-                error=str(e)
-            )
+        self.logger.info(
+            "Cursor AI pattern detected",
+            pattern_id=rule["id"],
+            file_path=relative_path,
+            line_number=line_number
+        )
         
-        return issues
+        return issue
     
     def get_pattern_recommendations(self, issue: Issue) -> List[str]:
         """
@@ -0,0 +1,331 @@
+"""
+Persisted per-bot diagnostic cursors
+Tracks which logs each diagnostic bot has processed and the issues it has open
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from config import config
+from log_index import LogIndex
+from log_templates import LogTemplate, TemplateMiner
+from models import BotType, Issue
+
+
+def log_fingerprint(log: Any) -> str:
+    """Stable fingerprint of a log entry"""
+    encoded = json.dumps(log, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def stable_issue_id(prefix: str, key: str) -> str:
+    """Issue id that stays the same for a key across sweeps and processes"""
+    return f"{prefix}_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}"
+
+
+class DiagnosticCursor:
+    """
+    Incremental state of one diagnostic bot for one target
+
+    The cursor is the newest log timestamp processed plus fingerprints of
+    the entries at exactly that timestamp, so ties are neither skipped nor
+    repeated; entries without a timestamp are remembered by a bounded set
+    of fingerprints. Issues stay open, updated in place, until they have
+    not been seen for the issue TTL; their pattern counters expire with
+    them, so the persisted state only grows with the open issues. Issues
+    updated since the cursor was loaded are the ones detected by the
+    current sweep; only those are reported.
+    """
+
+    def __init__(self, key: str, max_fingerprints: int = 1000):
+        self.key = key
+        self.max_fingerprints = max_fingerprints
+        self.last_timestamp = -math.inf
+        self.boundary: set = set()
+        self.untimed: "OrderedDict[str, None]" = OrderedDict()
+        self.counters: Counter = Counter()
+        self.issues: Dict[str, Issue] = {}
+        self.touched: Dict[str, float] = {}
+        self.detected: Set[str] = set()  # Issues updated in this sweep, not persisted
+
+    def copy(self) -> "DiagnosticCursor":
+        """Working copy of the persisted state, with no issues detected yet"""
+        return DiagnosticCursor.from_json(self.key, self.to_json(), self.max_fingerprints)
+
+    def consume(self, log_index: LogIndex) -> List[int]:
+        """Positions of entries not processed before, advancing the cursor past them"""
+        new_positions = []
+        newest = self.last_timestamp
+        newest_fingerprints = set()
+
+        for position in range(len(log_index)):
+            timestamp = log_index.timestamp(position)
+            if timestamp is None:
+                fingerprint = log_fingerprint(log_index.log(position))
+                if fingerprint in self.untimed:
+                    continue
+                self.untimed[fingerprint] = None
+                if len(self.untimed) > self.max_fingerprints:
+                    self.untimed.popitem(last=False)
+                new_positions.append(position)
+                continue
+
+            if timestamp < self.last_timestamp:
+                continue
+            if timestamp == self.last_timestamp:
+                fingerprint = log_fingerprint(log_index.log(position))
+                if fingerprint in self.boundary:
+                    continue
+                self.boundary.add(fingerprint)
+            new_positions.append(position)
+
+            if timestamp > newest:
+                newest = timestamp
+                newest_fingerprints = set()
+            if timestamp == newest and timestamp > self.last_timestamp:
+                newest_fingerprints.add(log_fingerprint(log_index.log(position)))
+
+        if newest > self.last_timestamp:
+            self.last_timestamp = newest
+            self.boundary = newest_fingerprints
+        return new_positions
+
+    def upsert_issue(self, key: str, create: Callable[[], Issue], message: str,
+                     seen_at: Optional[float] = None) -> Issue:
+        """Open an issue for a key, or update the open one with another occurrence"""
+        self.counters[key] += 1
+        last_seen = (
+            datetime.utcfromtimestamp(seen_at) if seen_at is not None else datetime.utcnow()
+        ).isoformat()
+
+        issue = self.issues.get(key)
+        if issue is None:
+            issue = create()
+            issue.context["first_seen"] = last_seen
+            issue.context["occurrences"] = 0
+            self.issues[key] = issue
+
+        issue.context["occurrences"] += 1
+        issue.context["last_seen"] = last_seen
+        issue.error_messages = [message]
+        self.touched[key] = time.time()
+        self.detected.add(key)
+        return issue
+
+    def expire_issues(self, ttl: float):
+        """Close issues that have not been seen for ttl seconds, dropping their counters"""
+        cutoff = time.time() - ttl
+        for key in [key for key, touched in self.touched.items() if touched < cutoff]:
+            self.issues.pop(key, None)
+            self.touched.pop(key, None)
+            self.counters.pop(key, None)
+
+    def open_issues(self) -> List[Issue]:
+        """Copies of the open issues, most frequent first"""
+        return [
+            issue.model_copy(deep=True)
+            for issue in sorted(self.issues.values(), key=lambda issue: -issue.context["occurrences"])
+        ]
+
+    def detected_issues(self) -> List[Issue]:
+        """Copies of the open issues with new evidence in this sweep, most frequent first"""
+        detected = [issue for key, issue in self.issues.items() if key in self.detected]
+        return [
+            issue.model_copy(deep=True)
+            for issue in sorted(detected, key=lambda issue: -issue.context["occurrences"])
+        ]
+
+    def to_json(self) -> str:
+        """Serialize the cursor position, counters and open issues"""
+        return json.dumps({
+            "last_timestamp": self.last_timestamp if math.isfinite(self.last_timestamp) else None,
+            "boundary": sorted(self.boundary),
+            "untimed": list(self.untimed),
+            "counters": dict(self.counters),
+            "issues": {key: issue.model_dump(mode="json") for key, issue in self.issues.items()},
+            "touched": self.touched
+        })
+
+    @classmethod
+    def from_json(cls, key: str, state: str, max_fingerprints: int = 1000) -> "DiagnosticCursor":
+        """Restore a cursor saved with to_json"""
+        data = json.loads(state)
+        cursor = cls(key, max_fingerprints)
+        if data.get("last_timestamp") is not None:
+            cursor.last_timestamp = data["last_timestamp"]
+        cursor.boundary = set(data.get("boundary", []))
+        cursor.untimed = OrderedDict.fromkeys(data.get("untimed", []))
+        cursor.counters = Counter(data.get("counters", {}))
+        cursor.issues = {
+            issue_key: Issue.model_validate(issue) for issue_key, issue in data.get("issues", {}).items()
+        }
+        cursor.touched = data.get("touched", {})
+        return cursor
+
+
+class CursorStore:
+    """
+    SQLite-backed store of diagnostic cursors, one per bot and target
+
+    Cursors are cached in memory after the first load and written through
+    on save. Loads hand out working copies, and checkout() holds a cursor
+    exclusively until its block finishes, committing the copy only then:
+    concurrent sessions never consume the same entries, and a bot
+    cancelled at its deadline leaves the cursor as it was. When disabled every load returns a fresh cursor, so each sweep
+    processes the whole log window as before.
+
+    The store also keeps one error template miner per target, fed only with
+    entries its in-memory cursor has not seen, so template ids are stable
+    and counts accumulate across sweeps. Miners are not persisted, so their
+    cursors are not either.
+    """
+
+    def __init__(self, cursor_dir: str, max_fingerprints: int = 1000, enabled: bool = True):
+        self.cursor_dir = cursor_dir
+        self.max_fingerprints = max_fingerprints
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._cursors: Dict[str, DiagnosticCursor] = {}
+        self._checkout_locks: Dict[str, asyncio.Lock] = {}
+        self._checkout_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._miners: Dict[str, TemplateMiner] = {}
+        self._miner_cursors: Dict[str, DiagnosticCursor] = {}
+
+        # Store statistics
+        self.loads = 0
+        self.saves = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cursor database, creating it on first use"""
+        if self._connection is None:
+            os.makedirs(self.cursor_dir, exist_ok=True)
+            connection = sqlite3.connect(
+                os.path.join(self.cursor_dir, "cursors.sqlite3"),
+                check_same_thread=False
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cursors ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def cursor_key(bot_type: BotType, target: str) -> str:
+        """Key of the cursor of a bot for a target"""
+        return f"{bot_type.value}@{target}"
+
+    def load(self, bot_type: BotType, target: str) -> DiagnosticCursor:
+        """Get a working copy of the cursor of a bot for a target, creating an empty one on first use"""
+        key = self.cursor_key(bot_type, target)
+        if not self.enabled:
+            return DiagnosticCursor(key, self.max_fingerprints)
+
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None:
+                row = self._connect().execute(
+                    "SELECT state FROM cursors WHERE key = ?", (key,)
+                ).fetchone()
+                self.loads += 1
+                cursor = (
+                    DiagnosticCursor.from_json(key, row[0], self.max_fingerprints)
+                    if row is not None else DiagnosticCursor(key, self.max_fingerprints)
+                )
+                self._cursors[key] = cursor
+            return cursor.copy()
+
+    def save(self, cursor: DiagnosticCursor):
+        """Persist a cursor"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO cursors (key, state, updated_at) VALUES (?, ?, ?)",
+                (cursor.key, cursor.to_json(), time.time())
+            )
+            connection.commit()
+            self._cursors[cursor.key] = cursor
+            self.saves += 1
+
+    @asynccontextmanager
+    async def checkout(self, bot_type: BotType, target: str) -> AsyncIterator[DiagnosticCursor]:
+        """Hold a bot's cursor for a target exclusively, saving the working copy if the block completes"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._checkout_loop is not loop:
+                self._checkout_locks = {}
+                self._checkout_loop = loop
+            lock = self._checkout_locks.setdefault(self.cursor_key(bot_type, target), asyncio.Lock())
+
+        async with lock:
+            cursor = self.load(bot_type, target)
+            yield cursor
+            self.save(cursor)
+
+    def mine_error_templates(self, target: str, log_index: LogIndex) -> List[LogTemplate]:
+        """Feed a target's template miner with error entries not mined before and return its templates"""
+        if not self.enabled:
+            return log_index.error_templates()
+
+        with self._lock:
+            miner = self._miners.get(target)
+            if miner is None:
+                miner = self._miners[target] = TemplateMiner()
+                self._miner_cursors[target] = DiagnosticCursor(f"templates@{target}", self.max_fingerprints)
+            return log_index.error_templates(miner, self._miner_cursors[target].consume(log_index))
+
+    def reset(self, keys: Optional[Iterable[str]] = None):
+        """Forget the given cursors (all, and the template miners, when None), reprocessing their logs next sweep"""
+        with self._lock:
+            connection = self._connect()
+            if keys is None:
+                connection.execute("DELETE FROM cursors")
+                self._cursors.clear()
+                self._miners.clear()
+                self._miner_cursors.clear()
+            else:
+                for key in keys:
+                    connection.execute("DELETE FROM cursors WHERE key = ?", (key,))
+                    self._cursors.pop(key, None)
+            connection.commit()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get cursor statistics"""
+        with self._lock:
+            return {
+                "cursors": len(self._cursors),
+                "open_issues": sum(len(cursor.issues) for cursor in self._cursors.values()),
+                "template_miners": len(self._miners),
+                "loads": self.loads,
+                "saves": self.saves
+            }
+
+    def close(self):
+        """Close the cursor database"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Global diagnostic cursor store
+cursor_store = CursorStore(
+    cursor_dir=config.cursor_dir,
+    max_fingerprints=config.cursor_max_fingerprints,
+    enabled=config.cursors_enabled
+)
@@ -4,24 +4,89 @@ Specialized Diagnostic Bots for the Troubleshooting System
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Awaitable, Callable
 from datetime import datetime
 import json
-import re
 
-from crewai import Agent, Task
+from crewai import Agent
 from langchain.tools import BaseTool
 from langchain.callbacks.manager import CallbackManagerForToolRun
 
-from config import config, BotRoles
+from config import config
+from executors import background_loop_runner, cpu_executor
+from agent_pool import agent_pool
+from anomaly import anomaly_detector
+from cursors import DiagnosticCursor, cursor_store, stable_issue_id
+from diagnostic_registry import CostClass, DiagnosticBotSpec, diagnostic_registry
+from log_index import LogIndex, build_log_index, log_index_for
+from log_templates import mask_variables
 from models import (
     SystemInfo, Issue, DiagnosticReport, Severity, IssueType, BotType
 )
 from utils import (
-    StructuredLogger, BVStudiosAPI, extract_error_patterns,
-    is_critical_error, calculate_execution_time
+    StructuredLogger, current_api, is_critical_error, calculate_execution_time
 )
 
+# Snapshot gathered for the current session, used by tools invoked without one
+_system_snapshot: ContextVar[Optional[SystemInfo]] = ContextVar("system_snapshot", default=None)
+
+# How each admin API source is read back from a SystemInfo snapshot
+SNAPSHOT_SOURCES: Dict[str, Callable[[SystemInfo], Any]] = {
+    "health": lambda info: info.api_status,
+    "logs": lambda info: {"logs": info.recent_logs},
+    "database": lambda info: info.database_status,
+    "bot_operations": lambda info: info.performance_metrics.get("bot_operations")
+}
+
+
+def current_system_snapshot() -> Optional[SystemInfo]:
+    """Get the SystemInfo snapshot bound to the current context"""
+    return _system_snapshot.get()
+
+
+def bind_system_snapshot(system_info: Optional[SystemInfo]):
+    """Make diagnostic tools in this context read from the given snapshot"""
+    _system_snapshot.set(system_info)
+
+
+def snapshot_data(system_info: Optional[SystemInfo], source: str,
+                  force_refresh: bool = False) -> Optional[Any]:
+    """Read a source from a snapshot, or None if it is missing, failed or stale"""
+    if system_info is None or force_refresh:
+        return None
+    
+    age = (datetime.utcnow() - system_info.timestamp).total_seconds()
+    if age > config.snapshot_max_age:
+        return None
+    
+    data = SNAPSHOT_SOURCES[source](system_info)
+    probe = system_info.probe_results.get(source)
+    if probe is not None:
+        return data if probe.success else None
+    return data or None
+
+
+async def snapshot_or_fetch(source: str, fetch: Callable[[], Awaitable[Any]],
+                            system_info: Optional[SystemInfo] = None,
+                            force_refresh: bool = False) -> Any:
+    """Use snapshot data for a source, calling the admin API only when it is unusable"""
+    data = snapshot_data(system_info or current_system_snapshot(), source, force_refresh)
+    if data is not None:
+        return data
+    return await fetch()
+
+
+async def snapshot_log_index(system_info: Optional[SystemInfo] = None,
+                             force_refresh: bool = False) -> LogIndex:
+    """Use the snapshot's LogIndex, indexing freshly fetched logs when it is unusable"""
+    system_info = system_info or current_system_snapshot()
+    if snapshot_data(system_info, "logs", force_refresh) is not None:
+        return log_index_for(system_info)
+    
+    logs_data = await current_api().get_recent_logs(100, force_refresh=force_refresh)
+    return await build_log_index(logs_data.get("logs", []), cpu_executor)
+
 
 class WebDiagnosticTool(BaseTool):
     """Tool for web frontend diagnostics"""
@@ -31,14 +96,18 @@ class WebDiagnosticTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.api = BVStudiosAPI()
         self.logger = StructuredLogger.get_logger("web_diagnostic_tool")
     
-    async def _arun(self, **kwargs) -> str:
+    async def _arun(self, system_info: Optional[SystemInfo] = None,
+                    force_refresh: bool = False, **kwargs) -> str:
         """Async web diagnostic analysis"""
         try:
             # Get system health for frontend analysis
-            health_data = await self.api.get_system_health()
+            health_data = await snapshot_or_fetch(
+                "health",
+                lambda: current_api().get_system_health(force_refresh=force_refresh),
+                system_info, force_refresh
+            )
             
             # Analyze frontend-specific issues
             frontend_issues = self._analyze_frontend_health(health_data)
@@ -75,14 +144,9 @@ class WebDiagnosticTool(BaseTool):
         
         return issues
     
-    def _run(self, **kwargs, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs) -> str:
         """Sync wrapper for web diagnostic analysis"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(**kwargs))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(**kwargs))
 
 
 class DatabaseDiagnosticTool(BaseTool):
@@ -93,18 +157,24 @@ class DatabaseDiagnosticTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.api = BVStudiosAPI()
         self.logger = StructuredLogger.get_logger("database_diagnostic_tool")
     
-    async def _arun(self, **kwargs) -> str:
-        """Async database diagnostic analysis"""
+    async def _arun(self, system_info: Optional[SystemInfo] = None,
+                    force_refresh: bool = False, cursor: Optional[DiagnosticCursor] = None,
+                    **kwargs) -> str:
+        """Async database diagnostic analysis, limited to logs after the cursor when given"""
         try:
             # Test database connection
-            db_health = await self.api.test_database_connection()
+            db_health = await snapshot_or_fetch(
+                "database",
+                lambda: current_api().test_database_connection(force_refresh=force_refresh),
+                system_info, force_refresh
+            )
             
-            # Get recent logs for database errors
-            logs_data = await self.api.get_recent_logs(100)
-            db_errors = self._extract_db_errors(logs_data.get("logs", []))
+            # Get indexed recent logs for database errors
+            log_index = await snapshot_log_index(system_info, force_refresh)
+            positions = cursor.consume(log_index) if cursor is not None else None
+            db_errors = self._extract_db_errors(log_index, positions)
             
             return json.dumps({
                 "database_health": db_health,
@@ -117,30 +187,32 @@ class DatabaseDiagnosticTool(BaseTool):
             self.logger.error("Database diagnostic analysis failed", error=str(e))
             return f"Database diagnostic failed: {str(e)}"
     
-    def _extract_db_errors(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Extract database-specific errors from logs"""
+    def _extract_db_errors(self, log_index: LogIndex,
+                           positions: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Extract database-specific errors from logs (every new one when positions are given)"""
         db_errors = []
-        db_keywords = ["database", "postgres", "prisma", "connection", "query", "sql"]
         
-        for log in logs:
-            log_text = str(log).lower()
-            if any(keyword in log_text for keyword in db_keywords) and "error" in log_text:
-                db_errors.append({
-                    "timestamp": log.get("timestamp", "unknown"),
-                    "message": str(log.get("message", log)),
-                    "severity": "high" if "critical" in log_text else "medium"
-                })
+        candidates = log_index.intersect(log_index.with_tag("database"), log_index.with_tag("error"))
+        if positions is not None:
+            candidates = log_index.intersect(candidates, positions)
+        
+        for position in candidates:
+            log = log_index.log(position)
+            db_errors.append({
+                "timestamp": log.get("timestamp", "unknown"),
+                "message": str(log.get("message", log)),
+                "severity": "high" if log_index.has_tag(position, "critical_level") else "medium",
+                "seen_at": log_index.timestamp(position)
+            })
+            # Without a cursor keep the first 10; with one every new error is counted
+            if positions is None and len(db_errors) == 10:
+                break
         
-        return db_errors[:10]  # Return top 10 database errors
+        return db_errors
     
-    def _run(self, **kwargs, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs) -> str:
         """Sync wrapper for database diagnostic analysis"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(**kwargs))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(**kwargs))
 
 
 class NetworkDiagnosticTool(BaseTool):
@@ -151,14 +223,18 @@ class NetworkDiagnosticTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.api = BVStudiosAPI()
         self.logger = StructuredLogger.get_logger("network_diagnostic_tool")
     
-    async def _arun(self, **kwargs) -> str:
+    async def _arun(self, system_info: Optional[SystemInfo] = None,
+                    force_refresh: bool = False, **kwargs) -> str:
         """Async network diagnostic analysis"""
         try:
             # Test bot operations (API endpoints)
-            bot_health = await self.api.test_bot_operations()
+            bot_health = await snapshot_or_fetch(
+                "bot_operations",
+                lambda: current_api().test_bot_operations(force_refresh=force_refresh),
+                system_info, force_refresh
+            )
             
             # Analyze API response times and errors
             api_analysis = self._analyze_api_health(bot_health)
@@ -196,14 +272,9 @@ class NetworkDiagnosticTool(BaseTool):
         
         return analysis
     
-    def _run(self, **kwargs, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs) -> str:
         """Sync wrapper for network diagnostic analysis"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(**kwargs))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(**kwargs))
 
 
 class BotWebDiagnostic:
@@ -216,14 +287,12 @@ class BotWebDiagnostic:
         self.logger = StructuredLogger.get_logger("bot_web_diagnostic")
         self.tools = [WebDiagnosticTool()]
         
-        self.agent = Agent(
-            role=BotRoles.WEB_DIAGNOSTIC["role"],
-            goal=BotRoles.WEB_DIAGNOSTIC["goal"],
-            backstory=BotRoles.WEB_DIAGNOSTIC["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.WEB_DIAGNOSTIC["max_execution_time"]
-        )
+        agent_pool.register_tools(BotType.WEB_DIAGNOSTIC, lambda: self.tools)
+    
+    @property
+    def agent(self) -> Agent:
+        """Pooled agent for this bot, built on first use"""
+        return agent_pool.get(BotType.WEB_DIAGNOSTIC)
     
     async def run_diagnostics(self, system_info: SystemInfo) -> DiagnosticReport:
         """Run comprehensive web frontend diagnostics"""
@@ -232,31 +301,8 @@ class BotWebDiagnostic:
         self.logger.info("Starting web frontend diagnostics")
         
         try:
-            # Create diagnostic task
-            diagnostic_task = Task(
-                description=f"""
-                Analyze the BV Studios web frontend for issues:
-                
-                1. Check React component errors and hydration issues
-                2. Analyze Next.js routing and page load performance  
-                3. Review client-side JavaScript errors from logs
-                4. Assess UI/UX problems and rendering issues
-                5. Check for browser compatibility issues
-                
-                System Information:
-                - Base URL: {system_info.base_url}
-                - API Status: {system_info.api_status}
-                - Recent Logs: {len(system_info.recent_logs)} entries
-                - Error Patterns: {system_info.error_patterns}
-                
-                Focus on frontend-specific issues that impact user experience.
-                """,
-                agent=self.agent,
-                expected_output="Detailed diagnostic report with identified frontend issues and recommendations"
-            )
-            
             # Execute diagnostics using the tool
-            diagnostic_result = await self.tools[0]._arun()
+            diagnostic_result = await self.tools[0]._arun(system_info=system_info)
             diagnostic_data = json.loads(diagnostic_result)
             
             # Process results into issues
@@ -276,8 +322,9 @@ class BotWebDiagnostic:
                 )
                 issues_found.append(issue)
             
-            # Analyze error patterns from logs
-            log_issues = self._analyze_log_patterns(system_info.recent_logs)
+            # Analyze error patterns from logs not seen by earlier sweeps
+            async with cursor_store.checkout(BotType.WEB_DIAGNOSTIC, system_info.base_url) as cursor:
+                log_issues = self._analyze_log_patterns(log_index_for(system_info), cursor)
             issues_found.extend(log_issues)
             
             # Generate recommendations
@@ -335,37 +382,32 @@ class BotWebDiagnostic:
         }
         return mapping.get(diagnostic_severity, Severity.MEDIUM)
     
-    def _analyze_log_patterns(self, logs: List[Dict[str, Any]]) -> List[Issue]:
-        """Analyze logs for web-specific error patterns"""
-        
-        web_issues = []
-        web_patterns = [
-            (r"hydration.*failed", IssueType.FRONTEND_ERROR, Severity.HIGH),
-            (r"component.*error", IssueType.FRONTEND_ERROR, Severity.MEDIUM),
-            (r"404.*not.*found", IssueType.FRONTEND_ERROR, Severity.MEDIUM),
-            (r"javascript.*error", IssueType.FRONTEND_ERROR, Severity.MEDIUM),
-            (r"css.*not.*loaded", IssueType.UI_BUG, Severity.LOW)
-        ]
-        
-        for i, log in enumerate(logs[:50]):  # Check first 50 logs
-            log_text = str(log).lower()
-            
-            for pattern, issue_type, severity in web_patterns:
-                if re.search(pattern, log_text):
-                    issue = Issue(
-                        id=f"web_log_{i + 1:03d}",
-                        type=issue_type,
-                        severity=severity,
-                        title=f"Web Log Pattern: {pattern.replace('.*', ' ').title()}",
-                        description=f"Pattern '{pattern}' found in logs",
-                        detected_by=BotType.WEB_DIAGNOSTIC,
-                        error_messages=[str(log)[:200]],
-                        context={"log_index": i, "pattern": pattern}
-                    )
-                    web_issues.append(issue)
-                    break
+    def _analyze_log_patterns(self, log_index: LogIndex, cursor: DiagnosticCursor) -> List[Issue]:
+        """Update the open web log pattern issues with logs after the cursor and return those seen again"""
+        
+        for position in cursor.consume(log_index):
+            rules = log_index.rules(position, "web")
+            if not rules:
+                continue
+            
+            rule = rules[0]
+            cursor.upsert_issue(
+                f"web:{rule.name}",
+                lambda: Issue(
+                    id=stable_issue_id("web_log", rule.name),
+                    type=rule.issue_type,
+                    severity=rule.severity,
+                    title=f"Web Log Pattern: {rule.pattern.replace('.*', ' ').title()}",
+                    description=f"Pattern '{rule.pattern}' found in logs",
+                    detected_by=BotType.WEB_DIAGNOSTIC,
+                    context={"pattern": rule.pattern}
+                ),
+                message=str(log_index.log(position))[:200],
+                seen_at=log_index.timestamp(position)
+            )
         
-        return web_issues[:5]  # Return top 5 log issues
+        cursor.expire_issues(config.cursor_issue_ttl)
+        return cursor.detected_issues()[:5]  # Return top 5 log issues
     
     def _generate_web_recommendations(self, issues: List[Issue]) -> List[str]:
         """Generate recommendations based on found web issues"""
@@ -419,14 +461,12 @@ class BotDatabaseDiagnostic:
         self.logger = StructuredLogger.get_logger("bot_database_diagnostic")
         self.tools = [DatabaseDiagnosticTool()]
         
-        self.agent = Agent(
-            role=BotRoles.DATABASE_DIAGNOSTIC["role"],
-            goal=BotRoles.DATABASE_DIAGNOSTIC["goal"],
-            backstory=BotRoles.DATABASE_DIAGNOSTIC["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.DATABASE_DIAGNOSTIC["max_execution_time"]
-        )
+        agent_pool.register_tools(BotType.DATABASE_DIAGNOSTIC, lambda: self.tools)
+    
+    @property
+    def agent(self) -> Agent:
+        """Pooled agent for this bot, built on first use"""
+        return agent_pool.get(BotType.DATABASE_DIAGNOSTIC)
     
     async def run_diagnostics(self, system_info: SystemInfo) -> DiagnosticReport:
         """Run comprehensive database diagnostics"""
@@ -435,39 +475,52 @@ class BotDatabaseDiagnostic:
         self.logger.info("Starting database diagnostics")
         
         try:
-            # Execute database diagnostics using the tool
-            diagnostic_result = await self.tools[0]._arun()
-            diagnostic_data = json.loads(diagnostic_result)
-            
-            # Process database health
-            issues_found = []
-            
-            # Check connection status
-            if not diagnostic_data.get("connection_status", False):
-                connection_issue = Issue(
-                    id="db_001",
-                    type=IssueType.DATABASE_ERROR,
-                    severity=Severity.CRITICAL,
-                    title="Database Connection Failed",
-                    description="Unable to establish database connection",
-                    detected_by=BotType.DATABASE_DIAGNOSTIC,
-                    error_messages=[str(diagnostic_data.get("database_health", {}).get("error", "Connection failed"))]
-                )
-                issues_found.append(connection_issue)
+            # Execute database diagnostics using the tool, only reading logs after the cursor;
+            # the cursor is only committed if this bot finishes before its deadline
+            async with cursor_store.checkout(BotType.DATABASE_DIAGNOSTIC, system_info.base_url) as cursor:
+                diagnostic_result = await self.tools[0]._arun(system_info=system_info, cursor=cursor)
+                diagnostic_data = json.loads(diagnostic_result)
+                
+                # Process database health
+                issues_found = []
+                
+                # Check connection status
+                if not diagnostic_data.get("connection_status", False):
+                    connection_issue = Issue(
+                        id="db_001",
+                        type=IssueType.DATABASE_ERROR,
+                        severity=Severity.CRITICAL,
+                        title="Database Connection Failed",
+                        description="Unable to establish database connection",
+                        detected_by=BotType.DATABASE_DIAGNOSTIC,
+                        error_messages=[str(diagnostic_data.get("database_health", {}).get("error", "Connection failed"))]
+                    )
+                    issues_found.append(connection_issue)
+                
+                # Update open database error issues with new errors from logs
+                for db_error in diagnostic_data.get("database_errors", []):
+                    key = f"db:{mask_variables(db_error['message'][:200])}"
+                    cursor.upsert_issue(
+                        key,
+                        lambda: Issue(
+                            id=stable_issue_id("db_log", key),
+                            type=IssueType.DATABASE_ERROR,
+                            severity=self._map_severity(db_error["severity"]),
+                            title="Database Error from Logs",
+                            description=db_error["message"][:200],
+                            detected_by=BotType.DATABASE_DIAGNOSTIC,
+                            context={"timestamp": db_error["timestamp"]}
+                        ),
+                        message=db_error["message"],
+                        seen_at=db_error["seen_at"]
+                    )
+                cursor.expire_issues(config.cursor_issue_ttl)
+                issues_found.extend(cursor.detected_issues())
             
-            # Process database errors from logs
-            for i, db_error in enumerate(diagnostic_data.get("database_errors", [])):
-                issue = Issue(
-                    id=f"db_{i + 2:03d}",
-                    type=IssueType.DATABASE_ERROR,
-                    severity=self._map_severity(db_error["severity"]),
-                    title="Database Error from Logs",
-                    description=db_error["message"][:200],
-                    detected_by=BotType.DATABASE_DIAGNOSTIC,
-                    error_messages=[db_error["message"]],
-                    context={"timestamp": db_error["timestamp"]}
-                )
-                issues_found.append(issue)
+            # Check for database latency and error-rate anomalies across sweeps
+            issues_found.extend(anomaly_detector.issues(
+                system_info, "database", BotType.DATABASE_DIAGNOSTIC, "db"
+            ))
             
             # Generate recommendations
             recommendations = self._generate_db_recommendations(issues_found, diagnostic_data)
@@ -519,6 +572,9 @@ class BotDatabaseDiagnostic:
             recommendations.append("Consider implementing database query optimization")
             recommendations.append("Review database transaction handling and error recovery")
         
+        if any(issue.type == IssueType.PERFORMANCE_ISSUE for issue in issues):
+            recommendations.append("Database latency or error rate has risen sharply - review slow queries and connection pool saturation")
+        
         if not recommendations:
             recommendations.append("Database appears healthy - monitor connection pool usage")
         
@@ -564,14 +620,12 @@ class BotNetworkDiagnostic:
         self.logger = StructuredLogger.get_logger("bot_network_diagnostic")
         self.tools = [NetworkDiagnosticTool()]
         
-        self.agent = Agent(
-            role=BotRoles.NETWORK_DIAGNOSTIC["role"],
-            goal=BotRoles.NETWORK_DIAGNOSTIC["goal"],
-            backstory=BotRoles.NETWORK_DIAGNOSTIC["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.NETWORK_DIAGNOSTIC["max_execution_time"]
-        )
+        agent_pool.register_tools(BotType.NETWORK_DIAGNOSTIC, lambda: self.tools)
+    
+    @property
+    def agent(self) -> Agent:
+        """Pooled agent for this bot, built on first use"""
+        return agent_pool.get(BotType.NETWORK_DIAGNOSTIC)
     
     async def run_diagnostics(self, system_info: SystemInfo) -> DiagnosticReport:
         """Run comprehensive network and API diagnostics"""
@@ -581,7 +635,7 @@ class BotNetworkDiagnostic:
         
         try:
             # Execute network diagnostics using the tool
-            diagnostic_result = await self.tools[0]._arun()
+            diagnostic_result = await self.tools[0]._arun(system_info=system_info)
             diagnostic_data = json.loads(diagnostic_result)
             
             # Process API health analysis
@@ -627,6 +681,11 @@ class BotNetworkDiagnostic:
                 )
                 issues_found.append(auth_issue)
             
+            # Check for endpoint latency and error-rate anomalies across sweeps
+            issues_found.extend(anomaly_detector.issues(
+                system_info, "network", BotType.NETWORK_DIAGNOSTIC, "net"
+            ))
+            
             # Generate recommendations
             recommendations = self._generate_network_recommendations(issues_found, diagnostic_data)
             
@@ -680,6 +739,10 @@ class BotNetworkDiagnostic:
             recommendations.append("Review authentication token expiration and refresh logic")
             recommendations.append("Verify API key configuration and permissions")
         
+        anomalous = [issue.component for issue in issues if issue.type == IssueType.PERFORMANCE_ISSUE]
+        if anomalous:
+            recommendations.append(f"Investigate latency or error-rate regressions on: {', '.join(anomalous)}")
+        
         if endpoint_analysis.get("healthy_endpoints", 0) > 0:
             recommendations.append(f"{endpoint_analysis['healthy_endpoints']} endpoints are healthy - monitor for consistency")
         
@@ -715,4 +778,27 @@ class BotNetworkDiagnostic:
 # Global diagnostic bot instances
 web_diagnostic_bot = BotWebDiagnostic()
 database_diagnostic_bot = BotDatabaseDiagnostic()
-network_diagnostic_bot = BotNetworkDiagnostic()
\ No newline at end of file
+network_diagnostic_bot = BotNetworkDiagnostic()
+
+# Registered so the workflow and coordinator run every diagnostic bot through diagnostic_runner
+diagnostic_registry.register(DiagnosticBotSpec(
+    name="BotWebDiagnostic",
+    bot_type=BotType.WEB_DIAGNOSTIC,
+    bot=web_diagnostic_bot,
+    dependencies=("health", "logs"),
+    cost=CostClass.IO
+))
+diagnostic_registry.register(DiagnosticBotSpec(
+    name="BotDatabaseDiagnostic",
+    bot_type=BotType.DATABASE_DIAGNOSTIC,
+    bot=database_diagnostic_bot,
+    dependencies=("database", "logs"),
+    cost=CostClass.IO
+))
+diagnostic_registry.register(DiagnosticBotSpec(
+    name="BotNetworkDiagnostic",
+    bot_type=BotType.NETWORK_DIAGNOSTIC,
+    bot=network_diagnostic_bot,
+    dependencies=("bot_operations",),
+    cost=CostClass.IO
+))
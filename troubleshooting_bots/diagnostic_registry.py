@@ -0,0 +1,228 @@
+"""
+Diagnostic bot registry and deadline-bounded runner
+Bots declare their type, data dependencies and cost class; the runner executes
+them concurrently with per-bot deadlines and reports partial results
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import config
+from issue_store import issue_store
+from models import BotType, DiagnosticReport, SystemInfo
+from utils import StructuredLogger
+
+
+class CostClass(str, Enum):
+    """How expensive a diagnostic bot is to run"""
+    CHEAP = "cheap"   # Analyzes snapshot data in process
+    IO = "io"         # May call the admin API when the snapshot is unusable
+    LLM = "llm"       # Kicks off agents; concurrency limited
+
+
+@dataclass(frozen=True)
+class DiagnosticBotSpec:
+    """A registered diagnostic bot"""
+    name: str
+    bot_type: BotType
+    bot: Any  # Object with async run_diagnostics(system_info) -> DiagnosticReport
+    dependencies: Tuple[str, ...] = ()  # Snapshot sources read (health, logs, database, bot_operations)
+    cost: CostClass = CostClass.IO
+    timeout: Optional[float] = None  # Defaults to config.diagnostic_timeout
+
+
+@dataclass
+class DiagnosticOutcome:
+    """Result of running one diagnostic bot"""
+    spec: DiagnosticBotSpec
+    report: DiagnosticReport
+    status: str  # completed, timeout or error
+    elapsed: float
+    error: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        """Whether the bot finished and its report is complete"""
+        return self.status == "completed"
+
+
+class DiagnosticBotRegistry:
+    """Diagnostic bots by name, in registration order; several bots may share a type"""
+
+    def __init__(self):
+        self._specs: Dict[str, DiagnosticBotSpec] = {}
+        self._lock = threading.Lock()
+
+    def register(self, spec: DiagnosticBotSpec) -> DiagnosticBotSpec:
+        """Register a bot, rejecting a name that is already registered"""
+        with self._lock:
+            if spec.name in self._specs:
+                raise ValueError(f"Diagnostic bot already registered: {spec.name}")
+            self._specs[spec.name] = spec
+        return spec
+
+    def unregister(self, name: str):
+        """Remove a bot by name; unknown names are ignored"""
+        with self._lock:
+            self._specs.pop(name, None)
+
+    def get(self, name: str) -> DiagnosticBotSpec:
+        """Get a registered bot by name, raising ValueError if there is none"""
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise ValueError(f"Unknown diagnostic bot: {name}") from None
+
+    def specs(self, bot_types: Optional[Iterable[BotType]] = None,
+              sources: Optional[Iterable[str]] = None) -> List[DiagnosticBotSpec]:
+        """Registered bots, optionally restricted to types or to bots reading any of the sources"""
+        with self._lock:
+            specs = list(self._specs.values())
+        if bot_types is not None:
+            bot_types = set(bot_types)
+            missing = bot_types.difference(spec.bot_type for spec in specs)
+            if missing:
+                raise ValueError(f"Unknown diagnostic bot type: {', '.join(sorted(t.value for t in missing))}")
+            specs = [spec for spec in specs if spec.bot_type in bot_types]
+        if sources is not None:
+            sources = set(sources)
+            specs = [spec for spec in specs if sources.intersection(spec.dependencies)]
+        return specs
+
+    def bots(self) -> Dict[BotType, Any]:
+        """Registered bot instances by type, the first registered of each type"""
+        bots: Dict[BotType, Any] = {}
+        with self._lock:
+            for spec in self._specs.values():
+                bots.setdefault(spec.bot_type, spec.bot)
+        return bots
+
+
+class DiagnosticRunner:
+    """
+    Runs registered diagnostic bots concurrently under per-bot deadlines
+
+    Each bot is cancelled when its deadline passes, so sweep latency is
+    bounded by the longest deadline rather than the slowest bot. Completed
+    reports have their issues fingerprinted by the issue store. Bots that
+    time out or raise still yield a report, marked "timeout" or "error",
+    listing the state of their data dependencies in the snapshot. LLM bots
+    share a concurrency limit and their wait for it counts toward the deadline.
+    """
+
+    def __init__(self, registry: DiagnosticBotRegistry, llm_concurrency: int = 1):
+        self.registry = registry
+        self.logger = StructuredLogger.get_logger("diagnostic_runner")
+        self.llm_concurrency = llm_concurrency
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+        # Runner statistics
+        self.runs = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.last_elapsed: Dict[str, float] = {}
+
+    async def run(self, system_info: SystemInfo,
+                  bot_types: Optional[Sequence[BotType]] = None) -> List[DiagnosticOutcome]:
+        """Run bots (all registered by default) and return one outcome per bot in order"""
+        specs = self.registry.specs(bot_types)
+        with self._lock:
+            self.runs += 1
+        return list(await asyncio.gather(*(self._run_bot(spec, system_info) for spec in specs)))
+
+    async def _run_bot(self, spec: DiagnosticBotSpec, system_info: SystemInfo) -> DiagnosticOutcome:
+        """Run one bot under its deadline, converting timeouts and failures into reports"""
+        timeout = spec.timeout or config.diagnostic_timeout
+        start_time = time.monotonic()
+        try:
+            report = await asyncio.wait_for(self._invoke(spec, system_info), timeout=timeout)
+            issue_store.record_report(report)
+            outcome = DiagnosticOutcome(spec, report, "completed", time.monotonic() - start_time)
+        except asyncio.TimeoutError:
+            self.logger.error("Diagnostic bot timed out", bot=spec.name, timeout=timeout)
+            outcome = self._partial_outcome(
+                spec, system_info, "timeout", time.monotonic() - start_time,
+                f"Diagnostic timed out after {timeout}s"
+            )
+        except Exception as e:
+            self.logger.error("Diagnostic bot failed", bot=spec.name, error=str(e))
+            outcome = self._partial_outcome(
+                spec, system_info, "error", time.monotonic() - start_time, f"Diagnostic failed: {str(e)}"
+            )
+
+        with self._lock:
+            self.last_elapsed[spec.name] = outcome.elapsed
+            if outcome.completed:
+                self.completed += 1
+        return outcome
+
+    def _get_llm_semaphore(self) -> asyncio.Semaphore:
+        """Get the LLM concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._llm_semaphore is None or self._semaphore_loop is not loop:
+            self._llm_semaphore = asyncio.Semaphore(self.llm_concurrency)
+            self._semaphore_loop = loop
+        return self._llm_semaphore
+
+    async def _invoke(self, spec: DiagnosticBotSpec, system_info: SystemInfo) -> DiagnosticReport:
+        """Run a bot's diagnostics, holding the LLM concurrency limit for LLM-cost bots"""
+        if spec.cost == CostClass.LLM:
+            async with self._get_llm_semaphore():
+                return await spec.bot.run_diagnostics(system_info)
+        return await spec.bot.run_diagnostics(system_info)
+
+    def _partial_outcome(self, spec: DiagnosticBotSpec, system_info: SystemInfo, status: str,
+                         elapsed: float, message: str) -> DiagnosticOutcome:
+        """Outcome with a placeholder report for a bot that did not finish"""
+        with self._lock:
+            if status == "timeout":
+                self.timed_out += 1
+            elif status == "error":
+                self.failed += 1
+
+        report = DiagnosticReport(
+            bot_name=spec.name,
+            bot_type=spec.bot_type,
+            execution_time=elapsed,
+            health_status=status,
+            issues_found=[],
+            recommendations=[message],
+            performance_metrics={"dependencies": dependency_status(system_info, spec.dependencies)}
+        )
+        return DiagnosticOutcome(spec, report, status, elapsed, message)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get runner statistics"""
+        with self._lock:
+            return {
+                "registered_bots": len(self.registry.specs()),
+                "runs": self.runs,
+                "completed": self.completed,
+                "timed_out": self.timed_out,
+                "failed": self.failed,
+                "slowest_last_elapsed": max(self.last_elapsed.values(), default=0.0)
+            }
+
+
+def dependency_status(system_info: SystemInfo, dependencies: Iterable[str]) -> Dict[str, str]:
+    """State of each snapshot source a bot depends on: ok, failed or not collected"""
+    status = {}
+    for source in dependencies:
+        probe = system_info.probe_results.get(source)
+        if probe is None:
+            status[source] = "not_collected"
+        else:
+            status[source] = "ok" if probe.success else "failed"
+    return status
+
+
+# Global diagnostic bot registry and runner
+diagnostic_registry = DiagnosticBotRegistry()
+diagnostic_runner = DiagnosticRunner(diagnostic_registry, llm_concurrency=config.diagnostic_llm_concurrency)
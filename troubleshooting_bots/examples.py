@@ -466,6 +466,9 @@ async def run_examples():
     # Setup logging
     StructuredLogger.setup_logging()
     
+    # Build pooled agents up front so the first session does not pay for them
+    troubleshooting_coordinator.warm_up()
+    
     # Create examples instance
     examples = TroubleshootingExamples()
     
@@ -0,0 +1,510 @@
+"""
+Executors for running blocking work off the event loop
+Provides a bounded thread pool for synchronous CrewAI crew kickoffs, a
+process pool for CPU-heavy analysis, a shared event loop runner for
+synchronous tool wrappers and a keyed scheduler for running independent
+fixes concurrently
+"""
+
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from config import config
+from utils import StructuredLogger
+
+# Type definitions
+T = TypeVar('T')
+
+# Failures of the process pool itself (not of the submitted function), after
+# which a batch is run inline instead
+_POOL_ERRORS = (BrokenProcessPool, OSError)
+
+# Tool call count and seconds spent in tool calls for the current crew kickoff
+_tool_call_stats: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "tool_call_stats", default=None
+)
+
+
+# Thread futures of the crew kickoffs started by the scheduled job running in this context
+_job_kickoffs: contextvars.ContextVar[Optional[List[Future]]] = contextvars.ContextVar(
+    "job_kickoffs", default=None
+)
+
+
+@contextmanager
+def track_tool_calls() -> Iterator[List[float]]:
+    """Count synchronous tool calls made in this context as [calls, seconds]"""
+    stats = [0, 0.0]
+    token = _tool_call_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _tool_call_stats.reset(token)
+
+
+class CrewExecutionTimeoutError(Exception):
+    """Exception raised when a crew does not finish within its timeout"""
+    pass
+
+
+class BackgroundLoopRunner:
+    """
+    Runs coroutines for synchronous callers such as BaseTool._run wrappers
+
+    Coroutines are submitted to the application event loop when one has been
+    bound and is running, so synchronous tool calls made from crew threads
+    share its HTTP pool, in-flight requests and caches. Otherwise they run on
+    a single long-lived loop owned by a daemon thread. The caller's own event
+    loop is never replaced or closed.
+    """
+
+    def __init__(self):
+        self.logger = StructuredLogger.get_logger("background_loop_runner")
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._bound_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Route coroutines to the given application loop while it runs"""
+        self._bound_loop = loop
+
+    def _ensure_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the runner's own loop, starting its thread on first use"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="background-loop",
+                    daemon=True
+                )
+                self._thread.start()
+                self.logger.info("Started background event loop")
+            return self._loop
+
+    def _target_loop(self) -> asyncio.AbstractEventLoop:
+        """Pick the loop coroutines should be submitted to"""
+        bound = self._bound_loop
+        if bound is not None and bound.is_running() and not bound.is_closed():
+            return bound
+        return self._ensure_background_loop()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the shared loop and block until it completes"""
+        loop = self._target_loop()
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            coro.close()
+            raise RuntimeError("Cannot block on a coroutine from its own event loop thread; await it instead")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        start_time = time.monotonic()
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            tool_stats = _tool_call_stats.get()
+            if tool_stats is not None:
+                tool_stats[0] += 1
+                tool_stats[1] += time.monotonic() - start_time
+
+    def stop(self):
+        """Stop the runner's own background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+class CrewExecutor:
+    """
+    Runs blocking crew kickoffs in a bounded thread pool so the event loop
+    keeps serving other sessions and health probes while agents think.
+
+    Timeouts and cancellation stop the caller from waiting and drop calls
+    that are still queued; a kickoff that is already running cannot be
+    interrupted and finishes in the background.
+    """
+
+    def __init__(self, max_workers: int = 4,
+                 loop_runner: Optional[BackgroundLoopRunner] = None):
+        self.max_workers = max_workers
+        self.loop_runner = loop_runner
+        self.logger = StructuredLogger.get_logger("crew_executor")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Queue and outcome statistics
+        self.queued = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.total_queue_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, creating it on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="crew"
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args,
+                  timeout: Optional[float] = None, **kwargs) -> T:
+        """Run a blocking callable in the pool and await its result"""
+        submitted_at = time.monotonic()
+
+        # Tool calls made from the crew thread are routed back to this loop
+        if self.loop_runner is not None:
+            self.loop_runner.bind(asyncio.get_running_loop())
+
+        def call() -> T:
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.total_queue_wait += time.monotonic() - submitted_at
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        def on_done(future: Future):
+            with self._lock:
+                if future.cancelled():
+                    # Never started, so it is still counted as queued
+                    self.queued -= 1
+                elif future.exception() is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        # Propagate context variables into the worker thread
+        context = contextvars.copy_context()
+        future = self._get_executor().submit(context.run, call)
+        future.add_done_callback(on_done)
+
+        # A scheduled job keeps its keys until the kickoff thread has finished
+        kickoffs = _job_kickoffs.get()
+        if kickoffs is not None:
+            kickoffs.append(future)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            self.logger.warning("Crew execution timed out", timeout=timeout)
+            raise CrewExecutionTimeoutError(f"Crew execution exceeded {timeout}s")
+        except asyncio.CancelledError:
+            future.cancel()
+            with self._lock:
+                self.cancelled += 1
+            raise
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get executor queue and outcome statistics"""
+        with self._lock:
+            started = self.completed + self.failed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "cancelled": self.cancelled,
+                "avg_queue_wait": self.total_queue_wait / started if started else 0.0
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the thread pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class CPUExecutor:
+    """
+    Runs CPU-bound batch functions on a process pool in chunks
+
+    The function must be a module-level (picklable) callable mapping a list
+    of compact, picklable items to a list of results; results of all chunks
+    are concatenated in item order. Inputs smaller than min_items run inline,
+    where pickling and process hand-off would cost more than they save, and
+    so does any batch the pool cannot run (an unpicklable function, a broken
+    pool, no process support). Cancelling the caller stops it waiting;
+    chunks already running in a worker finish in the background.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_items: int = 1000,
+                 chunk_size: int = 500, start_method: str = "spawn"):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_items = min_items
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+        self.logger = StructuredLogger.get_logger("cpu_executor")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Offload statistics
+        self.inline_runs = 0
+        self.pool_runs = 0
+        self.chunks = 0
+        self.items_offloaded = 0
+        self.fallbacks = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, starting it on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._executor
+
+    def _chunks(self, items: Sequence[Any], chunk_size: int) -> List[Sequence[Any]]:
+        """Split items into chunks, small enough to keep every worker busy"""
+        per_worker = -(-len(items) // self.max_workers)
+        size = max(1, min(chunk_size, per_worker))
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    async def map_chunks(self, func: Callable[[List[Any]], List[T]], items: Sequence[Any],
+                         min_items: Optional[int] = None, chunk_size: Optional[int] = None) -> List[T]:
+        """Apply a batch function to items, on the process pool when there are enough of them"""
+        items = list(items)
+        if len(items) < (self.min_items if min_items is None else min_items):
+            with self._lock:
+                self.inline_runs += 1
+            return func(items)
+
+        try:
+            pickle.dumps(func)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            return self._fallback(func, items, str(e))
+
+        chunks = self._chunks(items, chunk_size or self.chunk_size)
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_executor()
+            results = await asyncio.gather(*(loop.run_in_executor(executor, func, chunk) for chunk in chunks))
+        except _POOL_ERRORS as e:
+            self.shutdown(wait=False)
+            return self._fallback(func, items, str(e))
+
+        with self._lock:
+            self.pool_runs += 1
+            self.chunks += len(chunks)
+            self.items_offloaded += len(items)
+        return [result for chunk_results in results for result in chunk_results]
+
+    def _fallback(self, func: Callable[[List[Any]], List[T]], items: List[Any], error: str) -> List[T]:
+        """Run a batch the pool could not take inline"""
+        self.logger.warning("CPU executor unavailable, running batch inline", items=len(items), error=error)
+        with self._lock:
+            self.fallbacks += 1
+            self.inline_runs += 1
+        return func(items)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get offload statistics"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "inline_runs": self.inline_runs,
+                "pool_runs": self.pool_runs,
+                "chunks": self.chunks,
+                "items_offloaded": self.items_offloaded,
+                "fallbacks": self.fallbacks
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the process pool; it is restarted on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class KeyedScheduler:
+    """
+    Runs jobs concurrently under a cap while serializing jobs that share a key
+
+    Each job names the resources it touches (e.g. a component and a bot
+    type). Key locks are taken in sorted order, so jobs with overlapping
+    keys cannot deadlock, and before a concurrency slot so a blocked job
+    does not hold one. The timeout covers a job's own run time, not the
+    time it waits for keys or a slot.
+
+    A crew kickoff cannot be interrupted, so a job that times out or is
+    cancelled while a kickoff it started (through CrewExecutor) is still
+    running keeps its keys and slot until that kickoff thread finishes.
+    Later jobs on the same keys therefore never overlap it.
+    """
+
+    def __init__(self, max_parallel: int = 3):
+        self.max_parallel = max_parallel
+        self.logger = StructuredLogger.get_logger("keyed_scheduler")
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lingering: set = set()
+
+        # Scheduling statistics
+        self.running = 0
+        self.max_running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_parallel)
+            self._semaphore_loop = loop
+            self._locks.clear()
+            self._lock_users.clear()
+        return self._semaphore
+
+    async def run(self, keys: Sequence[str], func: Callable[[], Awaitable[T]],
+                  timeout: Optional[float] = None) -> T:
+        """Run one job once its keys and a concurrency slot are free"""
+        semaphore = self._get_semaphore()
+        keys = sorted(set(keys))
+        locks = []
+        for key in keys:
+            self._lock_users[key] = self._lock_users.get(key, 0) + 1
+            locks.append(self._locks.setdefault(key, asyncio.Lock()))
+
+        acquired = []
+        slot_acquired = False
+        kickoffs: List[Future] = []
+        queued_at = time.monotonic()
+
+        def release():
+            if slot_acquired:
+                semaphore.release()
+            for lock in reversed(acquired):
+                lock.release()
+            for key in keys:
+                self._lock_users[key] -= 1
+                if not self._lock_users[key]:
+                    del self._lock_users[key]
+                    self._locks.pop(key, None)
+
+        try:
+            for lock in locks:
+                await lock.acquire()
+                acquired.append(lock)
+            await semaphore.acquire()
+            slot_acquired = True
+
+            self.total_wait += time.monotonic() - queued_at
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            token = _job_kickoffs.set(kickoffs)
+            try:
+                result = await asyncio.wait_for(func(), timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                self.logger.warning("Scheduled job timed out", keys=keys, timeout=timeout)
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                _job_kickoffs.reset(token)
+                self.running -= 1
+
+            self.completed += 1
+            return result
+        finally:
+            running_kickoffs = [future for future in kickoffs if not future.done()]
+            if running_kickoffs:
+                self.logger.warning("Holding job keys until its crew kickoff finishes", keys=keys)
+                task = asyncio.ensure_future(self._release_after(running_kickoffs, release))
+                self._lingering.add(task)
+                task.add_done_callback(self._lingering.discard)
+            else:
+                release()
+
+    async def _release_after(self, kickoffs: List[Future], release: Callable[[], None]):
+        """Release a job's keys and slot once the kickoff threads it left behind finish"""
+        try:
+            await asyncio.wait([asyncio.wrap_future(future) for future in kickoffs])
+        finally:
+            release()
+
+    async def run_all(self, jobs: List[Tuple[Sequence[str], Callable[[], Awaitable[T]]]],
+                      timeout: Optional[float] = None) -> List[Any]:
+        """Run (keys, func) jobs and return results or exceptions in job order"""
+        return await asyncio.gather(
+            *(self.run(keys, func, timeout) for keys, func in jobs),
+            return_exceptions=True
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get scheduling statistics"""
+        started = self.completed + self.failed + self.timed_out + self.running
+        return {
+            "max_parallel": self.max_parallel,
+            "running": self.running,
+            "max_running": self.max_running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "lingering": len(self._lingering),
+            "avg_wait": self.total_wait / started if started else 0.0
+        }
+
+
+# Global executor instances
+background_loop_runner = BackgroundLoopRunner()
+crew_executor = CrewExecutor(
+    max_workers=config.crew_executor_max_workers,
+    loop_runner=background_loop_runner
+)
+resolution_scheduler = KeyedScheduler(max_parallel=config.max_parallel_fixes)
+cpu_executor = CPUExecutor(
+    max_workers=config.cpu_executor_max_workers or None,
+    min_items=config.cpu_offload_min_log_lines,
+    chunk_size=config.cpu_executor_chunk_size,
+    start_method=config.cpu_executor_start_method
+)
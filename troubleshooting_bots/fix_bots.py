@@ -12,12 +12,14 @@ from crewai import Agent, Task
 from langchain.tools import BaseTool
 from langchain.callbacks.manager import CallbackManagerForToolRun
 
-from config import config, BotRoles
+from config import config
+from executors import background_loop_runner
+from agent_pool import agent_pool
 from models import (
     Issue, FixAction, ResolutionReport, Severity, IssueType, BotType
 )
 from utils import (
-    StructuredLogger, BVStudiosAPI, calculate_execution_time,
+    StructuredLogger, current_api, calculate_execution_time,
     generate_session_id
 )
 
@@ -30,7 +32,6 @@ class WebFixTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.api = BVStudiosAPI()
         self.logger = StructuredLogger.get_logger("web_fix_tool")
     
     async def _arun(self, fix_type: str, issue_description: str) -> str:
@@ -39,6 +40,10 @@ class WebFixTool(BaseTool):
             # Simulate fix application based on issue type
             fix_result = await self._apply_web_fix(fix_type, issue_description)
             
+            # Frontend fixes change what the health endpoint reports
+            if fix_result["success"]:
+                current_api().invalidate("health")
+            
             return json.dumps({
                 "fix_type": fix_type,
                 "fix_applied": fix_result["success"],
@@ -85,12 +90,7 @@ class WebFixTool(BaseTool):
     
     def _run(self, fix_type: str, issue_description: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         """Sync wrapper for web fix application"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(fix_type, issue_description))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(fix_type, issue_description))
 
 
 class DatabaseFixTool(BaseTool):
@@ -101,7 +101,6 @@ class DatabaseFixTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.api = BVStudiosAPI()
         self.logger = StructuredLogger.get_logger("database_fix_tool")
     
     async def _arun(self, fix_type: str, issue_description: str) -> str:
@@ -110,8 +109,9 @@ class DatabaseFixTool(BaseTool):
             # Apply database fix
             fix_result = await self._apply_database_fix(fix_type, issue_description)
             
-            # Verify fix by testing database connection
-            verification_result = await self.api.test_database_connection()
+            # Drop cached pre-fix responses, then verify with a fresh read
+            current_api().invalidate("database", "health", "logs")
+            verification_result = await current_api().test_database_connection(force_refresh=True)
             
             return json.dumps({
                 "fix_type": fix_type,
@@ -154,12 +154,7 @@ class DatabaseFixTool(BaseTool):
     
     def _run(self, fix_type: str, issue_description: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         """Sync wrapper for database fix application"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(fix_type, issue_description))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(fix_type, issue_description))
 
 
 class NetworkFixTool(BaseTool):
@@ -170,7 +165,6 @@ class NetworkFixTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.api = BVStudiosAPI()
         self.logger = StructuredLogger.get_logger("network_fix_tool")
     
     async def _arun(self, fix_type: str, issue_description: str) -> str:
@@ -179,8 +173,9 @@ class NetworkFixTool(BaseTool):
             # Apply network fix
             fix_result = await self._apply_network_fix(fix_type, issue_description)
             
-            # Verify fix by testing bot operations
-            verification_result = await self.api.test_bot_operations()
+            # Drop cached pre-fix responses, then verify with a fresh read
+            current_api().invalidate("content", "lead", "health")
+            verification_result = await current_api().test_bot_operations(force_refresh=True)
             
             return json.dumps({
                 "fix_type": fix_type,
@@ -223,12 +218,7 @@ class NetworkFixTool(BaseTool):
     
     def _run(self, fix_type: str, issue_description: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         """Sync wrapper for network fix application"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._arun(fix_type, issue_description))
-        finally:
-            loop.close()
+        return background_loop_runner.run(self._arun(fix_type, issue_description))
 
 
 class BotWebFix:
@@ -241,14 +231,12 @@ class BotWebFix:
         self.logger = StructuredLogger.get_logger("bot_web_fix")
         self.tools = [WebFixTool()]
         
-        self.agent = Agent(
-            role=BotRoles.WEB_FIX["role"],
-            goal=BotRoles.WEB_FIX["goal"],
-            backstory=BotRoles.WEB_FIX["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.WEB_FIX["max_execution_time"]
-        )
+        agent_pool.register_tools(BotType.WEB_FIX, lambda: self.tools)
+    
+    @property
+    def agent(self) -> Agent:
+        """Pooled agent for this bot, built on first use"""
+        return agent_pool.get(BotType.WEB_FIX)
     
     async def resolve_issues(self, issues: List[Issue]) -> ResolutionReport:
         """Resolve web frontend issues"""
@@ -382,14 +370,12 @@ class BotDatabaseFix:
         self.logger = StructuredLogger.get_logger("bot_database_fix")
         self.tools = [DatabaseFixTool()]
         
-        self.agent = Agent(
-            role=BotRoles.DATABASE_FIX["role"],
-            goal=BotRoles.DATABASE_FIX["goal"],
-            backstory=BotRoles.DATABASE_FIX["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.DATABASE_FIX["max_execution_time"]
-        )
+        agent_pool.register_tools(BotType.DATABASE_FIX, lambda: self.tools)
+    
+    @property
+    def agent(self) -> Agent:
+        """Pooled agent for this bot, built on first use"""
+        return agent_pool.get(BotType.DATABASE_FIX)
     
     async def resolve_issues(self, issues: List[Issue]) -> ResolutionReport:
         """Resolve database issues"""
@@ -530,14 +516,12 @@ class BotNetworkFix:
         self.logger = StructuredLogger.get_logger("bot_network_fix")
         self.tools = [NetworkFixTool()]
         
-        self.agent = Agent(
-            role=BotRoles.NETWORK_FIX["role"],
-            goal=BotRoles.NETWORK_FIX["goal"],
-            backstory=BotRoles.NETWORK_FIX["backstory"],
-            verbose=True,
-            tools=self.tools,
-            max_execution_time=BotRoles.NETWORK_FIX["max_execution_time"]
-        )
+        agent_pool.register_tools(BotType.NETWORK_FIX, lambda: self.tools)
+    
+    @property
+    def agent(self) -> Agent:
+        """Pooled agent for this bot, built on first use"""
+        return agent_pool.get(BotType.NETWORK_FIX)
     
     async def resolve_issues(self, issues: List[Issue]) -> ResolutionReport:
         """Resolve network and API issues"""
@@ -0,0 +1,168 @@
+"""
+Stable issue fingerprinting and cross-run deduplication
+Identifies recurrences of the same problem and tracks them as one record
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from config import config
+from log_templates import mask_variables
+from models import DiagnosticReport, Issue
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def issue_template(issue: Issue) -> str:
+    """
+    Normalized message template of an issue
+
+    Built from the title and description with ids, timestamps and numbers
+    masked. Error messages are left out: they are samples that change from
+    one occurrence to the next.
+    """
+    text = f"{issue.title} {issue.description}".lower()
+    return _WHITESPACE.sub(" ", mask_variables(text)).strip()
+
+
+def issue_fingerprint(issue: Issue) -> str:
+    """Hash of an issue's type, component, message template and endpoints"""
+    parts = [
+        issue.type.value,
+        issue.component or "",
+        issue_template(issue),
+        ",".join(sorted(issue.affected_endpoints))
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def fingerprint_issue_id(issue: Issue, fingerprint: str) -> str:
+    """Issue id derived from its fingerprint, prefixed by the detecting area"""
+    return f"{issue.detected_by.value.split('_')[0]}_{fingerprint[:12]}"
+
+
+@dataclass
+class IssueRecord:
+    """Every occurrence of one fingerprinted issue"""
+    fingerprint: str
+    issue_id: str
+    occurrences: int
+    first_seen: datetime
+    last_seen: datetime
+    last_evidence: Optional[datetime] = None  # Newest log evidence of cursor-backed issues
+
+
+class IssueStore:
+    """
+    Process-wide record of fingerprinted issues
+
+    Recording an issue gives it its fingerprint and fingerprint-derived id,
+    so the same problem has the same id in every run and process, and
+    annotates it with the occurrence count and first/last seen of its
+    record. Issues carrying a last_seen in their context are open cursor
+    issues, reported again every sweep until they expire; they only count
+    as a new occurrence when that evidence timestamp advanced. Issues that
+    are already fingerprinted are left as they are, so a report may pass
+    through the store more than once. The least recently seen records are
+    dropped beyond max_records.
+    """
+
+    def __init__(self, max_records: int = 10000):
+        self.max_records = max_records
+        self._records: "OrderedDict[str, IssueRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Store statistics
+        self.recorded = 0
+        self.recurrences = 0
+        self.unchanged = 0
+        self.collapsed = 0
+
+    def record(self, issue: Issue, seen_at: Optional[datetime] = None) -> Issue:
+        """Fingerprint an issue, count the occurrence if its evidence is new and annotate the issue in place"""
+        fingerprint = issue_fingerprint(issue)
+        seen_at = seen_at or datetime.utcnow()
+        evidence = issue.context.get("last_seen")
+        evidence = datetime.fromisoformat(evidence) if isinstance(evidence, str) else None
+
+        with self._lock:
+            self.recorded += 1
+            record = self._records.get(fingerprint)
+            if record is None:
+                record = IssueRecord(
+                    fingerprint=fingerprint,
+                    issue_id=fingerprint_issue_id(issue, fingerprint),
+                    occurrences=0,
+                    first_seen=min(issue.detected_at, seen_at),
+                    last_seen=seen_at
+                )
+                self._records[fingerprint] = record
+                while len(self._records) > self.max_records:
+                    self._records.popitem(last=False)
+            else:
+                self._records.move_to_end(fingerprint)
+
+            if (record.occurrences and evidence is not None and record.last_evidence is not None
+                    and evidence <= record.last_evidence):
+                # Reported again without new matching logs
+                self.unchanged += 1
+            else:
+                if record.occurrences:
+                    self.recurrences += 1
+                record.occurrences += 1
+                record.first_seen = min(record.first_seen, seen_at)
+                record.last_seen = max(record.last_seen, seen_at)
+                if evidence is not None:
+                    record.last_evidence = evidence
+
+            issue.id = record.issue_id
+            issue.fingerprint = fingerprint
+            issue.occurrences = record.occurrences
+            issue.first_seen = record.first_seen
+            issue.last_seen = record.last_seen
+        return issue
+
+    def record_all(self, issues: Iterable[Issue]) -> List[Issue]:
+        """Record issues, collapsing repeats of one fingerprint into a single issue"""
+        collapsed: Dict[str, Issue] = {}
+        for issue in issues:
+            if issue.fingerprint is None:
+                self.record(issue)
+            existing = collapsed.get(issue.fingerprint)
+            if existing is None:
+                collapsed[issue.fingerprint] = issue
+            else:
+                existing.merge(issue)
+                with self._lock:
+                    self.collapsed += 1
+        return list(collapsed.values())
+
+    def record_report(self, report: DiagnosticReport) -> DiagnosticReport:
+        """Record a report's issues in place"""
+        report.issues_found = self.record_all(report.issues_found)
+        return report
+
+    def get(self, fingerprint: str) -> Optional[IssueRecord]:
+        """Get the record of a fingerprint, if it has been recorded and not dropped"""
+        with self._lock:
+            return self._records.get(fingerprint)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get record and recurrence statistics"""
+        with self._lock:
+            return {
+                "records": len(self._records),
+                "recorded": self.recorded,
+                "recurrences": self.recurrences,
+                "unchanged": self.unchanged,
+                "collapsed": self.collapsed
+            }
+
+
+# Global issue store
+issue_store = IssueStore(max_records=config.issue_store_max_records)
@@ -0,0 +1,203 @@
+"""
+Content-addressed cache for LLM crew results
+Stores kickoff output in SQLite keyed on a hash of agent roles and task prompts
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import config
+from utils import StructuredLogger
+
+
+def crew_cache_key(crew: Any) -> str:
+    """Hash the agents and task prompts that determine a crew's output"""
+    def agent_fingerprint(agent: Any) -> Optional[Dict[str, Any]]:
+        if agent is None:
+            return None
+        llm = getattr(agent, "llm", None)
+        return {
+            "role": getattr(agent, "role", None),
+            "goal": getattr(agent, "goal", None),
+            "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+            "tools": sorted(getattr(tool, "name", str(tool)) for tool in getattr(agent, "tools", None) or [])
+        }
+
+    payload = {
+        "process": str(getattr(crew, "process", None)),
+        "manager": agent_fingerprint(getattr(crew, "manager_agent", None)),
+        "tasks": [
+            {
+                "agent": agent_fingerprint(getattr(task, "agent", None)),
+                "description": getattr(task, "description", None),
+                "expected_output": getattr(task, "expected_output", None)
+            }
+            for task in getattr(crew, "tasks", [])
+        ]
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMResultCache:
+    """
+    Disk-backed cache of crew kickoff results
+
+    Entries expire after a TTL and the least recently used entries are
+    evicted once the stored bytes exceed the size limit. Results are stored
+    as text, so a cache hit returns the string form of the original result.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 900.0,
+                 max_bytes: int = 50_000_000, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.logger = StructuredLogger.get_logger("llm_result_cache")
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database, creating it on first use"""
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            connection = sqlite3.connect(
+                os.path.join(self.cache_dir, "llm_cache.sqlite3"),
+                check_same_thread=False
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached result, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                connection.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str):
+        """Store a result and evict least recently used entries over the size limit"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self.stores += 1
+
+            total_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total_bytes > self.max_bytes:
+                rows = connection.execute(
+                    "SELECT key, size FROM entries WHERE key != ? ORDER BY last_access", (key,)
+                ).fetchall()
+                for old_key, old_size in rows:
+                    if total_bytes <= self.max_bytes:
+                        break
+                    connection.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    total_bytes -= old_size
+                    self.evictions += 1
+
+            connection.commit()
+
+    def clear(self):
+        """Remove all cached results"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM entries")
+            connection.commit()
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached result or await compute() and cache its text form"""
+        if not self.enabled:
+            return await compute()
+
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            self.logger.info("LLM result cache hit", key=key[:12])
+            return cached
+
+        result = await compute()
+        await asyncio.to_thread(self.set, key, str(result))
+        return result
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get hit rate and storage statistics"""
+        with self._lock:
+            entries, total_bytes = 0, 0
+            if self._connection is not None:
+                entries, total_bytes = self._connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": total_bytes
+            }
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Global LLM result cache instance
+llm_result_cache = LLMResultCache(
+    cache_dir=config.llm_cache_dir,
+    ttl=config.llm_cache_ttl,
+    max_bytes=config.llm_cache_max_bytes,
+    enabled=config.llm_cache_enabled
+)
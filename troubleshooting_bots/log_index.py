@@ -0,0 +1,250 @@
+"""
+Normalized, indexed view of a snapshot's logs
+Built once per SystemInfo and queried by every diagnostic bot
+"""
+
+import json
+import math
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from log_matching import LogMatcher, LogRule, log_matcher, match_default_rules
+from log_templates import LogTemplate, TemplateMiner
+from models import SystemInfo
+
+# Fields that name the component a log entry came from, in priority order
+COMPONENT_FIELDS = ("component", "source", "bot", "bot_name")
+
+
+def parse_timestamp(value: Any) -> float:
+    """Convert an ISO timestamp or epoch value to epoch seconds (NaN if unknown)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return math.nan
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return math.nan
+
+
+class LogIndex:
+    """
+    Normalized log fields stored as compact per-field arrays
+
+    Each entry is stringified, lowercased, classified and has its data
+    payload parsed exactly once. Statuses and components are interned into
+    small vocabularies and stored as codes, timestamps as epoch floats, and
+    inverted indexes map rule tags, keywords, statuses and components to
+    arrays of entry positions. Raw entries are referenced, not copied.
+    Texts and matched rule positions may be computed beforehand, e.g. on a
+    CPU executor (see build_log_index).
+    """
+
+    def __init__(self, logs: List[Any], matcher: Optional[LogMatcher] = None,
+                 texts: Optional[Sequence[str]] = None,
+                 rule_positions: Optional[Sequence[Sequence[int]]] = None):
+        matcher = matcher or log_matcher
+        self._logs = logs
+        self._texts: List[str] = []
+        self._timestamps = array("d")
+        self._status_codes = array("H")
+        self._component_codes = array("H")
+        self._statuses: List[Optional[str]] = [None]
+        self._components: List[Optional[str]] = [None]
+        self._payloads: Dict[int, Any] = {}
+        self._rules: Dict[int, Dict[str, List[LogRule]]] = {}
+
+        self._by_tag: Dict[str, array] = {}
+        self._by_keyword: Dict[str, array] = {}
+        self._by_status: Dict[str, array] = {}
+        self._by_component: Dict[str, array] = {}
+
+        status_codes: Dict[str, int] = {}
+        component_codes: Dict[str, int] = {}
+
+        for position, log in enumerate(logs):
+            text = texts[position] if texts is not None else str(log).lower()
+            self._texts.append(text)
+
+            fields = log if isinstance(log, dict) else {}
+            self._timestamps.append(parse_timestamp(fields.get("timestamp")))
+
+            status = fields.get("status") or fields.get("level")
+            self._status_codes.append(self._code(status, status_codes, self._statuses))
+            if isinstance(status, str):
+                self._by_status.setdefault(status.lower(), array("I")).append(position)
+
+            component = next((fields[name] for name in COMPONENT_FIELDS if fields.get(name)), None)
+            self._component_codes.append(self._code(component, component_codes, self._components))
+            if isinstance(component, str):
+                self._by_component.setdefault(component.lower(), array("I")).append(position)
+
+            if "data" in fields:
+                data = fields["data"]
+                try:
+                    self._payloads[position] = json.loads(data) if isinstance(data, str) else data
+                except json.JSONDecodeError:
+                    pass
+
+            if rule_positions is not None:
+                tags = matcher.group_rules(rule_positions[position])
+            else:
+                tags = matcher.classify_text(text)
+            if tags:
+                self._rules[position] = tags
+                for tag, rules in tags.items():
+                    self._by_tag.setdefault(tag, array("I")).append(position)
+                    for rule in rules:
+                        self._by_keyword.setdefault(f"{tag}:{rule.name}", array("I")).append(position)
+
+    @staticmethod
+    def _code(value: Any, codes: Dict[str, int], vocabulary: List[Optional[str]]) -> int:
+        """Intern a string field value and return its vocabulary code (0 if absent)"""
+        if not isinstance(value, str):
+            return 0
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(vocabulary)
+            vocabulary.append(sys.intern(value))
+        return code
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def log(self, position: int) -> Any:
+        """Raw log entry"""
+        return self._logs[position]
+
+    def text(self, position: int) -> str:
+        """Lowercased text of a log entry"""
+        return self._texts[position]
+
+    def status(self, position: int) -> Optional[str]:
+        """Status (or level) of a log entry"""
+        return self._statuses[self._status_codes[position]]
+
+    def component(self, position: int) -> Optional[str]:
+        """Component a log entry came from"""
+        return self._components[self._component_codes[position]]
+
+    def timestamp(self, position: int) -> Optional[float]:
+        """Epoch timestamp of a log entry, if it has a parseable one"""
+        value = self._timestamps[position]
+        return None if math.isnan(value) else value
+
+    def payload(self, position: int) -> Any:
+        """Parsed data payload of a log entry"""
+        return self._payloads.get(position)
+
+    def rules(self, position: int, tag: str) -> List[LogRule]:
+        """Rules of a tagged rule set that matched a log entry, in priority order"""
+        return self._rules.get(position, {}).get(tag, [])
+
+    def has_tag(self, position: int, tag: str) -> bool:
+        """Whether a log entry matched a tagged rule set"""
+        return tag in self._rules.get(position, {})
+
+    def with_tag(self, tag: str) -> array:
+        """Positions of entries matching a rule set tag"""
+        return self._by_tag.get(tag, array("I"))
+
+    def with_keyword(self, tag: str, keyword: str) -> array:
+        """Positions of entries matching one rule (keyword) of a rule set"""
+        return self._by_keyword.get(f"{tag}:{keyword}", array("I"))
+
+    def with_status(self, status: str) -> array:
+        """Positions of entries with a status (or level)"""
+        return self._by_status.get(status.lower(), array("I"))
+
+    def with_component(self, component: str) -> array:
+        """Positions of entries from a component"""
+        return self._by_component.get(component.lower(), array("I"))
+
+    def intersect(self, *postings: Iterable[int]) -> List[int]:
+        """Positions present in every posting list, in log order"""
+        if not postings:
+            return []
+        common = set(postings[0])
+        for posting in postings[1:]:
+            common.intersection_update(posting)
+        return sorted(common)
+
+    def error_templates(self, miner: Optional[TemplateMiner] = None,
+                        positions: Optional[Iterable[int]] = None) -> List[LogTemplate]:
+        """
+        Templates mined from the 'error' values of error-status entries, most frequent first
+
+        A persistent miner keeps counting across calls; positions restricts
+        mining to those entries, e.g. the ones a cursor has not seen before.
+        """
+        miner = miner or TemplateMiner()
+        errors = self.with_status("error")
+        if positions is not None:
+            errors = self.intersect(errors, positions)
+        for position in errors:
+            payload = self._payloads.get(position)
+            if isinstance(payload, dict) and "error" in payload:
+                miner.add(str(payload["error"]), self.timestamp(position))
+        return miner.templates()
+
+    def error_patterns(self, limit: int = 10) -> List[str]:
+        """Most frequent error templates, so messages differing only in ids count once"""
+        return [template.template for template in self.error_templates()[:limit]]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get entry, vocabulary and posting counts"""
+        return {
+            "entries": len(self),
+            "statuses": len(self._statuses) - 1,
+            "components": len(self._components) - 1,
+            "payloads": len(self._payloads),
+            "matched_entries": len(self._rules),
+            "postings": sum(
+                len(posting)
+                for index in (self._by_tag, self._by_keyword, self._by_status, self._by_component)
+                for posting in index.values()
+            )
+        }
+
+
+def log_index_for(system_info: SystemInfo) -> LogIndex:
+    """Get the LogIndex of a snapshot, building it on first use"""
+    index = system_info._log_index
+    if index is None:
+        index = LogIndex(system_info.recent_logs)
+        system_info._log_index = index
+    return index
+
+
+async def build_log_index(logs: List[Any], executor: Any = None,
+                          matcher: Optional[LogMatcher] = None) -> LogIndex:
+    """
+    Build a LogIndex, classifying entries on a CPU executor
+
+    The executor (see executors.CPUExecutor) receives only the lowercased
+    texts and returns matched rule positions, and runs small log lists
+    inline. Custom matchers do not exist in executor workers, so their
+    indexes are built in process.
+    """
+    matcher = matcher or log_matcher
+    if executor is None or matcher is not log_matcher:
+        return LogIndex(logs, matcher)
+
+    texts = [str(log).lower() for log in logs]
+    rule_positions = await executor.map_chunks(match_default_rules, texts)
+    return LogIndex(logs, matcher, texts=texts, rule_positions=rule_positions)
+
+
+async def build_log_index_for(system_info: SystemInfo, executor: Any = None) -> LogIndex:
+    """Get the LogIndex of a snapshot, building it on a CPU executor on first use"""
+    index = system_info._log_index
+    if index is None:
+        index = await build_log_index(system_info.recent_logs, executor)
+        system_info._log_index = index
+    return index
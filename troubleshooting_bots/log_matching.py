@@ -0,0 +1,230 @@
+"""
+Precompiled multi-pattern log matching
+Classifies each log line once against the rule sets of every diagnostic
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from models import IssueType, Severity
+
+# Characters that make a pattern piece more than a plain literal
+_REGEX_METACHARACTERS = set(".^$*+?{}[]\\|()")
+
+# Escaped punctuation as produced by re.escape
+_ESCAPED_PUNCTUATION = re.compile(r"\\([^\w])")
+
+
+def required_literals(pattern: str) -> Tuple[str, ...]:
+    """Get the literals every match of a simple 'a.*b' style pattern must contain"""
+    pieces = [piece for piece in pattern.split(".*") if piece]
+    if any(_REGEX_METACHARACTERS.intersection(_ESCAPED_PUNCTUATION.sub("", piece)) for piece in pieces):
+        return ()
+    return tuple(_ESCAPED_PUNCTUATION.sub(r"\1", piece) for piece in pieces)
+
+
+@dataclass(frozen=True)
+class LogRule:
+    """A named log pattern, matched against lowercased log text"""
+    name: str
+    pattern: str
+    issue_type: Optional[IssueType] = None
+    severity: Optional[Severity] = None
+
+
+@dataclass(frozen=True)
+class LogRuleSet:
+    """Rules belonging to one tag, in priority order"""
+    tag: str
+    rules: Tuple[LogRule, ...]
+
+
+@dataclass
+class LogMatch:
+    """A log line with the rules it matched, grouped by rule set tag"""
+    index: int
+    log: Any
+    text: str
+    tags: Dict[str, List[LogRule]] = field(default_factory=dict)
+
+    def has(self, tag: str) -> bool:
+        """Whether any rule of the tagged rule set matched"""
+        return tag in self.tags
+
+    def first(self, tag: str) -> Optional[LogRule]:
+        """Highest priority rule of the tagged rule set that matched"""
+        rules = self.tags.get(tag)
+        return rules[0] if rules else None
+
+
+def keyword_rules(tag: str, keywords: Sequence[str]) -> LogRuleSet:
+    """Build a rule set matching any of the given keywords"""
+    return LogRuleSet(tag, tuple(LogRule(keyword, re.escape(keyword)) for keyword in keywords))
+
+
+# Keywords that mark an error message as critical
+CRITICAL_KEYWORDS = [
+    "database", "connection", "timeout", "crash", "fatal",
+    "critical", "emergency", "down", "unavailable", "failed to start"
+]
+
+# Rule sets shared by the diagnostics
+DEFAULT_RULE_SETS = [
+    LogRuleSet("web", (
+        LogRule("hydration.*failed", r"hydration.*failed", IssueType.FRONTEND_ERROR, Severity.HIGH),
+        LogRule("component.*error", r"component.*error", IssueType.FRONTEND_ERROR, Severity.MEDIUM),
+        LogRule("404.*not.*found", r"404.*not.*found", IssueType.FRONTEND_ERROR, Severity.MEDIUM),
+        LogRule("javascript.*error", r"javascript.*error", IssueType.FRONTEND_ERROR, Severity.MEDIUM),
+        LogRule("css.*not.*loaded", r"css.*not.*loaded", IssueType.UI_BUG, Severity.LOW)
+    )),
+    keyword_rules("database", ["database", "postgres", "prisma", "connection", "query", "sql"]),
+    keyword_rules("network", [
+        "endpoint", "timeout", "unauthorized", "network", "fetch failed",
+        "econnrefused", "502", "503", "504", "rate limit"
+    ]),
+    keyword_rules("error", ["error"]),
+    keyword_rules("critical_level", ["critical"]),
+    keyword_rules("critical", CRITICAL_KEYWORDS)
+]
+
+
+class LogMatcher:
+    """
+    Classifies log lines against all rule sets in a single pass per line
+
+    Each line is stringified and lowercased once. The literals required by
+    every rule are deduplicated across rule sets and each is tested once
+    per line; a rule's compiled regex only runs when all of its literals
+    are present, and plain keyword rules need no regex at all. The result
+    of the last log list classified is kept, so diagnostics sharing one
+    snapshot's logs classify them once; it is reused only while the list
+    still holds the same entry objects (entries are treated as immutable).
+    """
+
+    def __init__(self, rule_sets: Sequence[LogRuleSet]):
+        self.rule_sets = list(rule_sets)
+        self._lock = threading.Lock()
+        self._last_logs: Optional[List[Any]] = None
+        self._last_entries: List[Any] = []
+        self._last_matches: List[LogMatch] = []
+
+        # (tag, rule, required literals, compiled regex or None for plain keywords)
+        self._rules: List[Tuple[str, LogRule, Tuple[str, ...], Optional[Pattern]]] = []
+        self._unanchored: List[int] = []
+        rules_by_literal: Dict[str, List[int]] = {}
+        for rule_set in self.rule_sets:
+            for rule in rule_set.rules:
+                required = required_literals(rule.pattern)
+                plain_keyword = len(required) == 1 and re.escape(required[0]) == rule.pattern
+                regex = None if plain_keyword else re.compile(rule.pattern)
+                position = len(self._rules)
+                self._rules.append((rule_set.tag, rule, required, regex))
+                if not required:
+                    self._unanchored.append(position)
+                for literal in required:
+                    rules_by_literal.setdefault(literal, []).append(position)
+        self._rules_by_literal = rules_by_literal
+
+        # Python's re has no multi-literal automaton; substring tests over the
+        # deduplicated literals beat a combined alternation regex per line
+        self._literals = sorted(rules_by_literal)
+
+        # Classification statistics
+        self.lines_classified = 0
+        self.lines_matched = 0
+        self.regex_evaluations = 0
+        self.reused_classifications = 0
+
+    def match_positions(self, text: str) -> List[int]:
+        """Positions of the rules matching lowercased text, in priority order"""
+        present = {literal for literal in self._literals if literal in text}
+        if not present and not self._unanchored:
+            return []
+
+        candidates = set(self._unanchored)
+        for literal in present:
+            candidates.update(self._rules_by_literal[literal])
+
+        positions = []
+        for position in sorted(candidates):
+            _, _, required, regex = self._rules[position]
+            if not present.issuperset(required):
+                continue
+            if regex is not None:
+                self.regex_evaluations += 1
+                if not regex.search(text):
+                    continue
+            positions.append(position)
+
+        return positions
+
+    def group_rules(self, positions: Sequence[int]) -> Dict[str, List[LogRule]]:
+        """Group matched rule positions into rules by rule set tag"""
+        tags: Dict[str, List[LogRule]] = {}
+        for position in positions:
+            tag, rule, _, _ = self._rules[position]
+            tags.setdefault(tag, []).append(rule)
+        return tags
+
+    def classify_text(self, text: str) -> Dict[str, List[LogRule]]:
+        """Match lowercased text against every rule set"""
+        return self.group_rules(self.match_positions(text))
+
+    def classify(self, logs: List[Any]) -> List[LogMatch]:
+        """Classify log entries, returning the lines that matched any rule"""
+        with self._lock:
+            if logs is self._last_logs and self._same_entries(logs):
+                self.reused_classifications += 1
+                return self._last_matches
+
+        matches = []
+        for index, log in enumerate(logs):
+            text = str(log).lower()
+            tags = self.classify_text(text)
+            if tags:
+                matches.append(LogMatch(index=index, log=log, text=text, tags=tags))
+
+        with self._lock:
+            self.lines_classified += len(logs)
+            self.lines_matched += len(matches)
+            self._last_logs, self._last_entries, self._last_matches = logs, list(logs), matches
+
+        return matches
+
+    def _same_entries(self, logs: List[Any]) -> bool:
+        """Whether a log list still holds exactly the entries last classified"""
+        return len(logs) == len(self._last_entries) and all(
+            entry is last for entry, last in zip(logs, self._last_entries)
+        )
+
+    def matches(self, logs: List[Any], tag: str) -> List[LogMatch]:
+        """Get the classified lines matching a rule set tag"""
+        return [match for match in self.classify(logs) if match.has(tag)]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get classification statistics"""
+        with self._lock:
+            return {
+                "rules": len(self._rules),
+                "literals": len(self._literals),
+                "lines_classified": self.lines_classified,
+                "lines_matched": self.lines_matched,
+                "regex_evaluations": self.regex_evaluations,
+                "reused_classifications": self.reused_classifications
+            }
+
+
+def match_default_rules(texts: List[str]) -> List[Tuple[int, ...]]:
+    """
+    Positions of the default rules matching each lowercased text
+
+    Runs in CPU executor workers, where only the default rule sets exist:
+    positions index the rules of the global log matcher.
+    """
+    return [tuple(log_matcher.match_positions(text)) for text in texts]
+
+
+# Global log matcher instance
+log_matcher = LogMatcher(DEFAULT_RULE_SETS)
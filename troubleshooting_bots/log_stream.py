@@ -0,0 +1,276 @@
+"""
+Streaming log diagnostics over sliding time windows
+Counts matching log lines per rule in a bounded ring of time buckets and
+raises Issues when a window threshold is crossed
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple
+
+from log_index import parse_timestamp
+from log_matching import DEFAULT_RULE_SETS, LogMatcher, log_matcher
+from models import BotType, Issue, IssueType, Severity
+
+
+@dataclass(frozen=True)
+class WindowThreshold:
+    """Raise an issue when this many lines matching all tags fall within the window"""
+    name: str
+    tags: Tuple[str, ...]
+    count: int
+    issue_type: IssueType
+    severity: Severity
+    detected_by: BotType
+    rule: Optional[str] = None  # Restrict to one rule of the first tag's rule set
+
+
+def default_thresholds(count: int) -> List[WindowThreshold]:
+    """Thresholds mirroring the rule-based diagnostic bots"""
+    web_rules = next(rule_set for rule_set in DEFAULT_RULE_SETS if rule_set.tag == "web").rules
+    thresholds = [
+        WindowThreshold(
+            name=f"web:{rule.name}",
+            tags=("web",),
+            count=count,
+            issue_type=rule.issue_type,
+            severity=rule.severity,
+            detected_by=BotType.WEB_DIAGNOSTIC,
+            rule=rule.name
+        )
+        for rule in web_rules
+    ]
+    thresholds.append(WindowThreshold(
+        name="database:error",
+        tags=("database", "error"),
+        count=count,
+        issue_type=IssueType.DATABASE_ERROR,
+        severity=Severity.HIGH,
+        detected_by=BotType.DATABASE_DIAGNOSTIC
+    ))
+    thresholds.append(WindowThreshold(
+        name="network:error",
+        tags=("network", "error"),
+        count=count,
+        issue_type=IssueType.API_ERROR,
+        severity=Severity.HIGH,
+        detected_by=BotType.NETWORK_DIAGNOSTIC
+    ))
+    return thresholds
+
+
+class SlidingWindowCounter:
+    """
+    Per-key counts over a sliding time window
+
+    Time is split into fixed buckets and only the buckets inside the window
+    are kept, with running totals updated as buckets enter and expire, so
+    memory is bounded by the bucket count times the number of keys no matter
+    how many events arrive. Events older than the window are dropped.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = window_seconds / buckets
+        self.buckets = buckets
+        self._buckets: Deque[Tuple[int, Counter]] = deque()
+        self._totals: Counter = Counter()
+        self._latest = -math.inf
+
+    def _bucket_id(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def advance(self, timestamp: float):
+        """Move the window forward to end at a timestamp, expiring old buckets"""
+        bucket_id = self._bucket_id(timestamp)
+        if bucket_id <= self._latest:
+            return
+        self._latest = bucket_id
+
+        while self._buckets and self._buckets[0][0] <= bucket_id - self.buckets:
+            _, counts = self._buckets.popleft()
+            self._totals.subtract(counts)
+            for key in counts:
+                if self._totals[key] <= 0:
+                    del self._totals[key]
+
+    def is_late(self, timestamp: float) -> bool:
+        """Whether a timestamp falls before the current window"""
+        return self._bucket_id(timestamp) <= self._latest - self.buckets
+
+    def add(self, key: str, timestamp: float) -> bool:
+        """Count an event, returning False if it is older than the window"""
+        if self.is_late(timestamp):
+            return False
+        bucket_id = self._bucket_id(timestamp)
+
+        for existing_id, counts in reversed(self._buckets):
+            if existing_id == bucket_id:
+                break
+            if existing_id < bucket_id:
+                counts = self._insert_bucket(bucket_id)
+                break
+        else:
+            counts = self._insert_bucket(bucket_id)
+
+        counts[key] += 1
+        self._totals[key] += 1
+        return True
+
+    def _insert_bucket(self, bucket_id: int) -> Counter:
+        """Insert an empty bucket keeping the ring ordered by bucket id"""
+        counts: Counter = Counter()
+        position = len(self._buckets)
+        while position and self._buckets[position - 1][0] > bucket_id:
+            position -= 1
+        self._buckets.insert(position, (bucket_id, counts))
+        return counts
+
+    def count(self, key: str) -> int:
+        """Events for a key within the window"""
+        return self._totals.get(key, 0)
+
+    def counts(self) -> Dict[str, int]:
+        """Events per key within the window"""
+        return dict(self._totals)
+
+    def window_bounds(self) -> Tuple[float, float]:
+        """Start and end of the current window as epoch seconds"""
+        end = (self._latest + 1) * self.bucket_seconds
+        return end - self.window_seconds, end
+
+
+class StreamingLogAnalyzer:
+    """
+    Consumes a log stream and emits Issues when window thresholds are crossed
+
+    Each line is classified once by the shared log matcher and only
+    counted, never stored; one sample message is kept per threshold. An
+    issue is emitted when a threshold is first reached and re-armed once
+    the windowed count falls back below it. Lines without a parseable
+    timestamp are placed at their arrival time.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, buckets: int = 30,
+                 thresholds: Optional[Sequence[WindowThreshold]] = None,
+                 matcher: Optional[LogMatcher] = None):
+        self.window_seconds = window_seconds
+        self.thresholds = list(thresholds if thresholds is not None else default_thresholds(5))
+        self.matcher = matcher or log_matcher
+        self.window = SlidingWindowCounter(window_seconds, buckets)
+        self._lock = threading.Lock()
+        self._active: Dict[str, bool] = {}
+        self._samples: Dict[str, str] = {}
+
+        # Stream statistics
+        self.lines = 0
+        self.late_lines = 0
+        self.issues_emitted = 0
+
+    def observe(self, log: Any, received_at: Optional[float] = None) -> List[Issue]:
+        """Count one log line and return any issues whose threshold it crossed"""
+        text = str(log).lower()
+        tags = self.matcher.classify_text(text)
+
+        timestamp = parse_timestamp(log.get("timestamp")) if isinstance(log, dict) else math.nan
+        if math.isnan(timestamp):
+            timestamp = received_at if received_at is not None else time.time()
+
+        issues = []
+        with self._lock:
+            self.lines += 1
+            self.window.advance(timestamp)
+            self._rearm()
+
+            # Lateness depends only on the timestamp, so a late line is
+            # counted once however many thresholds it matches
+            if self.window.is_late(timestamp):
+                self.late_lines += 1
+                return issues
+
+            for threshold in self.thresholds:
+                if not self._matches(threshold, tags):
+                    continue
+                self.window.add(threshold.name, timestamp)
+
+                message = log.get("message", log) if isinstance(log, dict) else log
+                self._samples[threshold.name] = str(message)[:200]
+
+                count = self.window.count(threshold.name)
+                if count >= threshold.count and not self._active.get(threshold.name):
+                    self._active[threshold.name] = True
+                    issues.append(self._create_issue(threshold, count))
+
+        return issues
+
+    async def analyze(self, logs: AsyncIterator[Any]) -> AsyncIterator[Issue]:
+        """Consume an async log stream, yielding issues as thresholds are crossed"""
+        try:
+            async for log in logs:
+                for issue in self.observe(log):
+                    yield issue
+        finally:
+            aclose = getattr(logs, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def _matches(self, threshold: WindowThreshold, tags: Dict[str, Any]) -> bool:
+        """Whether a line's tags satisfy a threshold"""
+        if not all(tag in tags for tag in threshold.tags):
+            return False
+        if threshold.rule is None:
+            return True
+        return any(rule.name == threshold.rule for rule in tags[threshold.tags[0]])
+
+    def _rearm(self):
+        """Re-arm thresholds whose windowed count fell back below their limit"""
+        for threshold in self.thresholds:
+            if self._active.get(threshold.name) and self.window.count(threshold.name) < threshold.count:
+                self._active[threshold.name] = False
+
+    def _create_issue(self, threshold: WindowThreshold, count: int) -> Issue:
+        """Build the issue for a crossed threshold"""
+        self.issues_emitted += 1
+        window_start, window_end = self.window.window_bounds()
+        label = threshold.rule or " ".join(threshold.tags)
+        slug = re.sub(r"[^a-z0-9]+", "_", threshold.name.lower()).strip("_")
+
+        return Issue(
+            id=f"stream_{slug}_{self.issues_emitted:04d}",
+            type=threshold.issue_type,
+            severity=threshold.severity,
+            title=f"Log Spike: {label.replace('.*', ' ').title()}",
+            description=(
+                f"{count} log lines matching '{label}' within {self.window_seconds:.0f}s "
+                f"(threshold {threshold.count})"
+            ),
+            detected_by=threshold.detected_by,
+            error_messages=[self._samples.get(threshold.name, "")],
+            context={
+                "threshold": threshold.name,
+                "window_count": count,
+                "window_seconds": self.window_seconds,
+                "window_start": datetime.utcfromtimestamp(window_start).isoformat(),
+                "window_end": datetime.utcfromtimestamp(window_end).isoformat()
+            }
+        )
+
+    def window_counts(self) -> Dict[str, int]:
+        """Matching lines per threshold within the current window"""
+        with self._lock:
+            return self.window.counts()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get stream statistics"""
+        with self._lock:
+            return {
+                "lines": self.lines,
+                "late_lines": self.late_lines,
+                "issues_emitted": self.issues_emitted,
+                "active_alerts": sum(1 for active in self._active.values() if active)
+            }
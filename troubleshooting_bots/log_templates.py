@@ -0,0 +1,182 @@
+"""
+Online log template mining
+Clusters log messages into templates with a Drain-style fixed-depth parse tree
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+
+WILDCARD = "<*>"
+
+# Variable parts of a message, replaced by the wildcard before clustering.
+# None of them span whitespace, so masked and raw tokens stay aligned.
+# Three digit numbers in the HTTP status range are kept as they tell errors apart.
+_VARIABLES = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"    # UUIDs
+    r"|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"                                   # Emails
+    r"|\d{4}-\d{2}-\d{2}(?:t\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:z|[+-]\d{2}:?\d{2})?)?"  # ISO dates
+    r"|\d{1,2}:\d{2}:\d{2}(?:\.\d+)?"                                  # Times
+    r"|\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?"                               # IPv4 addresses
+    r"|0x[0-9a-f]+"                                                    # Hex values
+    r"|\b(?=[a-z_]*\d)[a-z0-9_]{16,}\b"                                # Hashes, cuids and long ids
+    r"|\b(?![1-5]\d\d\b)\d+(?:\.\d+)?(?:ms|s|kb|mb|gb)?\b",            # Numbers and durations
+    re.IGNORECASE
+)
+
+
+def mask_variables(message: str) -> str:
+    """Replace ids, timestamps, emails, addresses and numbers with the wildcard"""
+    return _VARIABLES.sub(WILDCARD, message)
+
+
+@dataclass
+class LogTemplate:
+    """A cluster of log messages sharing one template"""
+    id: int
+    tokens: List[str]
+    count: int = 0
+    first_seen: Optional[float] = None
+    last_seen: Optional[float] = None
+    examples: List[Tuple[str, ...]] = field(default_factory=list)
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "template": self.template,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "examples": [list(example) for example in self.examples]
+        }
+
+
+class TemplateMiner:
+    """
+    Incremental Drain-style template miner
+
+    Messages are masked and tokenized, then routed through a fixed-depth
+    tree keyed by token count and the first few tokens to a small leaf of
+    candidate templates. The most similar candidate absorbs the message,
+    turning the tokens that differ into wildcards; otherwise a new template
+    is started. Each message costs one pass over its tokens plus one leaf
+    scan, so mining is linear in log volume. The least recently matched
+    templates are evicted beyond max_templates.
+    """
+
+    def __init__(self, depth: int = 4, similarity: Optional[float] = None,
+                 max_children: int = 100, max_templates: Optional[int] = None,
+                 max_examples: int = 3):
+        self.depth = max(depth - 2, 1)  # Token levels below the root and length layers
+        self.similarity = similarity if similarity is not None else config.log_template_similarity
+        self.max_children = max_children
+        self.max_templates = max_templates or config.log_template_max_clusters
+        self.max_examples = max_examples
+        self._root: Dict[int, Dict] = {}
+        self._templates: "OrderedDict[int, Tuple[LogTemplate, List[LogTemplate]]]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+        # Mining statistics
+        self.messages = 0
+        self.evicted = 0
+
+    def add(self, message: str, timestamp: Optional[float] = None) -> LogTemplate:
+        """Cluster one message, returning the template it was assigned to"""
+        raw_tokens = message.split()
+        tokens = mask_variables(message).split()
+
+        with self._lock:
+            self.messages += 1
+            leaf = self._leaf(tokens)
+            template = self._best_match(leaf, tokens)
+
+            if template is None:
+                template = LogTemplate(id=self._next_id, tokens=tokens)
+                self._next_id += 1
+                leaf.append(template)
+                self._templates[template.id] = (template, leaf)
+                self._evict()
+            else:
+                template.tokens = [
+                    existing if existing == token else WILDCARD
+                    for existing, token in zip(template.tokens, tokens)
+                ]
+                self._templates.move_to_end(template.id)
+
+            template.count += 1
+            if timestamp is not None:
+                if template.first_seen is None or timestamp < template.first_seen:
+                    template.first_seen = timestamp
+                if template.last_seen is None or timestamp > template.last_seen:
+                    template.last_seen = timestamp
+
+            if len(template.examples) < self.max_examples:
+                values = tuple(
+                    raw for raw, token in zip(raw_tokens, template.tokens) if WILDCARD in token
+                )
+                if values and values not in template.examples:
+                    template.examples.append(values)
+
+            return template
+
+    def _leaf(self, tokens: List[str]) -> List[LogTemplate]:
+        """Walk (and grow) the parse tree to the leaf for a token sequence"""
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth]:
+            key = WILDCARD if WILDCARD in token else token
+            if key not in node and len(node) >= self.max_children:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        return node.setdefault(None, [])
+
+    def _best_match(self, leaf: List[LogTemplate], tokens: List[str]) -> Optional[LogTemplate]:
+        """Most similar template in a leaf, if similar enough"""
+        best = None
+        best_key = (-1.0, -1)
+        for template in leaf:
+            equal = wildcards = 0
+            for existing, token in zip(template.tokens, tokens):
+                if existing == token:
+                    equal += 1
+                elif existing == WILDCARD:
+                    wildcards += 1
+            key = (equal / len(tokens) if tokens else 1.0, wildcards)
+            if key > best_key:
+                best, best_key = template, key
+        if best is not None and best_key[0] >= self.similarity:
+            return best
+        return None
+
+    def _evict(self):
+        """Drop the least recently matched templates beyond max_templates"""
+        while len(self._templates) > self.max_templates:
+            _, (template, leaf) = self._templates.popitem(last=False)
+            leaf.remove(template)
+            self.evicted += 1
+
+    def templates(self, limit: Optional[int] = None) -> List[LogTemplate]:
+        """Templates by descending count, earliest created first on ties"""
+        with self._lock:
+            ranked = sorted(
+                (template for template, _ in self._templates.values()),
+                key=lambda template: (-template.count, template.id)
+            )
+        return ranked[:limit] if limit is not None else ranked
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get mining statistics"""
+        with self._lock:
+            return {
+                "messages": self.messages,
+                "templates": len(self._templates),
+                "evicted": self.evicted
+            }
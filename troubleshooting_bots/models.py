@@ -6,7 +6,7 @@ Defines the data structures used throughout the troubleshooting system
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Union
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 
 class Severity(str, Enum):
@@ -18,6 +18,16 @@ class Severity(str, Enum):
     INFO = "info"
 
 
+# Severity levels from least to most severe, for comparisons
+SEVERITY_RANK = {
+    Severity.INFO: 0,
+    Severity.LOW: 1,
+    Severity.MEDIUM: 2,
+    Severity.HIGH: 3,
+    Severity.CRITICAL: 4
+}
+
+
 class IssueType(str, Enum):
     """Types of issues that can be detected"""
     FRONTEND_ERROR = "frontend_error"
@@ -43,6 +53,14 @@ class BotType(str, Enum):
     NETWORK_FIX = "network_fix"
 
 
+class ProbeResult(BaseModel):
+    """Outcome of a single system information probe"""
+    success: bool = Field(..., description="Whether the probe returned usable data")
+    latency: float = Field(..., description="Probe latency in seconds")
+    error: Optional[str] = None
+    timed_out: bool = Field(default=False)
+
+
 class SystemInfo(BaseModel):
     """System information for diagnostic purposes"""
     timestamp: datetime = Field(default_factory=datetime.utcnow)
@@ -58,8 +76,18 @@ class SystemInfo(BaseModel):
     # Recent logs and errors
     recent_logs: List[Dict[str, Any]] = Field(default_factory=list)
     error_patterns: List[str] = Field(default_factory=list)
+    # Mined error templates of the target (id, template, count, first/last seen, examples)
+    error_templates: List[Dict[str, Any]] = Field(default_factory=list)
+    
+    # Per-source collection outcomes (health, logs, database, bot_operations)
+    probe_results: Dict[str, ProbeResult] = Field(default_factory=dict)
+    
+    # LogIndex over recent_logs, built once per snapshot (see log_index.log_index_for)
+    _log_index: Any = PrivateAttr(default=None)
     
     class Config:
+        # Shared read-only by every diagnostic bot and tool of a session
+        frozen = True
         json_encoders = {
             datetime: lambda dt: dt.isoformat()
         }
@@ -85,10 +113,33 @@ class Issue(BaseModel):
     context: Dict[str, Any] = Field(default_factory=dict)
     stack_trace: Optional[str] = None
     
+    # Stable identity and recurrence tracking (see issue_store)
+    fingerprint: Optional[str] = None
+    occurrences: int = Field(default=1)
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    
     class Config:
         json_encoders = {
             datetime: lambda dt: dt.isoformat()
         }
+    
+    def merge(self, other: "Issue"):
+        """Fold a recurrence of the same issue (same fingerprint) into this one"""
+        self.occurrences = max(self.occurrences, other.occurrences)
+        if other.first_seen and (self.first_seen is None or other.first_seen < self.first_seen):
+            self.first_seen = other.first_seen
+        if other.last_seen and (self.last_seen is None or other.last_seen > self.last_seen):
+            self.last_seen = other.last_seen
+        if SEVERITY_RANK[other.severity] > SEVERITY_RANK[self.severity]:
+            self.severity = other.severity
+        for message in other.error_messages:
+            if message not in self.error_messages:
+                self.error_messages.append(message)
+        del self.error_messages[:-5]  # Keep the latest samples
+        for endpoint in other.affected_endpoints:
+            if endpoint not in self.affected_endpoints:
+                self.affected_endpoints.append(endpoint)
 
 
 class DiagnosticReport(BaseModel):
@@ -165,6 +216,7 @@ class ResolutionReport(BaseModel):
 class WorkflowState(BaseModel):
     """LangGraph workflow state"""
     session_id: str = Field(..., description="Unique session identifier")
+    target_url: Optional[str] = Field(None, description="Base URL of the deployment being troubleshot")
     phase: str = Field(default="initialization", description="Current workflow phase")
     started_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -186,6 +238,10 @@ class WorkflowState(BaseModel):
     completed_steps: List[str] = Field(default_factory=list)
     failed_steps: List[str] = Field(default_factory=list)
     
+    # Execution mode and bots whose rule-based results were escalated to agents
+    execution_mode: str = Field(default="agent")
+    escalated_bots: List[BotType] = Field(default_factory=list)
+    
     # Final results
     success: bool = Field(default=False)
     final_health_score: Optional[float] = None
@@ -197,9 +253,17 @@ class WorkflowState(BaseModel):
         }
     
     def add_diagnostic_report(self, report: DiagnosticReport):
-        """Add a diagnostic report and update issues"""
+        """Add a diagnostic report and update issues, merging recurrences by fingerprint"""
         self.diagnostic_reports.append(report)
-        self.all_issues.extend(report.issues_found)
+        fingerprinted = {issue.fingerprint: issue for issue in self.all_issues if issue.fingerprint}
+        for issue in report.issues_found:
+            existing = fingerprinted.get(issue.fingerprint) if issue.fingerprint else None
+            if existing is not None:
+                existing.merge(issue)
+                continue
+            self.all_issues.append(issue)
+            if issue.fingerprint:
+                fingerprinted[issue.fingerprint] = issue
         self.updated_at = datetime.utcnow()
     
     def add_resolution_report(self, report: ResolutionReport):
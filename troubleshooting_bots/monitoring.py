@@ -7,13 +7,24 @@ import asyncio
 import json
 import os
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
-from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Any, Optional, Callable, Tuple
+from contextlib import asynccontextmanager, nullcontext
 from dataclasses import dataclass, asdict
 from enum import Enum
 
-from utils import StructuredLogger
+from config import config
+from utils import StructuredLogger, bv_studios_api, api_registry
+from agent_pool import agent_pool
+from executors import cpu_executor, crew_executor, resolution_scheduler, track_tool_calls
+from prompt_context import prompt_context_builder
+from llm_cache import llm_result_cache
+from log_matching import log_matcher
+from anomaly import anomaly_detector
+from diagnostic_registry import diagnostic_runner
+from issue_store import issue_store
+from sessions import session_manager
 from models import BotType, Severity
 
 
@@ -51,18 +62,62 @@ class PerformanceSnapshot:
     cpu_usage_percent: Optional[float] = None
 
 
+@dataclass
+class LLMCallRecord:
+    """Instrumentation for a single crew kickoff"""
+    bot_type: BotType
+    operation: str
+    wall_time: float
+    queue_wait: float = 0.0
+    tool_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tool_calls: int = 0
+    cached: bool = False
+    success: bool = True
+
+
+def extract_token_usage(crew: Any, result: Any) -> Tuple[int, int]:
+    """Read prompt and completion token counts reported by a crew or its result"""
+    usage = getattr(result, "token_usage", None) or getattr(crew, "usage_metrics", None)
+    if usage is None:
+        return 0, 0
+    if not isinstance(usage, dict):
+        usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+    return int(usage.get("prompt_tokens") or 0), int(usage.get("completion_tokens") or 0)
+
+
+def openai_callback():
+    """
+    Context manager counting OpenAI tokens used inside it
+    
+    Imported on use so monitoring does not depend on langchain; yields None
+    when no token-counting callback is installed.
+    """
+    try:
+        from langchain_community.callbacks.manager import get_openai_callback
+    except ImportError:
+        try:
+            from langchain.callbacks import get_openai_callback
+        except ImportError:
+            return nullcontext(None)
+    return get_openai_callback()
+
+
 class MetricsCollector:
     """Collects and aggregates performance metrics"""
     
     def __init__(self):
         self.metrics: List[Metric] = []
         self.performance_snapshots: List[PerformanceSnapshot] = []
+        self.llm_calls: Deque[LLMCallRecord] = deque(maxlen=config.llm_call_history)
         self.logger = StructuredLogger.get_logger("metrics_collector")
         
         # Metric aggregations
         self.counters: Dict[str, float] = {}
         self.gauges: Dict[str, float] = {}
         self.timers: Dict[str, List[float]] = {}
+        self.llm_rollups: Dict[str, Dict[str, float]] = {}  # Running totals per bot type
     
     def increment_counter(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
         """Increment a counter metric"""
@@ -107,6 +162,88 @@ class MetricsCollector:
         )
         self.metrics.append(metric)
     
+    def record_component_stats(self, component: str, stats: Dict[str, float]):
+        """Record point-in-time statistics reported by a system component"""
+        for stat_name, value in stats.items():
+            self.set_gauge(f"{component}_{stat_name}", value, labels={"component": component})
+    
+    def record_llm_call(self, record: LLMCallRecord):
+        """Record the latency, token and tool usage of a crew kickoff"""
+        self.llm_calls.append(record)
+        bot = record.bot_type.value
+        labels = {"bot_type": bot, "operation": record.operation}
+        
+        rollup = self.llm_rollups.setdefault(bot, {
+            "calls": 0, "cached_calls": 0, "failed_calls": 0,
+            "wall_time_total": 0.0, "wall_time_max": 0.0,
+            "queue_wait_total": 0.0, "tool_time_total": 0.0,
+            "prompt_tokens": 0, "completion_tokens": 0, "tool_calls": 0
+        })
+        rollup["calls"] += 1
+        
+        self.increment_counter(
+            f"llm_{bot}_calls_total",
+            labels={**labels, "success": str(record.success), "cached": str(record.cached)}
+        )
+        if record.cached:
+            rollup["cached_calls"] += 1
+            return
+        
+        if not record.success:
+            rollup["failed_calls"] += 1
+        rollup["wall_time_total"] += record.wall_time
+        rollup["wall_time_max"] = max(rollup["wall_time_max"], record.wall_time)
+        rollup["queue_wait_total"] += record.queue_wait
+        rollup["tool_time_total"] += record.tool_time
+        rollup["prompt_tokens"] += record.prompt_tokens
+        rollup["completion_tokens"] += record.completion_tokens
+        rollup["tool_calls"] += record.tool_calls
+        
+        self.record_timer(f"llm_{bot}_wall_time_seconds", record.wall_time, labels=labels)
+        self.record_timer(f"llm_{bot}_queue_wait_seconds", record.queue_wait, labels=labels)
+        
+        # Token and tool counts are per-call distributions, not operation counters
+        for name, value in (
+            ("prompt_tokens", record.prompt_tokens),
+            ("completion_tokens", record.completion_tokens),
+            ("tool_calls", record.tool_calls),
+            ("tool_time_seconds", record.tool_time)
+        ):
+            self.metrics.append(Metric(
+                name=f"llm_{bot}_{name}",
+                type=MetricType.HISTOGRAM,
+                value=value,
+                timestamp=datetime.utcnow(),
+                labels=labels
+            ))
+        
+        self.logger.info(
+            "LLM call recorded",
+            bot_type=bot,
+            operation=record.operation,
+            wall_time=round(record.wall_time, 3),
+            queue_wait=round(record.queue_wait, 3),
+            tool_calls=record.tool_calls,
+            prompt_tokens=record.prompt_tokens,
+            completion_tokens=record.completion_tokens,
+            success=record.success
+        )
+    
+    def get_llm_rollups(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate all recorded crew kickoffs per bot type, not just the recent ones kept"""
+        rollups = {bot: dict(totals) for bot, totals in self.llm_rollups.items()}
+        
+        for rollup in rollups.values():
+            executed = rollup["calls"] - rollup["cached_calls"]
+            rollup["wall_time_avg"] = rollup["wall_time_total"] / executed if executed else 0.0
+            rollup["queue_wait_avg"] = rollup["queue_wait_total"] / executed if executed else 0.0
+            # Time spent neither queued nor in tools is attributed to the model
+            rollup["model_time_total"] = max(
+                rollup["wall_time_total"] - rollup["queue_wait_total"] - rollup["tool_time_total"], 0.0
+            )
+        
+        return rollups
+    
     def record_performance_snapshot(self, snapshot: PerformanceSnapshot):
         """Record a performance snapshot"""
         self.performance_snapshots.append(snapshot)
@@ -370,6 +507,52 @@ class PerformanceMonitor:
                 duration=duration,
                 success=success
             )
+    
+    async def run_crew(self, crew: Any, bot_type: BotType, operation: str,
+                       timeout: Optional[float] = None) -> Any:
+        """Kick off a crew in the crew executor and record its LLM call metrics"""
+        submitted_at = time.monotonic()
+        timing: Dict[str, float] = {}
+        usage: Dict[str, int] = {}
+        tool_stats = [0, 0.0]
+        
+        def kickoff() -> Any:
+            timing["started_at"] = time.monotonic()
+            with track_tool_calls() as stats, openai_callback() as callback:
+                try:
+                    return crew.kickoff()
+                finally:
+                    tool_stats[:] = stats
+                    if callback is not None:
+                        usage["prompt_tokens"] = callback.prompt_tokens
+                        usage["completion_tokens"] = callback.completion_tokens
+        
+        result = None
+        success = False
+        try:
+            result = await crew_executor.run(kickoff, timeout=timeout)
+            success = True
+            return result
+        finally:
+            finished_at = time.monotonic()
+            started_at = timing.get("started_at", finished_at)
+            
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            if not prompt_tokens and not completion_tokens:
+                prompt_tokens, completion_tokens = extract_token_usage(crew, result)
+            
+            self.metrics_collector.record_llm_call(LLMCallRecord(
+                bot_type=bot_type,
+                operation=operation,
+                wall_time=finished_at - submitted_at,
+                queue_wait=started_at - submitted_at,
+                tool_time=tool_stats[1],
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                tool_calls=int(tool_stats[0]),
+                success=success
+            ))
 
 
 class SystemHealthMonitor:
@@ -457,6 +640,7 @@ class SystemHealthMonitor:
             "metrics_summary": metric_summary,
             "error_summary": error_summary,
             "error_patterns": error_patterns,
+            "llm_usage": self.metrics_collector.get_llm_rollups(),
             "recommendations": recommendations,
             "system_alerts": self._generate_system_alerts(health_score, error_summary)
         }
@@ -542,9 +726,26 @@ class MonitoringSystem:
         
         self.logger.info("Monitoring system initialized")
     
+    def collect_component_stats(self):
+        """Pull statistics from shared components (API clients, executors, caches, sessions, agents)"""
+        self.metrics_collector.record_component_stats("bv_studios_api", bv_studios_api.get_stats())
+        self.metrics_collector.record_component_stats("crew_executor", crew_executor.get_stats())
+        self.metrics_collector.record_component_stats("resolution_scheduler", resolution_scheduler.get_stats())
+        self.metrics_collector.record_component_stats("cpu_executor", cpu_executor.get_stats())
+        self.metrics_collector.record_component_stats("prompt_context", prompt_context_builder.get_stats())
+        self.metrics_collector.record_component_stats("llm_result_cache", llm_result_cache.get_stats())
+        self.metrics_collector.record_component_stats("log_matcher", log_matcher.get_stats())
+        self.metrics_collector.record_component_stats("anomaly_detector", anomaly_detector.get_stats())
+        self.metrics_collector.record_component_stats("diagnostic_runner", diagnostic_runner.get_stats())
+        self.metrics_collector.record_component_stats("issue_store", issue_store.get_stats())
+        self.metrics_collector.record_component_stats("sessions", session_manager.get_stats())
+        self.metrics_collector.record_component_stats("api_registry", api_registry.get_stats())
+        self.metrics_collector.record_component_stats("agent_pool", agent_pool.get_stats())
+    
     def get_comprehensive_status(self) -> Dict[str, Any]:
         """Get comprehensive system monitoring status"""
         
+        self.collect_component_stats()
         health_report = self.health_monitor.generate_health_report()
         
         return {
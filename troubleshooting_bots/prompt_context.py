@@ -0,0 +1,229 @@
+"""
+Compact prompt context for diagnostic tasks
+Serializes SystemInfo once and renders a budgeted digest for each diagnostic bot
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from config import config
+from log_matching import LogMatcher, keyword_rules
+from models import BotType, SystemInfo
+from utils import StructuredLogger
+
+
+# Log keywords relevant to each diagnostic bot
+LOG_KEYWORDS: Dict[BotType, List[str]] = {
+    BotType.WEB_DIAGNOSTIC: [
+        "react", "next", "hydration", "component", "render", "javascript",
+        "css", "404", "page", "client", "frontend", "ui"
+    ],
+    BotType.DATABASE_DIAGNOSTIC: [
+        "database", "postgres", "prisma", "connection", "query", "sql"
+    ],
+    BotType.NETWORK_DIAGNOSTIC: [
+        "api", "endpoint", "timeout", "auth", "unauthorized", "network",
+        "fetch", "502", "503", "504", "rate limit"
+    ]
+}
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Estimate the token count of text using a characters-per-token ratio"""
+    return int(len(text) / chars_per_token + 0.5)
+
+
+class PromptContextBuilder:
+    """
+    Builds per-bot prompt digests from a single serialization of SystemInfo
+
+    Each digest holds a short shared header, the structured status the bot
+    cares about and the log lines matching its keywords, deduplicated and
+    added in the order the API returned them until the token budget is spent.
+    """
+
+    def __init__(self, token_budget: int = 1500, max_line_chars: int = 200,
+                 chars_per_token: float = 4.0):
+        self.token_budget = token_budget
+        self.max_line_chars = max_line_chars
+        self.chars_per_token = chars_per_token
+        self.logger = StructuredLogger.get_logger("prompt_context_builder")
+        self._lock = threading.Lock()
+        self._matcher = LogMatcher([
+            keyword_rules(bot_type.value, keywords) for bot_type, keywords in LOG_KEYWORDS.items()
+        ])
+
+        # Build and truncation statistics
+        self.builds = 0
+        self.digests = 0
+        self.total_tokens = 0
+        self.truncated_digests = 0
+        self.log_lines_included = 0
+        self.log_lines_dropped = 0
+
+    def build(self, system_info: SystemInfo,
+              bot_types: Optional[List[BotType]] = None) -> Dict[BotType, str]:
+        """Build a digest for each diagnostic bot type"""
+        data = json.loads(system_info.json())
+        bot_types = bot_types or list(LOG_KEYWORDS)
+
+        header = self._render_header(data)
+        log_lines = self._render_log_lines(data.get("recent_logs", []))
+
+        digests = {}
+        for bot_type in bot_types:
+            sections = [header, self._render_status(bot_type, data)]
+            digests[bot_type] = self._fit_to_budget(bot_type, sections, log_lines)
+
+        with self._lock:
+            self.builds += 1
+
+        return digests
+
+    def _dumps(self, value: Any) -> str:
+        """Serialize a value as compact JSON"""
+        return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+
+    def _render_header(self, data: Dict[str, Any]) -> str:
+        """Render the header shared by every digest"""
+        # No collection timestamp, so unchanged systems yield identical prompts
+        lines = [f"Target: {data.get('base_url')} ({data.get('environment')})"]
+
+        failed_probes = {
+            name: probe.get("error") or ("timed out" if probe.get("timed_out") else "failed")
+            for name, probe in data.get("probe_results", {}).items()
+            if not probe.get("success")
+        }
+        if failed_probes:
+            lines.append(f"Failed probes: {self._dumps(failed_probes)}")
+
+        error_patterns = data.get("error_patterns", [])
+        if error_patterns:
+            lines.append(f"Error patterns: {self._dumps(error_patterns[:5])}")
+
+        return "\n".join(lines)
+
+    def _render_status(self, bot_type: BotType, data: Dict[str, Any]) -> str:
+        """Render the structured status relevant to a bot type"""
+        if bot_type == BotType.DATABASE_DIAGNOSTIC:
+            return f"Database status: {self._dumps(data.get('database_status', {}))}"
+
+        if bot_type == BotType.NETWORK_DIAGNOSTIC:
+            bot_operations = data.get("performance_metrics", {}).get("bot_operations", {})
+            endpoints = {
+                name: {
+                    key: round(result[key], 1) if key == "latency" else result[key]
+                    for key in ("status", "latency", "retries", "timed_out", "error")
+                    if result.get(key) is not None
+                }
+                for name, result in bot_operations.items()
+                if isinstance(result, dict)
+            }
+            # Coarse latencies keep prompts stable across otherwise identical sweeps
+            probe_latency = {
+                name: round(probe.get("latency", 0.0), 1)
+                for name, probe in data.get("probe_results", {}).items()
+            }
+            return "\n".join([
+                f"Endpoint stats: {self._dumps(endpoints)}",
+                f"Probe latency (s): {self._dumps(probe_latency)}"
+            ])
+
+        return f"API status: {self._dumps(data.get('api_status', {}))}"
+
+    def _render_log_lines(self, logs: List[Any]) -> List[Dict[str, Any]]:
+        """Render log entries as short lines, collapsing repeated messages"""
+        rendered: Dict[str, Dict[str, Any]] = {}
+
+        for log in logs:
+            if isinstance(log, dict):
+                level = log.get("level") or log.get("status") or "info"
+                message = log.get("message") or log.get("data") or log
+                if not isinstance(message, str):
+                    message = self._dumps(message)
+                text = f"[{level}] {message}"
+            else:
+                text = str(log)
+
+            text = " ".join(text.split())[:self.max_line_chars]
+            if text in rendered:
+                rendered[text]["count"] += 1
+            else:
+                # Tag each distinct line with every bot whose keywords it contains
+                tags = self._matcher.classify_text(text.lower())
+                rendered[text] = {"text": text, "tags": set(tags), "count": 1}
+
+        return list(rendered.values())
+
+    def _fit_to_budget(self, bot_type: BotType, sections: List[str],
+                       log_lines: List[Dict[str, Any]]) -> str:
+        """Join sections and matching log lines without exceeding the token budget"""
+        budget_chars = int(self.token_budget * self.chars_per_token)
+        digest = "\n".join(sections)
+        truncated = False
+
+        if len(digest) > budget_chars:
+            digest = digest[:max(budget_chars - 3, 0)] + "..."
+            truncated = True
+
+        matching = [line for line in log_lines if bot_type.value in line["tags"]]
+
+        included = 0
+        if matching and not truncated:
+            heading = "\nRelevant logs:"
+            remaining = budget_chars - len(digest) - len(heading)
+            rendered_logs = []
+            for line in matching:
+                text = line["text"] if line["count"] == 1 else f"{line['text']} (x{line['count']})"
+                if len(text) + 1 > remaining:
+                    break
+                rendered_logs.append(text)
+                remaining -= len(text) + 1
+
+            if rendered_logs:
+                digest += heading + "".join(f"\n{text}" for text in rendered_logs)
+            included = len(rendered_logs)
+
+        dropped = len(matching) - included
+        if dropped:
+            truncated = True
+
+        tokens = estimate_tokens(digest, self.chars_per_token)
+        with self._lock:
+            self.digests += 1
+            self.total_tokens += tokens
+            self.log_lines_included += included
+            self.log_lines_dropped += dropped
+            if truncated:
+                self.truncated_digests += 1
+
+        if truncated:
+            self.logger.debug(
+                "Prompt context truncated to budget",
+                bot_type=bot_type.value,
+                tokens=tokens,
+                log_lines_dropped=dropped
+            )
+
+        return digest
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get build and truncation statistics"""
+        with self._lock:
+            return {
+                "token_budget": self.token_budget,
+                "builds": self.builds,
+                "digests": self.digests,
+                "avg_digest_tokens": self.total_tokens / self.digests if self.digests else 0.0,
+                "truncated_digests": self.truncated_digests,
+                "log_lines_included": self.log_lines_included,
+                "log_lines_dropped": self.log_lines_dropped
+            }
+
+
+# Global prompt context builder instance
+prompt_context_builder = PromptContextBuilder(
+    token_budget=config.prompt_token_budget,
+    max_line_chars=config.prompt_max_line_chars
+)
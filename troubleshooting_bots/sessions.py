@@ -0,0 +1,152 @@
+"""
+Session management for concurrent troubleshooting runs
+Tracks active sessions by ID, limits concurrency and keeps an LRU of finished sessions
+"""
+
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import config
+from models import WorkflowState
+from utils import StructuredLogger
+
+
+class SessionManager:
+    """
+    Registry of troubleshooting sessions keyed by session_id
+
+    Each run registers the task executing it so the session can be cancelled,
+    including while it is still waiting for a concurrency slot. Finished
+    sessions keep their final state and report in a bounded LRU.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_finished: int = 50):
+        self.max_concurrent = max_concurrent
+        self.max_finished = max_finished
+        self.logger = StructuredLogger.get_logger("session_manager")
+
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._active: Dict[str, WorkflowState] = {}
+        self._finished: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Session outcome statistics
+        self.waiting = 0
+        self.outcomes: Dict[str, int] = {"completed": 0, "failed": 0, "cancelled": 0}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def register_task(self, session_id: str, task: Optional[asyncio.Task] = None):
+        """Record the task running a session so it can be cancelled"""
+        task = task or asyncio.current_task()
+        registered = self._tasks.get(session_id)
+        if (registered is not None and registered is not task) or session_id in self._active:
+            raise ValueError(f"Session {session_id} is already running")
+        self._tasks[session_id] = task
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for one of the concurrent session slots"""
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def start(self, state: WorkflowState):
+        """Mark a session as active"""
+        self._active[state.session_id] = state
+
+    def finish(self, session_id: str, status: str, report: Optional[Dict[str, Any]] = None):
+        """Move a session to the finished LRU"""
+        self._tasks.pop(session_id, None)
+        state = self._active.pop(session_id, None)
+
+        if state is not None and status != "completed":
+            state.phase = status
+        self.outcomes[status] = self.outcomes.get(status, 0) + 1
+
+        self._finished[session_id] = {
+            "state": state,
+            "status": status,
+            "report": report,
+            "finished_at": datetime.utcnow()
+        }
+        self._finished.move_to_end(session_id)
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+        self.logger.info("Session finished", session_id=session_id, status=status)
+
+    def get(self, session_id: str) -> Optional[WorkflowState]:
+        """Get the state of an active or recently finished session"""
+        if session_id in self._active:
+            return self._active[session_id]
+
+        record = self._finished.get(session_id)
+        if record is None:
+            return None
+        self._finished.move_to_end(session_id)
+        return record["state"]
+
+    def get_finished(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the finished record (state, status, report) of a session"""
+        record = self._finished.get(session_id)
+        if record is not None:
+            self._finished.move_to_end(session_id)
+        return record
+
+    def get_task(self, session_id: str) -> Optional[asyncio.Task]:
+        """Get the task running a session that has not finished yet"""
+        return self._tasks.get(session_id)
+
+    def cancel(self, session_id: str) -> bool:
+        """Cancel a running or queued session"""
+        task = self._tasks.get(session_id)
+        if task is None or task.done():
+            return False
+
+        self.logger.info("Cancelling session", session_id=session_id)
+        return task.cancel()
+
+    def active_sessions(self) -> List[WorkflowState]:
+        """Get the states of all active sessions"""
+        return list(self._active.values())
+
+    def target_in_use(self, target_url: str) -> bool:
+        """Whether any active session troubleshoots the given target"""
+        return any(state.target_url == target_url for state in self._active.values())
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get session counts for the monitoring system"""
+        stats = {
+            "max_concurrent": self.max_concurrent,
+            "active": len(self._active),
+            "waiting": self.waiting,
+            "finished_retained": len(self._finished)
+        }
+        stats.update(self.outcomes)
+        return stats
+
+
+# Global session manager instance
+session_manager = SessionManager(
+    max_concurrent=config.max_concurrent_sessions,
+    max_finished=config.finished_session_history
+)
@@ -4,23 +4,32 @@ Includes logging, circuit breaker, retry logic, and helper functions
 """
 
 import asyncio
+import copy
 import functools
 import hashlib
 import json
 import logging
 import time
+import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 from urllib.parse import urljoin
 
 import aiohttp
 import structlog
 from config import config, LogLevel
+from log_index import LogIndex
+from log_matching import log_matcher
 
 # Type definitions
 T = TypeVar('T')
 
+# Per-task retry counter, set by callers that report how often a request was retried
+_retry_counter: ContextVar[Optional[List[int]]] = ContextVar("retry_counter", default=None)
+
 
 class CircuitBreaker:
     """Circuit breaker implementation for fault tolerance"""
@@ -73,6 +82,120 @@ class CircuitBreakerOpenError(Exception):
     pass
 
 
+class SingleFlight:
+    """Coalesces identical concurrent calls into one shared in-flight task"""
+    
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Await func() unless an identical call is already running, then share it"""
+        task = self._in_flight.get(key)
+        
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.hits += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._on_done, key))
+        
+        # Shield so one cancelled caller does not cancel the call for the others
+        return await asyncio.shield(task)
+    
+    def _on_done(self, key: str, task: asyncio.Task):
+        """Forget a finished call and mark its exception as retrieved"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get coalescing hit/miss statistics"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": len(self._in_flight),
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with per-entry TTLs and a stale-while-revalidate window
+    
+    Values are stored and returned as deep copies, so callers never share or
+    mutate cached state.
+    """
+    
+    FRESH = "fresh"
+    STALE = "stale"
+    MISS = "miss"
+    
+    def __init__(self, max_entries: int = 256, stale_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def lookup(self, key: str) -> Tuple[Any, str]:
+        """Look up a key, returning the value and its freshness state"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, self.MISS
+        
+        expires_at, value = entry
+        now = time.monotonic()
+        
+        if now < expires_at:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(value), self.FRESH
+        
+        if now < expires_at + self.stale_ttl:
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return copy.deepcopy(value), self.STALE
+        
+        del self._entries[key]
+        self.misses += 1
+        return None, self.MISS
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value, evicting the least recently used entries if full"""
+        self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, prefix: str = "") -> int:
+        """Drop every entry whose key starts with prefix, returning the count"""
+        stale_keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in stale_keys:
+            del self._entries[key]
+        return len(stale_keys)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get cache statistics"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries)
+        }
+
+
 def retry_async(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
     """Async retry decorator with exponential backoff"""
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
@@ -87,6 +210,9 @@ def retry_async(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0)
                 except Exception as e:
                     last_exception = e
                     if attempt < max_attempts - 1:
+                        counter = _retry_counter.get()
+                        if counter is not None:
+                            counter[0] += 1
                         await asyncio.sleep(current_delay)
                         current_delay *= backoff
                     
@@ -134,7 +260,13 @@ class StructuredLogger:
 
 
 class AsyncHTTPClient:
-    """Async HTTP client with retry and circuit breaker"""
+    """Async HTTP client with retry and circuit breaker
+    
+    Owns a single pooled aiohttp session that is created lazily on first use
+    and reused for every request, so keep-alive connections and DNS lookups
+    are shared across calls. Call aclose() (or use the client as an async
+    context manager) to release the pool.
+    """
     
     def __init__(self):
         self.circuit_breaker = CircuitBreaker(
@@ -142,13 +274,79 @@ class AsyncHTTPClient:
             timeout=config.circuit_breaker_timeout
         )
         self.logger = StructuredLogger.get_logger("http_client")
+        
+        # Shared session state
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sessions_created = 0
+    
+    async def __aenter__(self) -> "AsyncHTTPClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a session backed by a tuned keep-alive connector"""
+        connector = aiohttp.TCPConnector(
+            limit=config.http_pool_limit,
+            limit_per_host=config.http_pool_limit_per_host,
+            keepalive_timeout=config.http_keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=config.http_dns_cache_ttl
+        )
+        timeout = aiohttp.ClientTimeout(total=config.http_request_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+    
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on the running loop if needed"""
+        loop = asyncio.get_running_loop()
+        
+        if self._session is not None and not self._session.closed and self._session_loop is loop:
+            return self._session
+        
+        if self._session is not None and not self._session.closed:
+            # aiohttp sessions are bound to the loop they were created on
+            self.logger.warning("Discarding HTTP session bound to another event loop")
+            self._close_on_owner_loop(self._session, self._session_loop)
+        
+        self._session = self._create_session()
+        self._session_loop = loop
+        self.sessions_created += 1
+        self.logger.info("Created pooled HTTP session", sessions_created=self.sessions_created)
+        
+        return self._session
+    
+    def _close_on_owner_loop(self, session: aiohttp.ClientSession,
+                             loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session on the loop that owns it, or release its connector if that loop is not running"""
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        
+        # Awaiting the close here would wait on the owner loop's futures from this one;
+        # close the connector's transports without waiting and detach it instead
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            connector._close()
     
     @asynccontextmanager
     async def session(self):
-        """Async context manager for HTTP session"""
-        timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            yield session
+        """Async context manager yielding the shared HTTP session"""
+        yield self.get_session()
+    
+    async def aclose(self):
+        """Close the shared session and its connection pool"""
+        session, self._session = self._session, None
+        loop, self._session_loop = self._session_loop, None
+        
+        if session is not None and not session.closed:
+            if loop is asyncio.get_running_loop():
+                await session.close()
+            else:
+                self._close_on_owner_loop(session, loop)
+            self.logger.info("Closed pooled HTTP session")
     
     @retry_async(max_attempts=3, delay=1.0, backoff=2.0)
     async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
@@ -204,65 +402,333 @@ class AsyncHTTPClient:
 class BVStudiosAPI:
     """API client for BV Studios platform"""
     
-    def __init__(self):
-        self.base_url = config.bv_studios_base_url
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or config.bv_studios_base_url
         self.endpoints = config.admin_api_endpoints
+        self.bot_endpoints = config.bot_probe_endpoints
+        self.probe_concurrency = config.bot_probe_concurrency
+        self.probe_timeout = config.bot_probe_timeout
         self.client = AsyncHTTPClient()
+        self.single_flight = SingleFlight()
+        self.cache = ResponseCache(
+            max_entries=config.api_cache_max_entries,
+            stale_ttl=config.api_cache_stale_ttl
+        )
+        self._generations: Dict[str, int] = {}
+        self._retry_counts: Dict[str, List[int]] = {}  # Retries of each in-flight request
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
         self.logger = StructuredLogger.get_logger("bv_studios_api")
     
+    async def __aenter__(self) -> "BVStudiosAPI":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Release the underlying HTTP connection pool"""
+        await self.client.aclose()
+    
     def _build_url(self, endpoint: str) -> str:
         """Build full URL for endpoint"""
         return urljoin(self.base_url, endpoint)
     
-    async def get_system_health(self) -> Dict[str, Any]:
+    async def _request(self, endpoint_name: str, method: str, url: str,
+                       data: Optional[Dict[str, Any]] = None,
+                       retries: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Perform a request, sharing one in-flight call between identical
+        concurrent callers. Responses may be shared and must be treated as
+        read-only. When given, retries[0] is set to the retry count of the
+        shared call, so every caller of one request reports the same count,
+        also when it stops waiting early.
+        """
+        # Calls started before an invalidation are never joined after it
+        generation = self._generations.get(endpoint_name, 0)
+        body = json.dumps(data, sort_keys=True) if data is not None else ""
+        key = f"{generation} {method} {url} {body}"
+        counter = self._retry_counts.setdefault(key, [0])
+        
+        async def call() -> Dict[str, Any]:
+            token = _retry_counter.set(counter)
+            try:
+                if method == "GET":
+                    return await self.client.get(url)
+                return await self.client.post(url, data)
+            finally:
+                _retry_counter.reset(token)
+                if self._retry_counts.get(key) is counter:
+                    del self._retry_counts[key]
+        
+        try:
+            return await self.single_flight.do(key, call)
+        finally:
+            if retries is not None:
+                retries[0] = counter[0]
+    
+    async def _cached_request(self, endpoint_name: str, method: str, url: str,
+                              data: Optional[Dict[str, Any]] = None,
+                              force_refresh: bool = False,
+                              retries: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Perform a request through the response cache. Fresh entries are served
+        directly; stale entries are served while a background refresh runs.
+        Entries keep the retry count of the request that filled them, reported
+        through retries like _request does.
+        """
+        ttl = config.api_cache_ttls.get(endpoint_name, 0)
+        if ttl <= 0:
+            return await self._request(endpoint_name, method, url, data, retries)
+        
+        body = json.dumps(data, sort_keys=True) if data is not None else ""
+        cache_key = f"{endpoint_name}:{method} {url} {body}"
+        
+        if not force_refresh:
+            entry, state = self.cache.lookup(cache_key)
+            if state != ResponseCache.MISS:
+                if state == ResponseCache.STALE:
+                    self._schedule_refresh(cache_key, ttl, endpoint_name, method, url, data)
+                value, entry_retries = entry
+                if retries is not None:
+                    retries[0] = entry_retries
+                return value
+        
+        generation = self._generations.get(endpoint_name, 0)
+        counted = [0]
+        try:
+            value = await self._request(endpoint_name, method, url, data, counted)
+        finally:
+            if retries is not None:
+                retries[0] = counted[0]
+        if self._generations.get(endpoint_name, 0) == generation:
+            self.cache.set(cache_key, (value, counted[0]), ttl)
+        return value
+    
+    def _schedule_refresh(self, cache_key: str, ttl: float, endpoint_name: str,
+                          method: str, url: str, data: Optional[Dict[str, Any]]):
+        """Refresh a stale cache entry in the background"""
+        if cache_key in self._refreshing:
+            return
+        
+        async def refresh():
+            generation = self._generations.get(endpoint_name, 0)
+            retries = [0]
+            try:
+                value = await self._request(endpoint_name, method, url, data, retries)
+                if self._generations.get(endpoint_name, 0) == generation:
+                    self.cache.set(cache_key, (value, retries[0]), ttl)
+            except Exception as e:
+                self.logger.warning("Background cache refresh failed", endpoint=endpoint_name, error=str(e))
+            finally:
+                self._refreshing.discard(cache_key)
+        
+        self._refreshing.add(cache_key)
+        task = asyncio.ensure_future(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    def invalidate(self, *endpoint_names: str):
+        """
+        Invalidate cached responses for the given endpoints (all endpoints if
+        none are given), e.g. after a fix has been applied
+        """
+        for endpoint_name in endpoint_names or tuple(self.endpoints):
+            self._generations[endpoint_name] = self._generations.get(endpoint_name, 0) + 1
+            removed = self.cache.invalidate(f"{endpoint_name}:")
+            self.logger.info("Invalidated cached responses", endpoint=endpoint_name, entries=removed)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get client statistics for the monitoring system"""
+        stats = {
+            f"singleflight_{name}": value
+            for name, value in self.single_flight.get_stats().items()
+        }
+        stats.update({
+            f"cache_{name}": value
+            for name, value in self.cache.get_stats().items()
+        })
+        return stats
+    
+    async def get_system_health(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Get system health information"""
         url = self._build_url(self.endpoints["health"])
         try:
-            return await self.client.get(url)
+            return await self._cached_request("health", "GET", url, force_refresh=force_refresh)
         except Exception as e:
             self.logger.error("Failed to get system health", error=str(e))
             return {"error": str(e), "status": "unavailable"}
     
-    async def get_recent_logs(self, limit: int = 50) -> Dict[str, Any]:
+    async def get_recent_logs(self, limit: int = 50, force_refresh: bool = False) -> Dict[str, Any]:
         """Get recent system logs"""
         url = self._build_url(f"{self.endpoints['logs']}?limit={limit}")
         try:
-            return await self.client.get(url)
+            return await self._cached_request("logs", "GET", url, force_refresh=force_refresh)
         except Exception as e:
             self.logger.error("Failed to get recent logs", error=str(e))
             return {"logs": [], "error": str(e)}
     
-    async def test_database_connection(self) -> Dict[str, Any]:
+    async def stream_logs(self, batch_size: int = 500, poll_interval: float = 5.0,
+                          max_polls: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield new log entries by polling the logs endpoint
+        The endpoint only takes a limit, so each poll returns the latest
+        entries; filtering is client-side. Entries older than the newest
+        timestamp seen are skipped, as are entries recently yielded, tracked
+        by a bounded set of fingerprints
+        """
+        cursor = ""
+        seen: "OrderedDict[int, None]" = OrderedDict()
+        max_seen = batch_size * 4
+        polls = 0
+        
+        while max_polls is None or polls < max_polls:
+            url = self._build_url(f"{self.endpoints['logs']}?limit={batch_size}")
+            try:
+                response = await self._request("logs", "GET", url)
+            except Exception as e:
+                self.logger.warning("Log stream poll failed", error=str(e))
+                response = {}
+            polls += 1
+            
+            entries = response.get("logs", []) if isinstance(response, dict) else []
+            entries = [entry for entry in entries if isinstance(entry, dict)]
+            for entry in sorted(entries, key=lambda entry: str(entry.get("timestamp") or "")):
+                timestamp = str(entry.get("timestamp") or "")
+                if timestamp and timestamp < cursor:
+                    continue
+                
+                fingerprint = hash(json.dumps(entry, sort_keys=True, default=str))
+                if fingerprint in seen:
+                    continue
+                seen[fingerprint] = None
+                if len(seen) > max_seen:
+                    seen.popitem(last=False)
+                
+                cursor = max(cursor, timestamp)
+                yield entry
+            
+            if max_polls is None or polls < max_polls:
+                await asyncio.sleep(poll_interval)
+    
+    async def test_database_connection(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Test database connectivity"""
         url = self._build_url(self.endpoints["database"])
         try:
-            return await self.client.post(url, {"type": "health-check"})
+            return await self._cached_request(
+                "database", "POST", url, {"type": "health-check"}, force_refresh=force_refresh
+            )
         except Exception as e:
             self.logger.error("Failed to test database", error=str(e))
             return {"success": False, "error": str(e)}
     
-    async def test_bot_operations(self) -> Dict[str, Any]:
-        """Test bot operations"""
-        results = {}
+    async def test_bot_operations(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Test bot operations by probing every configured bot endpoint
+        concurrently, bounded by a semaphore and a per-endpoint deadline
+        """
+        bot_names = [name for name in self.bot_endpoints if name in self.endpoints]
+        semaphore = asyncio.Semaphore(self.probe_concurrency)
         
-        # Test each bot endpoint
-        for bot_name, endpoint in self.endpoints.items():
-            if bot_name in ["content", "lead"]:
-                url = self._build_url(endpoint)
-                try:
-                    # Try a simple health check operation
-                    result = await self.client.post(url, {"type": "health-check"})
-                    results[bot_name] = {"status": "healthy", "result": result}
-                except Exception as e:
-                    results[bot_name] = {"status": "error", "error": str(e)}
+        results = await asyncio.gather(*(
+            self._probe_bot_endpoint(bot_name, semaphore, force_refresh)
+            for bot_name in bot_names
+        ))
         
-        return results
+        return dict(zip(bot_names, results))
+    
+    async def _probe_bot_endpoint(self, bot_name: str, semaphore: asyncio.Semaphore,
+                                  force_refresh: bool) -> Dict[str, Any]:
+        """Probe a single bot endpoint, recording latency, status and retries"""
+        url = self._build_url(self.endpoints[bot_name])
+        # Retries of the request this probe was served by, even if shared or cached
+        retries = [0]
+        
+        async with semaphore:
+            start_time = time.monotonic()
+            try:
+                # Try a simple health check operation
+                result = await asyncio.wait_for(
+                    self._cached_request(
+                        bot_name, "POST", url, {"type": "health-check"},
+                        force_refresh=force_refresh, retries=retries
+                    ),
+                    timeout=self.probe_timeout
+                )
+                return {
+                    "status": "healthy",
+                    "result": result,
+                    "latency": time.monotonic() - start_time,
+                    "retries": retries[0]
+                }
+            except asyncio.TimeoutError:
+                return {
+                    "status": "error",
+                    "error": f"Probe timeout after {self.probe_timeout}s",
+                    "latency": time.monotonic() - start_time,
+                    "retries": retries[0],
+                    "timed_out": True
+                }
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "error": str(e),
+                    "latency": time.monotonic() - start_time,
+                    "retries": retries[0]
+                }
+
+
+async def gather_with_deadline(probes: Dict[str, Awaitable[Any]], timeout: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Run named probes concurrently under a shared deadline
+    
+    Each probe's outcome is recorded independently as a dict with result,
+    success, latency, error and timed_out keys, so one slow or failing probe
+    never delays past the deadline or discards the others' results.
+    """
+    async def timed(awaitable: Awaitable[Any]) -> Dict[str, Any]:
+        start_time = time.monotonic()
+        try:
+            result = await awaitable
+            return {"result": result, "success": True, "error": None,
+                    "latency": time.monotonic() - start_time, "timed_out": False}
+        except Exception as e:
+            return {"result": None, "success": False, "error": str(e),
+                    "latency": time.monotonic() - start_time, "timed_out": False}
+    
+    tasks = {name: asyncio.ensure_future(timed(awaitable)) for name, awaitable in probes.items()}
+    if not tasks:
+        return {}
+    
+    start_time = time.monotonic()
+    pending = set(tasks.values())
+    try:
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    finally:
+        # Probes past the deadline, or all of them if the caller is cancelled,
+        # are cancelled and awaited so none keeps running unobserved
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    outcomes = {}
+    for name, task in tasks.items():
+        if task in pending:
+            outcomes[name] = {"result": None, "success": False,
+                              "error": f"Timed out after {timeout}s",
+                              "latency": time.monotonic() - start_time, "timed_out": True}
+        else:
+            outcomes[name] = task.result()
+    
+    return outcomes
 
 
 def generate_session_id() -> str:
     """Generate unique session ID"""
+    # Random component keeps IDs unique for sessions started in the same instant
     timestamp = datetime.utcnow().isoformat()
-    hash_input = f"{timestamp}_{time.time()}"
+    hash_input = f"{timestamp}_{time.time()}_{uuid.uuid4().hex}"
     return hashlib.md5(hash_input.encode()).hexdigest()[:12]
 
 
@@ -303,37 +769,12 @@ def format_duration(seconds: float) -> str:
 
 def extract_error_patterns(logs: List[Dict[str, Any]]) -> List[str]:
     """Extract common error patterns from logs"""
-    error_patterns = []
-    
-    for log in logs:
-        if log.get("status") == "error" and "data" in log:
-            try:
-                log_data = json.loads(log["data"]) if isinstance(log["data"], str) else log["data"]
-                if "error" in log_data:
-                    error_patterns.append(log_data["error"])
-            except (json.JSONDecodeError, KeyError):
-                continue
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_patterns = []
-    for pattern in error_patterns:
-        if pattern not in seen:
-            seen.add(pattern)
-            unique_patterns.append(pattern)
-    
-    return unique_patterns[:10]  # Return top 10 patterns
+    return LogIndex(logs).error_patterns(limit=10)  # Return top 10 patterns
 
 
 def is_critical_error(error_message: str) -> bool:
     """Determine if error message indicates critical issue"""
-    critical_keywords = [
-        "database", "connection", "timeout", "crash", "fatal",
-        "critical", "emergency", "down", "unavailable", "failed to start"
-    ]
-    
-    error_lower = error_message.lower()
-    return any(keyword in error_lower for keyword in critical_keywords)
+    return "critical" in log_matcher.classify_text(error_message.lower())
 
 
 def prioritize_issues(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -361,9 +802,78 @@ def prioritize_issues(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return sorted(issues, key=priority_score, reverse=True)
 
 
+class BVStudiosAPIRegistry:
+    """
+    Shared BVStudiosAPI clients, one per target base URL
+    
+    Runs acquire the client of their target and release it when done; the
+    last release closes it. The default client is never closed.
+    """
+    
+    def __init__(self, default: BVStudiosAPI):
+        self.default = default
+        self._clients: Dict[str, BVStudiosAPI] = {default.base_url: default}
+        self._holders: Dict[str, int] = {}
+    
+    def get(self, base_url: Optional[str] = None) -> BVStudiosAPI:
+        """Get the client for a base URL, creating it on first use"""
+        if not base_url:
+            return self.default
+        
+        client = self._clients.get(base_url)
+        if client is None:
+            client = self._clients[base_url] = BVStudiosAPI(base_url)
+        return client
+    
+    def acquire(self, base_url: Optional[str] = None) -> BVStudiosAPI:
+        """Get the client for a base URL and hold it open until release()"""
+        client = self.get(base_url)
+        if base_url:
+            self._holders[base_url] = self._holders.get(base_url, 0) + 1
+        return client
+    
+    async def release(self, base_url: Optional[str]):
+        """Drop a hold on a client, closing and forgetting it once nobody holds it"""
+        if not base_url or base_url == self.default.base_url:
+            return
+        
+        holders = self._holders.pop(base_url, 0) - 1
+        if holders > 0:
+            self._holders[base_url] = holders
+            return
+        
+        client = self._clients.pop(base_url, None)
+        if client is not None:
+            await client.aclose()
+    
+    async def aclose(self):
+        """Close every client"""
+        for client in list(self._clients.values()):
+            await client.aclose()
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get registry statistics"""
+        return {"clients": len(self._clients), "held": sum(self._holders.values())}
+
+
+# BV Studios API client of the troubleshooting session running in this context
+_session_api: ContextVar[Optional[BVStudiosAPI]] = ContextVar("session_api", default=None)
+
+
+def current_api() -> BVStudiosAPI:
+    """Get the API client for the current session's target, or the default client"""
+    return _session_api.get() or bv_studios_api
+
+
+def bind_api(api: BVStudiosAPI):
+    """Route current_api() to the given client for the rest of this context"""
+    _session_api.set(api)
+
+
 # Global HTTP client instance
 http_client = AsyncHTTPClient()
 bv_studios_api = BVStudiosAPI()
+api_registry = BVStudiosAPIRegistry(bv_studios_api)
 
 # Setup logging
 StructuredLogger.setup_logging()
\ No newline at end of file
@@ -4,18 +4,22 @@ Orchestrates the flow between diagnostic and fix bots using state management
 """
 
 import asyncio
+import copy
+import re
 from typing import Dict, List, Any, Optional, TypedDict, Annotated
 from datetime import datetime
 import json
 from enum import Enum
 
+from config import config
+
 from models import (
     WorkflowState, SystemInfo, Issue, DiagnosticReport, ResolutionReport,
     Severity, IssueType, BotType
 )
 from utils import (
     StructuredLogger, generate_session_id, calculate_execution_time,
-    prioritize_issues
+    prioritize_issues, SingleFlight, ResponseCache, api_registry, bind_api
 )
 
 # Mock LangGraph imports for compatibility
@@ -124,19 +128,15 @@ class TroubleshootingWorkflow:
     def __init__(self):
         self.logger = StructuredLogger.get_logger("troubleshooting_workflow")
         
-        # Import bot instances
+        # Import bot instances; importing diagnostic_bots registers the built-in diagnostic bots
         from coordinator import troubleshooting_coordinator
-        from diagnostic_bots import (
-            web_diagnostic_bot, database_diagnostic_bot, network_diagnostic_bot
-        )
+        import diagnostic_bots
+        from diagnostic_registry import diagnostic_registry, diagnostic_runner
         from fix_bots import web_fix_bot, database_fix_bot, network_fix_bot
         
         self.coordinator = troubleshooting_coordinator
-        self.diagnostic_bots = {
-            BotType.WEB_DIAGNOSTIC: web_diagnostic_bot,
-            BotType.DATABASE_DIAGNOSTIC: database_diagnostic_bot,
-            BotType.NETWORK_DIAGNOSTIC: network_diagnostic_bot
-        }
+        self.diagnostic_registry = diagnostic_registry
+        self.diagnostic_runner = diagnostic_runner
         self.fix_bots = {
             BotType.WEB_FIX: web_fix_bot,
             BotType.DATABASE_FIX: database_fix_bot,
@@ -145,6 +145,17 @@ class TroubleshootingWorkflow:
         
         # Build workflow graph
         self.workflow = self._build_workflow()
+        
+        # Concurrent runs for the same target and issue share one execution,
+        # and completed reports are reused within the dedup window
+        self.in_flight_runs = SingleFlight()
+        self.recent_reports = ResponseCache(max_entries=128, stale_ttl=0)
+        self.dedup_window = config.workflow_dedup_window
+    
+    @property
+    def diagnostic_bots(self) -> Dict[BotType, Any]:
+        """Diagnostic bots currently registered, by type"""
+        return self.diagnostic_registry.bots()
     
     def _build_workflow(self) -> CompiledStateGraph:
         """Build the LangGraph workflow"""
@@ -249,27 +260,28 @@ class TroubleshootingWorkflow:
         
         diagnostic_reports = []
         
-        # Run diagnostics in parallel
-        diagnostic_tasks = []
-        for bot_type, diagnostic_bot in self.diagnostic_bots.items():
-            task = diagnostic_bot.run_diagnostics(system_info)
-            diagnostic_tasks.append(task)
-        
         try:
-            # Execute all diagnostic bots
-            diagnostic_results = await asyncio.gather(*diagnostic_tasks, return_exceptions=True)
+            # Run every registered diagnostic bot concurrently under its own deadline
+            outcomes = await self.diagnostic_runner.run(system_info)
             
-            for i, result in enumerate(diagnostic_results):
-                if isinstance(result, Exception):
-                    self.logger.error("Diagnostic bot failed", error=str(result))
-                else:
-                    diagnostic_reports.append(result)
-                    workflow_state.add_diagnostic_report(result)
+            for outcome in outcomes:
+                if not outcome.completed:
+                    self.logger.error(
+                        "Diagnostic bot did not complete",
+                        bot=outcome.spec.name,
+                        status=outcome.status,
+                        error=outcome.error
+                    )
+                
+                # Timed out and failed bots contribute a partial report
+                diagnostic_reports.append(outcome.report)
+                workflow_state.add_diagnostic_report(outcome.report)
             
             self.logger.info(
                 "Diagnostic phase completed",
                 session_id=workflow_state.session_id,
                 reports_generated=len(diagnostic_reports),
+                incomplete_bots=sum(1 for outcome in outcomes if not outcome.completed),
                 total_issues=len(workflow_state.all_issues)
             )
             
@@ -405,9 +417,9 @@ class TroubleshootingWorkflow:
         
         self.logger.info("Starting resolution verification", session_id=workflow_state.session_id)
         
-        # Re-assess system health to verify fixes
+        # Re-assess system health to verify fixes, bypassing cached responses
         try:
-            updated_system_info = await self.coordinator._gather_system_info()
+            updated_system_info = await self.coordinator._gather_system_info(force_refresh=True)
             
             # Compare with previous system info
             verification_results = {
@@ -538,10 +550,50 @@ Status: {'SUCCESS' if workflow_state.success else 'PARTIAL SUCCESS'}
         
         return state
     
-    async def run_troubleshooting(self, initial_issue: Optional[str] = None) -> Dict[str, Any]:
-        """Run the complete troubleshooting workflow"""
+    def _dedup_key(self, target_url: Optional[str], initial_issue: Optional[str]) -> str:
+        """Key identifying equivalent runs: the target and the normalized issue text"""
+        target = (target_url or api_registry.default.base_url).rstrip("/")
+        issue = " ".join(re.findall(r"[a-z0-9]+", (initial_issue or "").lower()))
+        return f"{target}|{issue}"
+    
+    async def run_troubleshooting(self, initial_issue: Optional[str] = None,
+                                  target_url: Optional[str] = None,
+                                  force: bool = False) -> Dict[str, Any]:
+        """
+        Run the complete troubleshooting workflow
+        Callers asking about the same target and issue while a run is in flight
+        join it, and a report completed within the dedup window is reused. Each
+        caller gets its own copy of the report. Set force to always start a
+        new run.
+        """
+        if force:
+            # Own task, like shared runs, so the API binding stays local to the run
+            return await asyncio.ensure_future(self._execute_troubleshooting(initial_issue, target_url))
+        
+        key = self._dedup_key(target_url, initial_issue)
+        
+        report, state = self.recent_reports.lookup(key)
+        if state == ResponseCache.FRESH:
+            self.logger.info("Reusing recent troubleshooting report", dedup_key=key)
+            return report
+        
+        async def execute() -> Dict[str, Any]:
+            report = await self._execute_troubleshooting(initial_issue, target_url)
+            if self.dedup_window > 0 and report:
+                self.recent_reports.set(key, report, ttl=self.dedup_window)
+            return report
+        
+        # Callers joining one run each get their own copy of its report
+        return copy.deepcopy(await self.in_flight_runs.do(key, execute))
+    
+    async def _execute_troubleshooting(self, initial_issue: Optional[str],
+                                       target_url: Optional[str]) -> Dict[str, Any]:
+        """Execute one troubleshooting workflow run"""
         
-        self.logger.info("Starting hierarchical troubleshooting workflow")
+        self.logger.info("Starting hierarchical troubleshooting workflow", target_url=target_url)
+        
+        # Route API calls made by this run to the requested target
+        bind_api(api_registry.acquire(target_url))
         
         try:
             # Initialize state
@@ -558,6 +610,21 @@ Status: {'SUCCESS' if workflow_state.success else 'PARTIAL SUCCESS'}
         except Exception as e:
             self.logger.error("Workflow execution failed", error=str(e))
             raise
+        
+        finally:
+            await api_registry.release(target_url)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get run deduplication statistics"""
+        stats = {
+            f"in_flight_{name}": value
+            for name, value in self.in_flight_runs.get_stats().items()
+        }
+        stats.update({
+            f"recent_{name}": value
+            for name, value in self.recent_reports.get_stats().items()
+        })
+        return stats
 
 
 # Global workflow instance